@@ -1,24 +1,65 @@
 # -*- coding: utf-8 -*-
+import argparse
+from array import array
+import collections
+import contextlib
+import cProfile
+import functools
+import gzip
+import hashlib
+import heapq
 import json
+import math
+import os
+import pstats
+import queue
+import random
+import re
+import sqlite3
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import time
-import psutil
+import types
+_PROCESS_START = time.perf_counter()
 import ctypes
 from ctypes import wintypes
+from multiprocessing.connection import Client, Listener
 from pathlib import Path
 
-import pygetwindow as gw
-from PIL import Image, ImageTk
-
-import win32gui
-import win32con
-import win32api
-import win32process
-import win32ui
+# 무거운 모듈은 main()이 단일 인스턴스 확인을 마친 뒤 load_platform_modules()로 불러옵니다.
+# 이미 실행 중인 인스턴스가 있으면 두 번째 프로세스는 이것들을 불러오지 않고 인자만 넘긴 뒤 끝납니다.
+# --replay는 SimulatedDesktop이 필요한 API를 채우므로 이 모듈들 없이(Windows가 아닌 곳에서도) 돌아갑니다.
+psutil = Image = ImageTk = np = None
+gw = win32gui = win32con = win32api = win32process = win32ui = None
+
+def load_platform_modules():
+    """앱과 벤치마크에 필요한 모듈을 불러옵니다. 없으면 ImportError를 그대로 올립니다."""
+    global psutil, Image, ImageTk, np, gw, win32gui, win32con, win32api, win32process, win32ui
+    import psutil
+    from PIL import Image, ImageTk
+    try:
+        import numpy as np  # 선택: 많은 창의 타일 배치를 한 번에 계산
+    except ImportError:
+        np = None
+    try:
+        import pygetwindow as gw
+    except NotImplementedError as e:  # Windows가 아닌 곳에서는 ImportError 대신 이것을 올립니다.
+        raise ImportError(f"pygetwindow를 쓸 수 없는 환경입니다: {e}") from e
+    import win32gui
+    import win32con
+    import win32api
+    import win32process
+    import win32ui
 
 SAVED_WINDOW_STATE_FILE = Path(__file__).with_name("goto_center_window_state.json")
 SAVED_WINDOW_PRESETS_FILE = Path(__file__).with_name("goto_center_window_presets.json")
+LAYOUT_PROFILES_FILE = Path(__file__).with_name("goto_center_layout_profiles.json")
+SNAP_ZONES_FILE = Path(__file__).with_name("goto_center_snap_zones.json")
+PRESET_STORE_DB_FILE = Path(__file__).with_name("goto_center_presets.sqlite3")
+GEOMETRY_MEMORY_FILE = Path(__file__).with_name("goto_center_geometry_memory.json")
+SINGLE_INSTANCE_NAME = "goto_center_single_instance"
 
 # ========= DPI 인식 (고해상도에서 흐림 방지) =========
 try:
@@ -80,6 +121,15 @@ def bring_window_to_front_by_hwnd(hwnd):
     except Exception:
         pass
 
+def activate_window(hwnd):
+    """최소화된 창만 복원하고 전면으로 가져옵니다. 최대화 상태는 유지합니다."""
+    try:
+        if win32gui.IsIconic(hwnd):
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        win32gui.SetForegroundWindow(hwnd)
+    except Exception:
+        pass
+
 def move_window_center_and_signal(hwnd):
     left, top, right, bottom = win32gui.GetWindowRect(hwnd)
     w, h = right - left, bottom - top
@@ -271,6 +321,182 @@ def move_window_to_edge(hwnd, direction="top", margin=0):
     except Exception:
         pass
 
+def frame_rect_to_outer(hwnd, frame_rect):
+    """
+    DWM 시각적 프레임 기준 사각형을 SetWindowPos에 넘길 바깥 사각형 (x, y, w, h)로 변환.
+    그림자 패딩만큼 보정합니다.
+    """
+    pad_left, pad_top, pad_right, pad_bottom, _, _, _, _ = get_frame_padding(hwnd)
+    l, t, r, b = frame_rect
+    return (
+        int(l - pad_left),
+        int(t - pad_top),
+        int(r - l + pad_left + pad_right),
+        int(b - t + pad_top + pad_bottom),
+    )
+
+def batch_move_windows(moves):
+    """
+    여러 창을 한 번에 이동/크기 변경합니다.
+    moves: [(hwnd, (left, top, right, bottom)), ...]  DWM 시각적 프레임 기준
+    Begin/Defer/EndDeferWindowPos로 한 번에 반영하고, 일괄 적용이 실패하면 창마다 SetWindowPos로 처리합니다.
+    반환: 실제로 요청한 창 수
+    """
+    targets = []
+    for hwnd, frame_rect in moves:
+        try:
+            if not prepare_window_for_move(hwnd):
+                continue
+            targets.append((hwnd, frame_rect_to_outer(hwnd, frame_rect)))
+        except Exception:
+            continue
+    return defer_window_positions(targets)
+
+def prepare_window_for_move(hwnd):
+    """최소화/최대화 상태에서는 위치가 반영되지 않으므로 먼저 복원합니다. 창이 없으면 False."""
+    if not win32gui.IsWindow(hwnd):
+        return False
+    if win32gui.IsIconic(hwnd) or win32gui.IsZoomed(hwnd):
+        win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+    return True
+
+def defer_window_positions(targets):
+    """
+    targets: [(hwnd, (x, y, w, h)), ...]  SetWindowPos에 넘길 바깥 사각형
+    반환: 요청한 창 수
+    """
+    if not targets:
+        return 0
+
+    flags = win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE
+    try:
+        hdwp = win32gui.BeginDeferWindowPos(len(targets))
+        for hwnd, (x, y, w, h) in targets:
+            hdwp = win32gui.DeferWindowPos(hdwp, hwnd, 0, x, y, w, h, flags)
+        win32gui.EndDeferWindowPos(hdwp)
+    except Exception:
+        # 권한이 다른 창이 섞여 있으면 일괄 적용 전체가 실패하므로 하나씩 적용합니다.
+        for hwnd, (x, y, w, h) in targets:
+            try:
+                win32gui.SetWindowPos(hwnd, 0, x, y, w, h, flags)
+            except Exception:
+                continue
+    return len(targets)
+
+# ========= 키보드 미세 이동 / 크기 조절 =========
+NUDGE_STEP = 10        # 한 번 누를 때 움직이는 px
+NUDGE_MIN_SIZE = 80    # 크기를 줄일 때 시각적 프레임의 최소 너비/높이
+NUDGE_IDLE_MS = 400    # 입력이 이만큼 멈추면 캐시한 창 위치를 버리고 다음에 다시 읽음
+
+def get_display_frame_interval_ms():
+    """주 모니터 주사율 기준 한 프레임 시간(ms). 알 수 없으면 60Hz로 봅니다."""
+    try:
+        settings = win32api.EnumDisplaySettings(None, win32con.ENUM_CURRENT_SETTINGS)
+        hz = int(settings.DisplayFrequency)
+    except Exception:
+        hz = 0
+    if hz <= 1:
+        hz = 60
+    return max(1, round(1000 / hz))
+
+class WindowNudger:
+    """
+    키 반복 입력을 목표 변화량으로 모아 두었다가 디스플레이 한 프레임에 최대 한 번만 적용합니다.
+    창의 시각적 프레임과 그림자 패딩은 처음 한 번만 읽어 캐시하므로,
+    키를 누르고 있는 동안은 프레임마다 SetWindowPos 한 번만 호출합니다.
+    """
+
+    def __init__(self, widget, frame_ms=None, idle_ms=NUDGE_IDLE_MS):
+        self.widget = widget  # after() 스케줄링용 Tk 위젯
+        self.frame_ms = frame_ms or get_display_frame_interval_ms()
+        self.idle_ms = idle_ms
+        self._pending = {}   # hwnd -> [dx, dy, dw, dh]
+        self._geometry = {}  # hwnd -> ([l, t, r, b] 시각적 프레임, 패딩)
+        self._last_input = 0.0
+        self._flush_job = None
+        self._expire_job = None
+        self.on_session_start = None  # 창마다 키 입력이 이어지는 한 묶음의 시작에 hwnd로 호출 (되돌리기 기록용)
+
+    def nudge(self, hwnd, dx=0, dy=0, dw=0, dh=0):
+        if hwnd not in self._geometry:
+            if not win32gui.IsWindow(hwnd):
+                return
+            if self.on_session_start is not None:
+                self.on_session_start(hwnd)
+            if not prepare_window_for_move(hwnd):
+                return
+            self._geometry[hwnd] = (list(get_extended_frame_bounds(hwnd)), get_frame_padding(hwnd)[:4])
+        delta = self._pending.setdefault(hwnd, [0, 0, 0, 0])
+        delta[0] += dx
+        delta[1] += dy
+        delta[2] += dw
+        delta[3] += dh
+        self._last_input = time.monotonic()
+        if self._flush_job is None:
+            self._flush_job = self.widget.after(self.frame_ms, self._flush)
+        if self._expire_job is None:
+            self._expire_job = self.widget.after(self.idle_ms, self._expire)
+
+    def _flush(self):
+        self._flush_job = None
+        pending, self._pending = self._pending, {}
+        for hwnd, (dx, dy, dw, dh) in pending.items():
+            frame, (pl, pt, pr, pb) = self._geometry[hwnd]
+            frame[0] += dx
+            frame[1] += dy
+            frame[2] = max(frame[2] + dx + dw, frame[0] + NUDGE_MIN_SIZE)
+            frame[3] = max(frame[3] + dy + dh, frame[1] + NUDGE_MIN_SIZE)
+            flags = win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE
+            if not dw and not dh:
+                flags |= win32con.SWP_NOSIZE
+            try:
+                win32gui.SetWindowPos(
+                    hwnd, 0,
+                    int(frame[0] - pl), int(frame[1] - pt),
+                    int(frame[2] - frame[0] + pl + pr), int(frame[3] - frame[1] + pt + pb),
+                    flags,
+                )
+            except Exception:
+                self._geometry.pop(hwnd, None)
+
+    def _expire(self):
+        idle_for = (time.monotonic() - self._last_input) * 1000
+        if self._pending:
+            self._expire_job = self.widget.after(self.frame_ms, self._expire)
+            return
+        if idle_for < self.idle_ms:
+            self._expire_job = self.widget.after(max(1, int(self.idle_ms - idle_for)), self._expire)
+            return
+        self._expire_job = None
+        self._geometry.clear()
+
+    def invalidate(self):
+        """다른 곳에서 창을 옮겼을 때 캐시한 위치를 버립니다. 밀린 입력은 다음 프레임에 새 위치에서 다시 시작합니다."""
+        for hwnd in list(self._geometry):
+            if hwnd not in self._pending:
+                del self._geometry[hwnd]
+
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+VK_SPACE = 0x20
+VK_LEFT = 0x25
+VK_UP = 0x26
+VK_RIGHT = 0x27
+VK_DOWN = 0x28
+
+# 전역 단축키 id -> (modifiers, virtual key, (dx, dy, dw, dh))
+NUDGE_HOTKEYS = {
+    101: (MOD_CONTROL | MOD_ALT, VK_LEFT, (-NUDGE_STEP, 0, 0, 0)),
+    102: (MOD_CONTROL | MOD_ALT, VK_RIGHT, (NUDGE_STEP, 0, 0, 0)),
+    103: (MOD_CONTROL | MOD_ALT, VK_UP, (0, -NUDGE_STEP, 0, 0)),
+    104: (MOD_CONTROL | MOD_ALT, VK_DOWN, (0, NUDGE_STEP, 0, 0)),
+    105: (MOD_CONTROL | MOD_ALT | MOD_SHIFT, VK_LEFT, (0, 0, -NUDGE_STEP, 0)),
+    106: (MOD_CONTROL | MOD_ALT | MOD_SHIFT, VK_RIGHT, (0, 0, NUDGE_STEP, 0)),
+    107: (MOD_CONTROL | MOD_ALT | MOD_SHIFT, VK_UP, (0, 0, 0, -NUDGE_STEP)),
+    108: (MOD_CONTROL | MOD_ALT | MOD_SHIFT, VK_DOWN, (0, 0, 0, NUDGE_STEP)),
+}
+
 # ========= 아이콘 추출 =========
 def _get_window_hicon(hwnd):
     for msg_wparam in (2, 0, 1):  # ICON_SMALL2, ICON_SMALL, ICON_BIG
@@ -321,7 +547,11 @@ def get_hwnd_icon_image(hwnd, size=(20, 20)):
         return None
 
 # ========= 창 목록 수집 =========
-def list_windows():
+def list_windows(keep=None):
+    """
+    제목이 있고 보이는 최상위 창 목록 (Z 순서).
+    keep(hwnd)를 주면 False인 창은 프로세스/아이콘 같은 비싼 작업 전에 여기서 걸러냅니다.
+    """
     wins = []
     for w in gw.getAllWindows():
         try:
@@ -329,11 +559,1068 @@ def list_windows():
                 continue
             if not win32gui.IsWindowVisible(w._hWnd):
                 continue
+            if keep is not None and not keep(w._hWnd):
+                continue
             wins.append(w)
         except Exception:
             continue
     return wins
 
+def get_window_process_name(hwnd):
+    """창을 만든 프로세스의 실행 파일 이름. 알 수 없으면 빈 문자열."""
+    try:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        if pid:
+            return psutil.Process(pid).name()
+    except Exception:
+        pass
+    return ""
+
+_TITLE_DIRTY_MARKERS = re.compile(r"^[\s*●•]+|[\s*●•]+$")
+_TITLE_DIGITS = re.compile(r"\d+")
+_TITLE_SPACES = re.compile(r"\s+")
+
+def normalize_window_title(title):
+    """
+    저장된 창과 새로 열린 창을 맞춰보기 위한 제목 정규화.
+    저장 안 됨 표시(*, ●)를 떼고, 숫자는 '#'으로 바꾸고, 공백과 대소문자를 통일합니다.
+    """
+    title = _TITLE_DIRTY_MARKERS.sub("", str(title or ""))
+    title = _TITLE_DIGITS.sub("#", title)
+    return _TITLE_SPACES.sub(" ", title).strip().casefold()
+
+def get_window_identity(hwnd, title=None, proc_name=None):
+    """창을 다시 찾기 위한 키 (실행 파일, 클래스, 정규화된 제목)."""
+    if title is None:
+        title = win32gui.GetWindowText(hwnd)
+    if proc_name is None:
+        proc_name = get_window_process_name(hwnd)
+    try:
+        class_name = win32gui.GetClassName(hwnd)
+    except Exception:
+        class_name = ""
+    return (proc_name.casefold(), class_name, normalize_window_title(title))
+
+# ========= 가상 데스크톱 / 클로킹 =========
+DWMWA_CLOAKED = 14
+CLSID_VIRTUAL_DESKTOP_MANAGER = "{aa509086-5ca9-4c25-8f95-589d3c07b48a}"
+IID_IVIRTUAL_DESKTOP_MANAGER = "{a5cd92ff-29be-454c-8d04-d82879fb3f1b}"
+CLSCTX_INPROC_SERVER = 0x1
+CLSCTX_LOCAL_SERVER = 0x4
+
+WINDOW_ON_DESKTOP = "visible"        # 현재 데스크톱에 실제로 그려지는 창
+WINDOW_OTHER_DESKTOP = "other_desktop"  # 다른 가상 데스크톱에 있어 셸이 감춘 창
+WINDOW_CLOAKED = "cloaked"           # 일시 중단된 UWP 앱처럼 DWM이 감춘 창
+
+def get_window_cloaked(hwnd):
+    """DWMWA_CLOAKED 값 (0이면 보임, 1: 앱, 2: 셸, 4: 부모에게서 상속). 실패하면 0."""
+    cloaked = wintypes.DWORD()
+    try:
+        hr = ctypes.windll.dwmapi.DwmGetWindowAttribute(
+            wintypes.HWND(hwnd),
+            ctypes.c_uint(DWMWA_CLOAKED),
+            ctypes.byref(cloaked),
+            ctypes.sizeof(cloaked),
+        )
+        if hr == 0:
+            return cloaked.value
+    except Exception:
+        pass
+    return 0
+
+class _GUID(ctypes.Structure):
+    _fields_ = [
+        ("Data1", wintypes.DWORD),
+        ("Data2", wintypes.WORD),
+        ("Data3", wintypes.WORD),
+        ("Data4", ctypes.c_ubyte * 8),
+    ]
+
+def _guid_from_string(text):
+    guid = _GUID()
+    ctypes.oledll.ole32.CLSIDFromString(ctypes.c_wchar_p(text), ctypes.byref(guid))
+    return guid
+
+class VirtualDesktopManager:
+    """
+    IVirtualDesktopManager를 ctypes로 직접 호출합니다. (comtypes 없이 vtable 3번 메서드만 사용)
+    만든 스레드에서만 써야 합니다. 지원하지 않는 Windows에서는 available이 False입니다.
+    """
+
+    def __init__(self):
+        self._ptr = ctypes.c_void_p()
+        self._is_on_current = None
+        try:
+            ctypes.windll.ole32.CoInitializeEx(None, 0x2)  # COINIT_APARTMENTTHREADED, 이미 초기화됐으면 S_FALSE
+            hr = ctypes.windll.ole32.CoCreateInstance(
+                ctypes.byref(_guid_from_string(CLSID_VIRTUAL_DESKTOP_MANAGER)),
+                None,
+                CLSCTX_INPROC_SERVER | CLSCTX_LOCAL_SERVER,
+                ctypes.byref(_guid_from_string(IID_IVIRTUAL_DESKTOP_MANAGER)),
+                ctypes.byref(self._ptr),
+            )
+            if hr == 0 and self._ptr.value:
+                # IUnknown(0~2) 다음 3번이 IsWindowOnCurrentVirtualDesktop(HWND, BOOL*)
+                self._is_on_current = ctypes.WINFUNCTYPE(
+                    ctypes.c_long, wintypes.HWND, ctypes.POINTER(wintypes.BOOL)
+                )(3, "IsWindowOnCurrentVirtualDesktop")
+        except Exception:
+            self._is_on_current = None
+
+    @property
+    def available(self):
+        return self._is_on_current is not None
+
+    def is_on_current_desktop(self, hwnd):
+        """True/False, 알 수 없으면 None."""
+        if self._is_on_current is None:
+            return None
+        result = wintypes.BOOL()
+        try:
+            hr = self._is_on_current(self._ptr, wintypes.HWND(hwnd), ctypes.byref(result))
+        except Exception:
+            return None
+        return bool(result.value) if hr == 0 else None
+
+class WindowClassifier:
+    """
+    창을 현재 데스크톱 / 다른 가상 데스크톱 / 클로킹된 창으로 분류하고 hwnd별로 캐시합니다.
+    클로킹되지 않은 창은 DwmGetWindowAttribute 한 번으로 끝나고, COM 호출은 클로킹된 창에만 합니다.
+    캐시는 WinEvent(클로킹/해제/소멸)로 무효화하므로 훅이 없을 때는 use_cache를 꺼서 매번 새로 분류합니다.
+    """
+
+    def __init__(self, desktop_manager=None):
+        self.desktop_manager = desktop_manager
+        self.use_cache = True
+        self._cache = {}  # hwnd -> WINDOW_* 분류
+
+    def classify(self, hwnd):
+        state = self._cache.get(hwnd) if self.use_cache else None
+        if state is None:
+            state = self._classify(hwnd)
+            if self.use_cache:
+                self._cache[hwnd] = state
+        return state
+
+    def _classify(self, hwnd):
+        if not get_window_cloaked(hwnd):
+            return WINDOW_ON_DESKTOP
+        if self.desktop_manager is None:
+            self.desktop_manager = VirtualDesktopManager()
+        # 다른 데스크톱의 창도 셸이 클로킹하므로, 현재 데스크톱에 있지 않다고 확인될 때만 '다른 데스크톱'으로 봅니다.
+        if self.desktop_manager.is_on_current_desktop(hwnd) is False:
+            return WINDOW_OTHER_DESKTOP
+        return WINDOW_CLOAKED
+
+    def invalidate(self, hwnd=None):
+        if hwnd is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(hwnd, None)
+
+# ========= 변경 감지 폴링 (자동 새로고침) =========
+AUTO_REFRESH_INTERVALS_MS = (500, 1000, 2000, 5000)
+AUTO_REFRESH_DEFAULT_MS = 1000
+AUTO_REFRESH_MAX_BACKOFF = 8  # 변화가 없으면 간격을 최대 이 배수까지 늘림
+
+def compute_desktop_fingerprint(exclude=()):
+    """
+    EnumWindows 한 번으로 만든 바탕 화면 지문. 보이는 최상위 창의 (hwnd, 제목, 클로킹 여부)를 Z 순서대로 해시합니다.
+    보이지 않는 창은 제목을 읽지 않으므로, 프로세스 이름이나 아이콘을 읽는 새로고침보다 훨씬 쌉니다.
+    """
+    excluded = set(exclude)
+    items = []
+
+    def _collect(hwnd, _):
+        if hwnd not in excluded and win32gui.IsWindowVisible(hwnd):
+            title = win32gui.GetWindowText(hwnd)
+            if title:
+                # 가상 데스크톱을 바꾸면 제목은 그대로이고 클로킹 상태만 바뀌므로 함께 넣습니다.
+                items.append((hwnd, title, bool(get_window_cloaked(hwnd))))
+        return True
+
+    try:
+        win32gui.EnumWindows(_collect, None)
+    except Exception:
+        pass
+    return hash(tuple(items))
+
+def enumeration_fingerprint(enumerated, exclude=()):
+    """
+    collect_tree_rows가 채운 열거 결과 [(창, 분류), ...]로 compute_desktop_fingerprint와 같은 지문을 만듭니다.
+    목록을 새로 고친 직후 지문을 얻으려고 창을 한 번 더 열거하지 않아도 됩니다.
+    """
+    excluded = set(exclude)
+    return hash(tuple(
+        (w._hWnd, w.title, state != WINDOW_ON_DESKTOP) for w, state in enumerated if w._hWnd not in excluded
+    ))
+
+class FingerprintPoller:
+    """
+    WinEvent 훅을 쓸 수 없는 환경을 위한 자동 새로고침.
+    정해진 간격으로 바탕 화면 지문만 계산하고, 지문이 바뀌었을 때만 on_change()를 호출합니다.
+    연달아 변화가 없으면 간격을 두 배씩 늘리고(최대 AUTO_REFRESH_MAX_BACKOFF배), 변화가 보이면 원래 간격으로 돌아옵니다.
+    """
+
+    def __init__(self, widget, on_change, interval_ms=AUTO_REFRESH_DEFAULT_MS, exclude=()):
+        self.widget = widget  # after() 스케줄링용 Tk 위젯
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self.exclude = exclude  # 지문에서 뺄 hwnd를 돌려주는 함수 또는 목록
+        self.current_ms = interval_ms
+        self.polls = 0
+        self.changes = 0
+        self._fingerprint = None
+        self._job = None
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self):
+        self.stop()
+        self.current_ms = self.interval_ms
+        self._fingerprint = self._compute()
+        self._job = self.widget.after(self.current_ms, self._poll)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def set_interval(self, interval_ms):
+        self.interval_ms = interval_ms
+        if self.running:
+            self.start()
+
+    def mark_fresh(self, fingerprint=None):
+        """
+        다른 경로로 새로고침했을 때 호출하면 같은 변화로 다시 새로고침하지 않습니다.
+        그 새로고침의 열거 결과로 만든 지문(enumeration_fingerprint)을 주면 다시 열거하지 않습니다.
+        """
+        if self.running:
+            self._fingerprint = self._compute() if fingerprint is None else fingerprint
+
+    def _compute(self):
+        exclude = self.exclude() if callable(self.exclude) else self.exclude
+        return compute_desktop_fingerprint(exclude)
+
+    def _poll(self):
+        self._job = None
+        if not self.widget.winfo_viewable():
+            # 최소화되어 있는 동안은 지문도 계산하지 않고 가장 긴 간격으로만 확인합니다.
+            self.current_ms = self.interval_ms * AUTO_REFRESH_MAX_BACKOFF
+            self._job = self.widget.after(self.current_ms, self._poll)
+            return
+        self.polls += 1
+        fingerprint = self._compute()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self.changes += 1
+            self.current_ms = self.interval_ms
+            self.on_change()
+        else:
+            self.current_ms = min(self.current_ms * 2, self.interval_ms * AUTO_REFRESH_MAX_BACKOFF)
+        self._job = self.widget.after(self.current_ms, self._poll)
+
+# ========= 가림(occlusion) 분석 =========
+OCCLUSION_HIDDEN_THRESHOLD = 0.02  # 보이는 비율이 이 값 이하이면 '가려진 창'으로 취급
+
+def compute_visible_fractions(rects):
+    """
+    Z 순서(맨 위 창이 먼저)로 정렬된 사각형 목록에서 각 사각형이 실제로 보이는 면적 비율을 계산.
+    rects: [(left, top, right, bottom) 또는 None, ...]  None은 다른 창을 가리지도, 계산되지도 않음
+    반환: 같은 길이의 리스트 (0.0 ~ 1.0, 면적이 없거나 None이면 None)
+
+    x축 스윕 라인 + y축 세그먼트 트리로 각 지점의 '맨 위 창'(가장 작은 z)을 유지합니다.
+    주인이 바뀌는 구간만 방문하므로 O((n + k) log n) 입니다. (k: 보이는 영역 경계의 변화 수)
+    """
+    n = len(rects)
+    fractions = [None] * n
+    items = []
+    for z, rect in enumerate(rects):
+        if rect is None:
+            continue
+        l, t, r, b = rect
+        if r > l and b > t:
+            items.append((z, l, t, r, b))
+    if not items:
+        return fractions
+
+    ys = sorted({y for _, _, t, _, b in items for y in (t, b)})
+    y_index = {y: i for i, y in enumerate(ys)}
+    leaf_count = len(ys) - 1
+    size = 1
+    while size < leaf_count:
+        size *= 2
+
+    INF = n  # '주인 없음'은 어떤 z보다 아래로 취급
+    owner = [INF] * leaf_count + [-1] * (size - leaf_count)  # 여분 잎은 절대 바뀌지 않도록 -1
+    leaf_len = [ys[i + 1] - ys[i] for i in range(leaf_count)] + [0] * (size - leaf_count)
+    maxo = [0] * (2 * size)  # 부분 트리 잎들의 주인 중 최댓값
+    maxo[size:] = owner
+    for node in range(size - 1, 0, -1):
+        maxo[node] = max(maxo[2 * node], maxo[2 * node + 1])
+    cover = {}  # 노드 -> 그 노드 구간을 완전히 덮는 z의 최소 힙 (지연 삭제)
+    active = [False] * n
+    owned_len = [0] * (n + 1)
+    owned_leaves = [set() for _ in range(n + 1)]
+    area = [0] * (n + 1)
+    last_x = [0] * (n + 1)
+
+    def flush(z, x):
+        if owned_len[z]:
+            area[z] += owned_len[z] * (x - last_x[z])
+        last_x[z] = x
+
+    def set_owner(leaf, new_owner, x):
+        old = owner[leaf]
+        length = leaf_len[leaf]
+        flush(old, x)
+        owned_len[old] -= length
+        owned_leaves[old].discard(leaf)
+        flush(new_owner, x)
+        owned_len[new_owner] += length
+        owned_leaves[new_owner].add(leaf)
+        owner[leaf] = new_owner
+        node = (size + leaf) >> 1
+        maxo[size + leaf] = new_owner
+        while node:
+            value = max(maxo[2 * node], maxo[2 * node + 1])
+            if maxo[node] == value:
+                break
+            maxo[node] = value
+            node >>= 1
+
+    def top_cover(node):
+        heap = cover.get(node)
+        while heap and not active[heap[0]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else INF
+
+    def insert(z, lo, hi, x):
+        active[z] = True
+        a, b_ = lo + size, hi + size
+        while a < b_:
+            if a & 1:
+                heapq.heappush(cover.setdefault(a, []), z)
+                a += 1
+            if b_ & 1:
+                b_ -= 1
+                heapq.heappush(cover.setdefault(b_, []), z)
+            a >>= 1
+            b_ >>= 1
+        # z보다 아래 창이 주인인 잎만 찾아 내려갑니다.
+        changed = []
+        stack = [(1, 0, size)]
+        while stack:
+            node, nl, nr = stack.pop()
+            if nr <= lo or hi <= nl or maxo[node] <= z:
+                continue
+            if nr - nl == 1:
+                changed.append(nl)
+                continue
+            mid = (nl + nr) // 2
+            stack.append((2 * node, nl, mid))
+            stack.append((2 * node + 1, mid, nr))
+        for leaf in changed:
+            set_owner(leaf, z, x)
+
+    def remove(z, x):
+        active[z] = False
+        for leaf in list(owned_leaves[z]):
+            best = INF
+            node = size + leaf
+            while node:
+                candidate = top_cover(node)
+                if candidate < best:
+                    best = candidate
+                node >>= 1
+            set_owner(leaf, best, x)
+
+    events = []
+    for z, l, t, r, b in items:
+        events.append((l, 1, z, y_index[t], y_index[b]))
+        events.append((r, 0, z, 0, 0))
+    events.sort()
+    for x, is_start, z, lo, hi in events:
+        if is_start:
+            insert(z, lo, hi, x)
+        else:
+            remove(z, x)
+
+    for z, l, t, r, b in items:
+        fractions[z] = area[z] / ((r - l) * (b - t))
+    return fractions
+
+class VisibilityCache:
+    """
+    마지막 가림 분석의 입력(Z 순서의 사각형 목록)과 결과를 기억합니다.
+    검색어만 바뀐 새로고침은 창 배치가 그대로이므로 사각형만 다시 읽고 스윕 계산은 건너뜁니다.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self._rects = None
+        self._fractions = None
+
+    def fractions(self, rects):
+        rects = tuple(rects)
+        if rects == self._rects:
+            self.hits += 1
+        else:
+            self._rects, self._fractions = rects, compute_visible_fractions(rects)
+        return self._fractions
+
+def compute_window_visibility(hwnds, exclude=(), cache=None):
+    """
+    Z 순서로 정렬된 hwnd 목록의 보이는 비율을 DWM 시각적 프레임 기준으로 계산.
+    최소화된 창과 exclude에 포함된 창은 다른 창을 가리지 않으며, 결과는 None 입니다.
+    cache(VisibilityCache)를 주면 창 배치가 지난번과 같을 때 이전 결과를 씁니다.
+    """
+    excluded = set(exclude)
+    rects = []
+    for hwnd in hwnds:
+        try:
+            if hwnd in excluded or win32gui.IsIconic(hwnd):
+                rects.append(None)
+            else:
+                rects.append(get_extended_frame_bounds(hwnd))
+        except Exception:
+            rects.append(None)
+    fractions = compute_visible_fractions(rects) if cache is None else cache.fractions(rects)
+    return dict(zip(hwnds, fractions))
+
+def _synthetic_desktop_rects(count, seed=0, screen=(0, 0, 2560, 1440)):
+    rng = random.Random(seed)
+    s_left, s_top, s_right, s_bottom = screen
+    rects = []
+    for _ in range(count):
+        w = rng.randint(200, (s_right - s_left) // 2)
+        h = rng.randint(150, (s_bottom - s_top) // 2)
+        l = rng.randint(s_left, s_right - w)
+        t = rng.randint(s_top, s_bottom - h)
+        rects.append((l, t, l + w, t + h))
+    return rects
+
+def benchmark_occlusion(count=2000, repeat=5, seed=0):
+    """합성 데스크톱 사각형으로 가림 분석 시간을 측정합니다."""
+    rects = _synthetic_desktop_rects(count, seed=seed)
+    timings = []
+    fractions = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fractions = compute_visible_fractions(rects)
+        timings.append(time.perf_counter() - started)
+    hidden = sum(1 for f in fractions if f is not None and f <= OCCLUSION_HIDDEN_THRESHOLD)
+    return {
+        "windows": count,
+        "best_ms": min(timings) * 1000,
+        "median_ms": sorted(timings)[len(timings) // 2] * 1000,
+        "hidden_windows": hidden,
+    }
+
+# ========= 모니터 / 화면 밖 창 구출 =========
+RESCUE_MIN_VISIBLE_FRACTION = 0.5  # 작업 영역 안에 보이는 부분이 이보다 적으면 '화면 밖' 창
+RESCUE_EDGE_TOLERANCE = 8          # 가장자리에 붙인 창이 몇 px 튀어나온 것은 무시
+RESCUE_CASCADE_STEP = 32
+
+def get_monitor_work_areas():
+    """
+    현재 연결된 모니터 목록을 (left, top) 순으로 반환.
+    [{"handle", "monitor": (l, t, r, b), "work": (l, t, r, b), "primary": bool, "dpi": int}, ...]
+    """
+    monitors = []
+    for hmon, _, _ in win32api.EnumDisplayMonitors(None, None):
+        mi = win32api.GetMonitorInfo(hmon)
+        monitors.append({
+            "handle": hmon,
+            "monitor": tuple(mi["Monitor"]),
+            "work": tuple(mi.get("Work", mi["Monitor"])),
+            "primary": bool(mi.get("Flags", 0) & 1),  # MONITORINFOF_PRIMARY
+            "dpi": get_monitor_dpi(hmon),
+        })
+    monitors.sort(key=lambda m: (m["monitor"][0], m["monitor"][1]))
+    return monitors
+
+DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2 = -4
+
+def get_monitor_dpi(hmonitor):
+    """
+    모니터의 유효 DPI. Windows 8.1 미만이면 96을 반환합니다.
+    이 프로세스는 시스템 DPI 인식이라 그대로 물으면 모든 모니터가 시스템 DPI로 보이므로,
+    조회하는 동안만 이 스레드를 모니터별 DPI 인식으로 바꿉니다. (Windows 10 1607 미만에서는 시스템 DPI)
+    """
+    dpi_x = ctypes.c_uint(96)
+    dpi_y = ctypes.c_uint(96)
+    set_context = previous = None
+    try:
+        set_context = ctypes.windll.user32.SetThreadDpiAwarenessContext
+        set_context.restype = ctypes.c_void_p
+        set_context.argtypes = [ctypes.c_void_p]
+        previous = set_context(DPI_AWARENESS_CONTEXT_PER_MONITOR_AWARE_V2)
+    except Exception:
+        pass
+    try:
+        hr = ctypes.windll.shcore.GetDpiForMonitor(
+            wintypes.HMONITOR(int(hmonitor)), 0, ctypes.byref(dpi_x), ctypes.byref(dpi_y)  # MDT_EFFECTIVE_DPI
+        )
+        if hr == 0:
+            return int(dpi_x.value)
+    except Exception:
+        pass
+    finally:
+        if previous:
+            set_context(previous)
+    return 96
+
+def _rect_intersection_area(a, b):
+    w = min(a[2], b[2]) - max(a[0], b[0])
+    h = min(a[3], b[3]) - max(a[1], b[1])
+    return w * h if w > 0 and h > 0 else 0
+
+def _rects_overlap(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def _nearest_work_area(rect, work_areas):
+    """가장 많이 겹치는 작업 영역, 겹치는 곳이 없으면 중심이 가장 가까운 작업 영역."""
+    best = max(work_areas, key=lambda wa: _rect_intersection_area(rect, wa))
+    if _rect_intersection_area(rect, best) > 0:
+        return best
+    cx, cy = (rect[0] + rect[2]) / 2, (rect[1] + rect[3]) / 2
+
+    def distance(wa):
+        dx = max(wa[0] - cx, 0, cx - wa[2])
+        dy = max(wa[1] - cy, 0, cy - wa[3])
+        return dx * dx + dy * dy
+    return min(work_areas, key=distance)
+
+def find_offscreen_windows(windows, work_areas, min_visible_fraction=RESCUE_MIN_VISIBLE_FRACTION,
+                           tolerance=RESCUE_EDGE_TOLERANCE):
+    """
+    작업 영역 밖으로 (일부라도) 나간 창을 찾습니다.
+    windows: [(hwnd, title, (l, t, r, b)), ...]  DWM 시각적 프레임 기준
+    반환: [{"hwnd", "title", "rect", "fraction", "offscreen"}, ...]
+      offscreen=True 이면 보이는 부분이 min_visible_fraction 미만, False 이면 일부만 튀어나온 창
+    """
+    offenders = []
+    for hwnd, title, rect in windows:
+        l, t, r, b = rect
+        # 모서리에 딱 붙인 창이 몇 px 나간 것은 정상으로 봅니다.
+        inner = (l + tolerance, t + tolerance, r - tolerance, b - tolerance)
+        if inner[2] <= inner[0] or inner[3] <= inner[1]:
+            inner = rect
+        area = (inner[2] - inner[0]) * (inner[3] - inner[1])
+        if area <= 0:
+            continue
+        # 모니터 작업 영역은 서로 겹치지 않으므로 교집합 면적을 더하면 됩니다.
+        covered = sum(_rect_intersection_area(inner, wa) for wa in work_areas)
+        fraction = covered / area
+        if fraction >= 1.0:
+            continue
+        offenders.append({
+            "hwnd": hwnd,
+            "title": title,
+            "rect": tuple(rect),
+            "fraction": fraction,
+            "offscreen": fraction < min_visible_fraction,
+        })
+    return offenders
+
+def plan_rescue_placements(offenders, work_areas):
+    """
+    구출할 창들의 새 위치를 한 번에 계산합니다. 구출되는 창끼리는 서로 겹치지 않게 배치합니다.
+    - 일부만 튀어나온 창은 가장 가까운 작업 영역 안으로 최소한만 당겨 넣습니다.
+    - 그 자리가 이미 다른 구출 창과 겹치거나 완전히 밖에 있던 창은 빈 자리를 찾아 넣습니다.
+    - 빈 자리가 없으면 작업 영역 왼쪽 위에서부터 계단식으로 겹쳐 놓습니다.
+    반환: [(offender, (l, t, r, b)), ...]
+    """
+    placed = {}  # 작업 영역 -> 이미 배치한 사각형
+    plan = []
+    # 조금만 튀어나온 창이 제자리 근처를 먼저 차지하도록 정렬
+    ordered = sorted(offenders, key=lambda o: (o["offscreen"], -o["fraction"]))
+    for offender in ordered:
+        rect = offender["rect"]
+        work = _nearest_work_area(rect, work_areas)
+        wl, wt, wr, wb = work
+        w = min(rect[2] - rect[0], wr - wl)
+        h = min(rect[3] - rect[1], wb - wt)
+        occupied = placed.setdefault(work, [])
+
+        def fits(x, y):
+            candidate = (x, y, x + w, y + h)
+            return (x >= wl and y >= wt and x + w <= wr and y + h <= wb
+                    and not any(_rects_overlap(candidate, other) for other in occupied))
+
+        target = None
+        if not offender["offscreen"]:
+            x = min(max(rect[0], wl), wr - w)
+            y = min(max(rect[1], wt), wb - h)
+            if fits(x, y):
+                target = (x, y)
+        if target is None:
+            # 왼쪽 위 → 오른쪽 아래 순서로, 배치된 창의 오른쪽/아래 모서리를 후보로 사용
+            xs = sorted({wl} | {other[2] for other in occupied})
+            ys = sorted({wt} | {other[3] for other in occupied})
+            target = next(((x, y) for y in ys for x in xs if fits(x, y)), None)
+        if target is None:
+            step = RESCUE_CASCADE_STEP * len(occupied)
+            target = (wl + step % max(wr - wl - w, 1), wt + step % max(wb - wt - h, 1))
+
+        new_rect = (target[0], target[1], target[0] + w, target[1] + h)
+        occupied.append(new_rect)
+        plan.append((offender, new_rect))
+    return plan
+
+def format_rescue_report(plan, limit=20):
+    lines = []
+    for offender, new_rect in plan[:limit]:
+        state = "화면 밖" if offender["offscreen"] else "일부 벗어남"
+        lines.append(
+            f"- {_shorten_text(offender['title'], 40)} [{state}, 보이는 부분 {offender['fraction'] * 100:.0f}%] "
+            f"({offender['rect'][0]}, {offender['rect'][1]}) → ({new_rect[0]}, {new_rect[1]})"
+        )
+    if len(plan) > limit:
+        lines.append(f"... 외 {len(plan) - limit}개")
+    return "\n".join(lines)
+
+def collect_rescue_plan(exclude=()):
+    """현재 창 목록에서 화면 밖 창을 찾아 구출 계획을 만듭니다."""
+    excluded = set(exclude)
+    work_areas = [m["work"] for m in get_monitor_work_areas()]
+    windows = []
+    for w in list_windows():
+        hwnd = w._hWnd
+        try:
+            if hwnd in excluded or win32gui.IsIconic(hwnd) or win32gui.IsZoomed(hwnd):
+                continue
+            windows.append((hwnd, w.title, get_extended_frame_bounds(hwnd)))
+        except Exception:
+            continue
+    offenders = find_offscreen_windows(windows, work_areas)
+    return plan_rescue_placements(offenders, work_areas)
+
+# ========= 디스플레이 구성별 레이아웃 프로필 =========
+def get_display_fingerprint(monitors=None):
+    """
+    모니터 개수, 해상도, 배치, DPI로 만든 디스플레이 구성 지문.
+    모니터 열거 한 번과 해시 한 번이면 되므로 WM_DISPLAYCHANGE 때마다 계산해도 부담이 없습니다.
+    반환: (fingerprint, 사람이 읽을 수 있는 설명)
+    """
+    if monitors is None:
+        monitors = get_monitor_work_areas()
+    parts = []
+    for m in monitors:
+        l, t, r, b = m["monitor"]
+        parts.append(f"{l},{t},{r - l}x{b - t}@{m['dpi']}{'*' if m['primary'] else ''}")
+    description = " | ".join(parts)
+    return hashlib.sha1(description.encode("utf-8")).hexdigest()[:16], description
+
+def capture_window_layout(exclude=()):
+    """
+    현재 창 배치를 프로필에 저장할 형식으로 수집합니다. 최소화된 창은 제외합니다.
+    최대화된 창은 최대화를 풀었을 때의 위치(GetWindowPlacement의 복원 위치, 작업 영역 좌표)도 "normal"에 남깁니다.
+    """
+    excluded = set(exclude)
+    entries = []
+    for w in list_windows():
+        hwnd = w._hWnd
+        try:
+            if hwnd in excluded or win32gui.IsIconic(hwnd):
+                continue
+            exe, class_name, title = get_window_identity(hwnd, title=w.title)
+            entry = {
+                "exe": exe,
+                "class": class_name,
+                "title": title,
+                "rect": list(get_extended_frame_bounds(hwnd)),
+                "maximized": bool(win32gui.IsZoomed(hwnd)),
+            }
+            if entry["maximized"]:
+                entry["normal"] = list(win32gui.GetWindowPlacement(hwnd)[4])
+            entries.append(entry)
+        except Exception:
+            continue
+    return entries
+
+def match_layout_entries(entries, windows):
+    """
+    프로필 항목과 현재 창을 짝지어 줍니다.
+    entries: 프로필의 창 항목 목록, windows: [(hwnd, (exe, class, title)), ...]
+    실행 파일·클래스·정규화 제목이 모두 같은 창을 먼저 짝짓고,
+    남은 창은 실행 파일·클래스만 같은 항목과 저장된 순서대로 짝짓습니다.
+    반환: [(hwnd, entry), ...]
+    """
+    exact = {}
+    loose = {}
+    for index, entry in enumerate(entries):
+        exact.setdefault((entry["exe"], entry["class"], entry["title"]), []).append(index)
+        loose.setdefault((entry["exe"], entry["class"]), []).append(index)
+
+    used = set()
+    matched = []
+    leftovers = []
+    for hwnd, key in windows:
+        candidates = [i for i in exact.get(key, ()) if i not in used]
+        if candidates:
+            used.add(candidates[0])
+            matched.append((hwnd, entries[candidates[0]]))
+        else:
+            leftovers.append((hwnd, key))
+    for hwnd, key in leftovers:
+        candidates = [i for i in loose.get(key[:2], ()) if i not in used]
+        if candidates:
+            used.add(candidates[0])
+            matched.append((hwnd, entries[candidates[0]]))
+    return matched
+
+def restore_window_layout(entries, exclude=(), before_move=None):
+    """
+    프로필 항목을 현재 창에 맞춰 한 번에 복원합니다. 반환: 복원한 창 수
+    before_move: 옮기기 직전에 옮길 hwnd 목록으로 호출 (되돌리기 기록용)
+    """
+    excluded = set(exclude)
+    windows = []
+    for w in list_windows():
+        hwnd = w._hWnd
+        if hwnd in excluded:
+            continue
+        try:
+            windows.append((hwnd, get_window_identity(hwnd, title=w.title)))
+        except Exception:
+            continue
+
+    matched = match_layout_entries(entries, windows)
+    if before_move is not None:
+        before_move([hwnd for hwnd, _ in matched])
+    moves = []
+    placed = 0
+    for hwnd, entry in matched:
+        rect = _read_rect(entry.get("rect"))
+        if not entry.get("maximized"):
+            if rect is not None:
+                moves.append((hwnd, rect))
+            continue
+        # 최대화 상태였던 창은 복원 위치와 함께 SetWindowPlacement로 최대화합니다.
+        # 모니터 크기로 옮긴 뒤 최대화하면 최대화를 풀었을 때 창이 모니터만큼 커집니다.
+        try:
+            if _place_maximized(hwnd, _read_rect(entry.get("normal")), rect):
+                placed += 1
+        except Exception:
+            continue
+    return placed + batch_move_windows(moves)
+
+def _place_maximized(hwnd, normal, maximized_rect):
+    """
+    normal(작업 영역 좌표의 복원 위치)로 창을 최대화합니다. 예전 프로필처럼 normal이 없으면
+    지금 복원 크기를 그대로 두고 저장된 최대화 사각형의 가운데로 옮겨 그 모니터에서 최대화되게 합니다.
+    """
+    flags, _, pt_min, pt_max, current = win32gui.GetWindowPlacement(hwnd)
+    if normal is None:
+        if maximized_rect is None:
+            return False
+        l, t, r, b = current
+        w, h = r - l, b - t
+        # 복원 위치는 주 모니터 작업 영역 기준 좌표이므로 화면 좌표에서 그만큼 뺍니다.
+        dx = dy = 0
+        for m in get_monitor_work_areas():
+            if m["primary"]:
+                dx, dy = m["work"][0] - m["monitor"][0], m["work"][1] - m["monitor"][1]
+        cx = (maximized_rect[0] + maximized_rect[2]) // 2 - dx
+        cy = (maximized_rect[1] + maximized_rect[3]) // 2 - dy
+        normal = (cx - w // 2, cy - h // 2, cx - w // 2 + w, cy - h // 2 + h)
+    win32gui.SetWindowPlacement(hwnd, (flags, win32con.SW_SHOWMAXIMIZED, pt_min, pt_max, tuple(normal)))
+    return True
+
+def _read_rect(value):
+    if not isinstance(value, (list, tuple)) or len(value) != 4:
+        return None
+    try:
+        l, t, r, b = (int(v) for v in value)
+    except (TypeError, ValueError):
+        return None
+    if r <= l or b <= t:
+        return None
+    return (l, t, r, b)
+
+# ========= 앱별 마지막 위치 기억 =========
+GEOMETRY_MEMORY_LIMIT = 2000  # 기억할 (실행 파일, 클래스, 제목) 조합 수. 넘으면 가장 오래 안 쓴 것부터 버림
+GEOMETRY_MEMORY_FLUSH_MS = 5000  # 바뀐 내용을 모아서 파일에 쓰는 간격
+GEOMETRY_LOCATION_COALESCE_MS = 300  # 다른 프로그램이 옮긴 창의 위치 변경 이벤트를 모아서 반영하는 간격
+
+class GeometryMemory:
+    """
+    창 식별 키 (실행 파일, 클래스, 정규화된 제목)별 마지막 시각적 프레임 사각형.
+    OrderedDict를 LRU로 쓰므로 조회·기록·제거가 모두 O(1)입니다.
+    닫힌 창은 더 이상 위치를 물어볼 수 없으므로, 살아 있는 창의 키와 마지막 사각형을 hwnd별로 들고 있다가
+    닫힐 때 그 값을 기록합니다.
+    """
+
+    def __init__(self, limit=GEOMETRY_MEMORY_LIMIT):
+        self.limit = limit
+        self.entries = collections.OrderedDict()  # (exe, class, title) -> (l, t, r, b)
+        self.live = {}  # hwnd -> [identity, rect 또는 None]
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, identity):
+        rect = self.entries.get(identity)
+        if rect is not None:
+            self.entries.move_to_end(identity)
+        return rect
+
+    def remember(self, identity, rect):
+        if self.entries.get(identity) == rect:
+            self.entries.move_to_end(identity)
+            return
+        self.entries[identity] = rect
+        self.entries.move_to_end(identity)
+        while len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+        self.dirty = True
+
+    def track(self, hwnd, identity, rect):
+        """살아 있는 창의 키와 현재 사각형을 갱신합니다. 처음 보는 창이면 True."""
+        known = self.live.get(hwnd)
+        self.live[hwnd] = [identity, rect if rect is not None else (known[1] if known else None)]
+        return known is None
+
+    def release(self, hwnd):
+        """창이 사라졌을 때 마지막으로 알던 사각형을 기록합니다."""
+        known = self.live.pop(hwnd, None)
+        if known is not None and known[1] is not None:
+            self.remember(known[0], known[1])
+
+    def to_json(self):
+        # 오래된 것부터 저장해 불러올 때 LRU 순서가 그대로 이어지게 합니다.
+        return [[exe, class_name, title, *rect] for (exe, class_name, title), rect in self.entries.items()]
+
+    def load_json(self, rows):
+        self.entries.clear()
+        for row in rows if isinstance(rows, list) else ():
+            if not isinstance(row, list) or len(row) != 7:
+                continue
+            rect = _read_rect(row[3:])
+            if rect is not None:
+                self.entries[(str(row[0]), str(row[1]), str(row[2]))] = rect
+        while len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+        self.dirty = False
+
+def read_restorable_rect(hwnd):
+    """기억할 만한 창이면 시각적 프레임 사각형을, 최소화/최대화 상태이면 None을 반환합니다."""
+    if win32gui.IsIconic(hwnd) or win32gui.IsZoomed(hwnd):
+        return None
+    return get_extended_frame_bounds(hwnd)
+
+def collect_window_geometry(exclude=(), windows=None):
+    """열려 있는 창마다 (hwnd, 식별 키, 기억할 사각형 또는 None)을 모읍니다. windows를 주면 다시 열거하지 않습니다."""
+    excluded = set(exclude)
+    tracked = []
+    for w in list_windows() if windows is None else windows:
+        hwnd = w._hWnd
+        if hwnd in excluded:
+            continue
+        try:
+            tracked.append((hwnd, get_window_identity(hwnd, title=w.title), read_restorable_rect(hwnd)))
+        except Exception:
+            continue
+    return tracked
+
+# ========= 창 위치 되돌리기 =========
+GEOMETRY_JOURNAL_CAPACITY = 2048  # 되돌리기/다시 실행 기록마다 보관할 창 상태 수. 넘으면 가장 오래된 것부터 덮어씀
+MOVE_SETTLE_MS = 150  # 이 프로그램이 창을 옮긴 뒤 결과 위치를 읽기까지 기다리는 시간
+SNAPSHOT_NORMAL = 0     # 사각형: 시각적 프레임 (화면 좌표)
+SNAPSHOT_MAXIMIZED = 1  # 사각형: GetWindowPlacement의 복원 위치 (바깥 사각형, 작업 영역 좌표)
+SNAPSHOT_MINIMIZED = 2
+
+def read_window_snapshot(hwnd):
+    """되돌릴 때 쓸 창 상태 (left, top, right, bottom, 표시 상태)."""
+    if win32gui.IsIconic(hwnd):
+        show = SNAPSHOT_MINIMIZED
+    elif win32gui.IsZoomed(hwnd):
+        show = SNAPSHOT_MAXIMIZED
+    else:
+        return (*get_extended_frame_bounds(hwnd), SNAPSHOT_NORMAL)
+    return (*win32gui.GetWindowPlacement(hwnd)[4], show)
+
+def restore_window_snapshots(records):
+    """
+    records: [(hwnd, left, top, right, bottom, 표시 상태), ...]
+    보통 상태였던 창은 batch_move_windows로 한 번에 옮기고, 최대화/최소화 상태였던 창은 SetWindowPlacement로 되돌립니다.
+    반환: 되돌린 창 수
+    """
+    moves = []
+    placed = 0
+    for hwnd, left, top, right, bottom, show in records:
+        if not win32gui.IsWindow(hwnd):
+            continue
+        if show == SNAPSHOT_NORMAL:
+            moves.append((hwnd, (left, top, right, bottom)))
+            continue
+        try:
+            flags, _, pt_min, pt_max, _ = win32gui.GetWindowPlacement(hwnd)
+            show_cmd = win32con.SW_SHOWMINNOACTIVE if show == SNAPSHOT_MINIMIZED else win32con.SW_SHOWMAXIMIZED
+            win32gui.SetWindowPlacement(hwnd, (flags, show_cmd, pt_min, pt_max, (left, top, right, bottom)))
+            placed += 1
+        except Exception:
+            continue
+    return placed + batch_move_windows(moves)
+
+class _JournalRing:
+    """
+    고정 크기 링 버퍼. 항목 하나는 (트랜잭션 id, hwnd, left, top, right, bottom, 표시 상태) 정수 7개이고
+    array('q') 하나에 이어 붙여 저장하므로 용량만큼의 메모리만 씁니다.
+    """
+
+    FIELDS = 7
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = array("q", bytes(8 * self.FIELDS * capacity))
+        self.start = 0
+        self.count = 0
+        self.labels = collections.OrderedDict()  # 트랜잭션 id -> 이름 (오래된 것부터)
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, position):
+        return (self.start + position) % self.capacity * self.FIELDS
+
+    def push(self, txn, label, hwnd, snapshot):
+        record = array("q", (txn, hwnd, *snapshot))
+        if len(record) != self.FIELDS:
+            raise ValueError("창 상태는 (left, top, right, bottom, 표시 상태) 5개 값이어야 합니다.")
+        if self.count == self.capacity:
+            # 가장 오래된 항목을 덮어씁니다. 그 트랜잭션이 통째로 밀려났으면 이름도 버립니다.
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+            oldest = self.data[self._offset(0)] if self.count else None
+            while self.labels and (oldest is None or next(iter(self.labels)) < oldest):
+                self.labels.popitem(last=False)
+        offset = self._offset(self.count)
+        self.data[offset:offset + self.FIELDS] = record
+        self.count += 1
+        self.labels.setdefault(txn, label)
+
+    def last_txn(self):
+        return self.data[self._offset(self.count - 1)] if self.count else None
+
+    def pop_txn(self):
+        """가장 최근 트랜잭션의 항목을 모두 꺼냅니다. 반환: (이름, [(hwnd, l, t, r, b, 표시 상태), ...])"""
+        txn = self.last_txn()
+        records = []
+        while self.count and self.data[self._offset(self.count - 1)] == txn:
+            offset = self._offset(self.count - 1)
+            records.append(tuple(self.data[offset + 1:offset + self.FIELDS]))
+            self.count -= 1
+        return self.labels.pop(txn, ""), records
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+        self.labels.clear()
+
+class GeometryJournal:
+    """
+    창을 옮기기 직전의 상태를 기록해 두었다가 되돌리거나(undo) 다시 실행(redo)합니다.
+    여러 창을 한 번에 옮기는 동작은 transaction()으로 묶어 한 번의 Ctrl+Z로 모두 되돌립니다.
+    기록은 용량이 고정된 링 버퍼에 두므로 오래 써도 메모리가 늘지 않습니다.
+    용량을 넘어 앞부분이 덮어쓰인 가장 오래된 트랜잭션은 남은 창만 되돌립니다.
+    """
+
+    def __init__(self, capacity=GEOMETRY_JOURNAL_CAPACITY, read_snapshot=None, restore=None):
+        self._undo = _JournalRing(capacity)
+        self._redo = _JournalRing(capacity)
+        self._read_snapshot = read_snapshot or read_window_snapshot
+        self._restore = restore or restore_window_snapshots
+        self._next_txn = 1
+        self._depth = 0
+        self._txn = None
+        self._label = ""
+        self._recorded = {}  # 이번 묶음에서 기록한 hwnd (기록한 순서)
+        # 묶음이 끝나거나 되돌리기/다시 실행을 마쳤을 때 (이름, [hwnd, ...])로 호출합니다.
+        # 묶음은 창을 옮기기 전에 끝날 수 있으므로 받는 쪽은 결과 위치를 조금 뒤에 읽어야 합니다.
+        self.on_commit = None
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def _new_txn(self):
+        txn, self._next_txn = self._next_txn, self._next_txn + 1
+        return txn
+
+    @contextlib.contextmanager
+    def transaction(self, label):
+        """안에서 기록한 창들을 한 번에 되돌릴 묶음으로 만듭니다. 겹쳐 쓰면 바깥 묶음 하나로 합칩니다."""
+        if self._depth == 0:
+            self._txn = self._new_txn()
+            self._label = label
+            self._recorded = {}
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                recorded, self._recorded = self._recorded, {}
+                self._txn = None
+                if recorded and self.on_commit is not None:
+                    self.on_commit(self._label, list(recorded))
+
+    def record(self, hwnd, label="창 이동", snapshot=None):
+        """창을 옮기기 전에 부릅니다. 같은 묶음에서 같은 창은 처음 상태만 남깁니다."""
+        if self._txn is None:
+            with self.transaction(label):
+                self.record(hwnd, snapshot=snapshot)
+            return
+        if hwnd in self._recorded:
+            return
+        try:
+            if snapshot is None:
+                snapshot = self._read_snapshot(hwnd)
+            self._undo.push(self._txn, self._label, hwnd, snapshot)
+        except Exception:
+            return  # 상태를 읽을 수 없는 창은 기록하지 않고 동작은 그대로 진행합니다.
+        self._recorded[hwnd] = None
+        self._redo.clear()
+
+    def record_many(self, hwnds, label):
+        with self.transaction(label):
+            for hwnd in hwnds:
+                self.record(hwnd)
+
+    def undo(self):
+        """가장 최근 묶음을 되돌립니다. 반환: (이름, 되돌린 창 수), 되돌릴 것이 없으면 None"""
+        return self._step(self._undo, self._redo)
+
+    def redo(self):
+        return self._step(self._redo, self._undo)
+
+    def _step(self, source, target):
+        if not source:
+            return None
+        label, records = source.pop_txn()
+        # 지금 상태를 반대쪽 기록에 남겨 두어야 다시 실행/되돌리기로 돌아올 수 있습니다.
+        txn = self._new_txn()
+        for record in reversed(records):
+            try:
+                target.push(txn, label, record[0], self._read_snapshot(record[0]))
+            except Exception:
+                continue  # 그 사이 닫힌 창
+        restored = self._restore(records)
+        if self.on_commit is not None:
+            self.on_commit(label, [record[0] for record in records])
+        return label, restored
+
 # ========= 유틸 =========
 def _tcl_safe(s: str) -> str:
     if s is None:
@@ -341,6 +1628,2437 @@ def _tcl_safe(s: str) -> str:
     s = str(s)
     return s.replace("\\", "\\\\").replace("[", "\\[").replace("]", "\\]").replace(";", "\\;")
 
+def _load_json_file(path):
+    """JSON 파일을 읽습니다. 없거나 깨졌으면 None. Tk를 쓰지 않으므로 어느 스레드에서나 부를 수 있습니다."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+# ========= 단일 인스턴스 =========
+class SingleInstance:
+    """
+    이름 있는 뮤텍스로 실행 중인 인스턴스를 감지하고,
+    나중에 실행된 프로세스의 인자를 named pipe로 기존 인스턴스에 전달합니다.
+    """
+
+    ERROR_ALREADY_EXISTS = 183
+
+    def __init__(self, name=SINGLE_INSTANCE_NAME):
+        user = os.environ.get("USERNAME") or "default"
+        self.mutex_name = f"Local\\{name}"
+        self.pipe_address = rf"\\.\pipe\{name}_{user}"
+        self.authkey = f"{name}:{user}".encode("utf-8")
+        self._mutex = None
+        self._listener = None
+        self._thread = None
+
+    def acquire(self):
+        """
+        첫 인스턴스이면 True, 이미 실행 중인 인스턴스가 있으면 False.
+        pywin32를 불러오기 전에 부르므로 ctypes로 kernel32를 직접 씁니다.
+        """
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateMutexW.restype = wintypes.HANDLE
+        kernel32.CreateMutexW.argtypes = (ctypes.c_void_p, wintypes.BOOL, wintypes.LPCWSTR)
+        self._mutex = kernel32.CreateMutexW(None, False, self.mutex_name)
+        return ctypes.get_last_error() != self.ERROR_ALREADY_EXISTS
+
+    def forward(self, message, timeout=2.0):
+        """기존 인스턴스에 메시지를 전달합니다. 기존 인스턴스가 아직 시작 중이면 잠시 재시도합니다."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with Client(self.pipe_address, family="AF_PIPE", authkey=self.authkey) as conn:
+                    conn.send(message)
+                return True
+            except OSError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.02)
+
+    def listen(self, on_message):
+        """백그라운드 스레드에서 전달된 메시지를 받아 on_message(message)를 호출합니다."""
+        self._listener = Listener(self.pipe_address, family="AF_PIPE", authkey=self.authkey)
+        self._thread = threading.Thread(target=self._accept_loop, args=(on_message,),
+                                        name="goto_center-instance", daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self, on_message):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return  # 리스너가 닫힘
+            except Exception:
+                continue  # 인증 실패 등은 무시하고 계속 대기
+            try:
+                with conn:
+                    message = conn.recv()
+                if isinstance(message, dict):
+                    on_message(message)
+            except Exception:
+                continue
+
+    def close(self):
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except Exception:
+                pass
+            self._listener = None
+        if self._mutex is not None:
+            try:
+                ctypes.windll.kernel32.CloseHandle(wintypes.HANDLE(self._mutex))
+            except Exception:
+                pass
+            self._mutex = None
+
+# ========= 타일 배치 =========
+TILING_LAYOUTS = {
+    "grid": "격자",
+    "columns": "세로 열",
+    "rows": "가로 줄",
+    "master-stack": "주 창 + 스택",
+    "cascade": "계단식",
+}
+TILING_GAP = 0
+TILING_MASTER_RATIO = 0.6
+TILING_CASCADE_STEP = 32
+TILING_CASCADE_SIZE = 2 / 3
+
+def split_count_by_area(count, work_areas):
+    """창 count개를 작업 영역 넓이에 비례해 나눕니다 (최대 나머지 방식)."""
+    areas = [(r - l) * (b - t) for l, t, r, b in work_areas]
+    total = sum(areas) or 1
+    exact = [count * a / total for a in areas]
+    counts = [int(x) for x in exact]
+    remainders = sorted(range(len(areas)), key=lambda i: exact[i] - counts[i], reverse=True)
+    for i in remainders[:count - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+def _grid_shape(layout, count):
+    if layout == "columns":
+        return count, 1
+    if layout == "rows":
+        return 1, count
+    cols = math.ceil(math.sqrt(count))
+    return cols, math.ceil(count / cols)
+
+def _tiling_frames_numpy(layout, count, work_area, min_w, min_h, gap, master_ratio):
+    wl, wt, wr, wb = work_area
+    W, H = wr - wl, wb - wt
+    i = np.arange(count, dtype=np.float64)
+    if layout in ("grid", "columns", "rows"):
+        cols, rows = _grid_shape(layout, count)
+        row = i // cols
+        in_row = np.minimum(cols, count - row * cols)  # 마지막 줄은 남은 창이 너비를 나눠 가짐
+        col = i - row * cols
+        width = (W - gap * (in_row - 1)) / in_row
+        height = np.full(count, (H - gap * (rows - 1)) / rows)
+        left = wl + col * (width + gap)
+        top = wt + row * (height + gap)
+    elif layout == "master-stack":
+        if count == 1:
+            left, top, width, height = (np.array([v], dtype=np.float64) for v in (wl, wt, W, H))
+        else:
+            master_w = (W - gap) * master_ratio
+            stack = count - 1
+            j = np.maximum(i - 1, 0)
+            stack_h = (H - gap * (stack - 1)) / stack
+            is_master = i == 0
+            left = np.where(is_master, wl, wl + master_w + gap)
+            top = np.where(is_master, wt, wt + j * (stack_h + gap))
+            width = np.where(is_master, master_w, W - master_w - gap)
+            height = np.where(is_master, H, stack_h)
+    elif layout == "cascade":
+        width = np.full(count, W * TILING_CASCADE_SIZE)
+        height = np.full(count, H * TILING_CASCADE_SIZE)
+        steps = max(1, int(min(W - width[0], H - height[0]) // TILING_CASCADE_STEP) + 1)
+        offset = (i % steps) * TILING_CASCADE_STEP
+        left = wl + offset
+        top = wt + offset
+    else:
+        raise ValueError(f"unknown tiling layout: {layout}")
+
+    l = np.rint(left)
+    t = np.rint(top)
+    r = np.rint(left + width)
+    b = np.rint(top + height)
+    # 최소 크기보다 작게 줄일 수 없는 창은 키우고, 작업 영역을 넘지 않도록 당겨 넣습니다.
+    w = np.maximum(r - l, min_w)
+    h = np.maximum(b - t, min_h)
+    l = np.maximum(np.minimum(l, wr - w), wl)
+    t = np.maximum(np.minimum(t, wb - h), wt)
+    return np.stack([l, t, l + w, t + h], axis=1).astype(np.int64)
+
+def _tiling_frames_python(layout, count, work_area, min_w, min_h, gap, master_ratio):
+    wl, wt, wr, wb = work_area
+    W, H = wr - wl, wb - wt
+    frames = []
+    if layout == "cascade":
+        cw, ch = W * TILING_CASCADE_SIZE, H * TILING_CASCADE_SIZE
+        steps = max(1, int(min(W - cw, H - ch) // TILING_CASCADE_STEP) + 1)
+    elif layout in ("grid", "columns", "rows"):
+        cols, rows = _grid_shape(layout, count)
+    elif layout != "master-stack":
+        raise ValueError(f"unknown tiling layout: {layout}")
+    for i in range(count):
+        if layout in ("grid", "columns", "rows"):
+            row = i // cols
+            in_row = min(cols, count - row * cols)
+            width = (W - gap * (in_row - 1)) / in_row
+            height = (H - gap * (rows - 1)) / rows
+            left = wl + (i - row * cols) * (width + gap)
+            top = wt + row * (height + gap)
+        elif layout == "master-stack":
+            if count == 1:
+                left, top, width, height = wl, wt, W, H
+            else:
+                master_w = (W - gap) * master_ratio
+                stack_h = (H - gap * (count - 2)) / (count - 1)
+                if i == 0:
+                    left, top, width, height = wl, wt, master_w, H
+                else:
+                    left, top = wl + master_w + gap, wt + (i - 1) * (stack_h + gap)
+                    width, height = W - master_w - gap, stack_h
+        else:
+            offset = (i % steps) * TILING_CASCADE_STEP
+            left, top, width, height = wl + offset, wt + offset, cw, ch
+
+        l, t = round(left), round(top)
+        w = max(round(left + width) - l, min_w[i])
+        h = max(round(top + height) - t, min_h[i])
+        l = max(min(l, wr - w), wl)
+        t = max(min(t, wb - h), wt)
+        frames.append((l, t, l + w, t + h))
+    return frames
+
+def plan_tiling(layout, count, work_areas, paddings=None, min_sizes=None,
+                gap=TILING_GAP, master_ratio=TILING_MASTER_RATIO):
+    """
+    창 count개의 타일 배치를 한 번에 계산합니다.
+    work_areas: 배치할 작업 영역 목록. 여러 개면 넓이에 비례해 창을 나눠 배치합니다.
+    paddings: 창마다 (pad_left, pad_top, pad_right, pad_bottom)  DWM 그림자 패딩
+    min_sizes: 창마다 시각적 프레임의 최소 (너비, 높이)
+    반환: (frames, outers)
+      frames: [(l, t, r, b), ...]  시각적 프레임 기준
+      outers: [(x, y, w, h), ...]  SetWindowPos에 넘길 바깥 사각형
+    NumPy가 있으면 모든 창을 배열 연산 한 번으로 계산합니다.
+    """
+    if count <= 0:
+        return [], []
+    paddings = paddings if paddings is not None else [(0, 0, 0, 0)] * count
+    min_sizes = min_sizes if min_sizes is not None else [(0, 0)] * count
+    counts = split_count_by_area(count, work_areas)
+
+    if np is not None:
+        pads = np.asarray(paddings, dtype=np.int64).reshape(count, 4)
+        mins = np.asarray(min_sizes, dtype=np.int64).reshape(count, 2)
+        chunks = []
+        start = 0
+        for work_area, n in zip(work_areas, counts):
+            if n:
+                chunks.append(_tiling_frames_numpy(layout, n, work_area, mins[start:start + n, 0],
+                                                   mins[start:start + n, 1], gap, master_ratio))
+            start += n
+        frames = np.concatenate(chunks)
+        outers = np.stack([
+            frames[:, 0] - pads[:, 0],
+            frames[:, 1] - pads[:, 1],
+            frames[:, 2] - frames[:, 0] + pads[:, 0] + pads[:, 2],
+            frames[:, 3] - frames[:, 1] + pads[:, 1] + pads[:, 3],
+        ], axis=1)
+        return [tuple(map(int, f)) for f in frames.tolist()], [tuple(map(int, o)) for o in outers.tolist()]
+
+    frames = []
+    start = 0
+    for work_area, n in zip(work_areas, counts):
+        if n:
+            mins = min_sizes[start:start + n]
+            frames.extend(_tiling_frames_python(layout, n, work_area, [m[0] for m in mins],
+                                                [m[1] for m in mins], gap, master_ratio))
+        start += n
+    outers = [
+        (l - pl, t - pt, r - l + pl + pr, b - t + pt + pb)
+        for (l, t, r, b), (pl, pt, pr, pb) in zip(frames, paddings)
+    ]
+    return frames, outers
+
+def get_min_track_size():
+    """시스템이 허용하는 창의 최소 바깥 크기 (SM_CXMINTRACK, SM_CYMINTRACK)."""
+    try:
+        return win32api.GetSystemMetrics(34), win32api.GetSystemMetrics(35)
+    except Exception:
+        return 0, 0
+
+def tile_windows(hwnds, layout, work_areas, learned_min_sizes=None):
+    """
+    창들을 타일 배치하고 한 번에 적용합니다.
+    learned_min_sizes: hwnd -> (최소 너비, 최소 높이). 목표보다 크게 남은 창의 실제 크기를 기록해
+    다음 배치부터 그 창의 최소 크기로 사용합니다.
+    반환: 배치한 창 수
+    """
+    if learned_min_sizes is None:
+        learned_min_sizes = {}
+    track_w, track_h = get_min_track_size()
+    ready, paddings, min_sizes = [], [], []
+    for hwnd in hwnds:
+        try:
+            if not prepare_window_for_move(hwnd):
+                continue
+            pad = get_frame_padding(hwnd)[:4]
+        except Exception:
+            continue
+        learned_w, learned_h = learned_min_sizes.get(hwnd, (0, 0))
+        ready.append(hwnd)
+        paddings.append(pad)
+        min_sizes.append((max(track_w - pad[0] - pad[2], learned_w), max(track_h - pad[1] - pad[3], learned_h)))
+
+    frames, outers = plan_tiling(layout, len(ready), work_areas, paddings, min_sizes)
+    moved = defer_window_positions(list(zip(ready, outers)))
+
+    for hwnd, (l, t, r, b) in zip(ready, frames):
+        try:
+            fl, ft, fr, fb = get_extended_frame_bounds(hwnd)
+        except Exception:
+            continue
+        if fr - fl > r - l + 2 or fb - ft > b - t + 2:
+            learned_min_sizes[hwnd] = (max(fr - fl, r - l), max(fb - ft, b - t))
+    return moved
+
+def benchmark_tiling(count=500, repeat=20):
+    """창 count개를 두 모니터에 걸쳐 격자 배치하는 계산 시간을 측정합니다."""
+    work_areas = [(0, 0, 2560, 1400), (2560, 0, 4480, 1040)]
+    paddings = [(7, 0, 7, 7)] * count
+    min_sizes = [(120, 80)] * count
+    result = {"windows": count, "numpy": np is not None}
+    for layout in TILING_LAYOUTS:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            plan_tiling(layout, count, work_areas, paddings, min_sizes)
+            timings.append(time.perf_counter() - started)
+        result[f"{layout}_best_ms"] = min(timings) * 1000
+    return result
+
+# ========= 스냅 영역 =========
+SNAP_GRID_CELL = 64          # 스냅 영역 색인의 격자 한 칸 크기(px)
+SNAP_REQUIRE_SHIFT = True    # 드래그 중 Shift를 누르고 있을 때만 스냅
+SNAP_HOTKEY_ID = 301
+SNAP_HOTKEY = (MOD_CONTROL | MOD_ALT, ord("Z"))
+
+def resolve_snap_zones(zones, monitors):
+    """
+    저장된 스냅 영역(모니터 번호 + 작업 영역 기준 상대 좌표)을 화면 절대 좌표로 바꿉니다.
+    지금 없는 모니터의 영역은 건너뜁니다. 반환: [(zone_index, (l, t, r, b)), ...]
+    """
+    resolved = []
+    for index, zone in enumerate(zones):
+        monitor = zone.get("monitor", 1)
+        if not 1 <= monitor <= len(monitors):
+            continue
+        wl, wt, _, _ = monitors[monitor - 1]["work"]
+        l, t, r, b = zone["rect"]
+        resolved.append((index, (wl + l, wt + t, wl + r, wt + b)))
+    return resolved
+
+class SnapZoneIndex:
+    """
+    스냅 영역 hit-test용 균일 격자 색인. 영역이나 모니터가 바뀔 때만 다시 만듭니다.
+    각 칸에는 그 칸에 걸친 영역이 넓이 오름차순으로 들어 있어,
+    마우스 위치 하나를 검사할 때 칸 하나의 후보만 보면 되고 처음 맞는 영역이 가장 작은 영역입니다.
+    """
+
+    def __init__(self, resolved_zones, cell=SNAP_GRID_CELL):
+        self.cell = cell
+        self.zones = dict(resolved_zones)
+        self.cells = {}
+        by_area = sorted(resolved_zones, key=lambda item: (item[1][2] - item[1][0]) * (item[1][3] - item[1][1]))
+        for index, (l, t, r, b) in by_area:
+            if r <= l or b <= t:
+                continue
+            for cy in range(t // cell, (b - 1) // cell + 1):
+                for cx in range(l // cell, (r - 1) // cell + 1):
+                    self.cells.setdefault((cx, cy), []).append((index, l, t, r, b))
+
+    def hit(self, x, y):
+        """(x, y)를 포함하는 가장 작은 영역의 번호. 없으면 None."""
+        for index, l, t, r, b in self.cells.get((x // self.cell, y // self.cell), ()):
+            if l <= x < r and t <= y < b:
+                return index
+        return None
+
+    def __bool__(self):
+        return bool(self.zones)
+
+def _linear_snap_hit(resolved_zones, x, y):
+    best = None
+    best_area = None
+    for index, (l, t, r, b) in resolved_zones:
+        if l <= x < r and t <= y < b:
+            area = (r - l) * (b - t)
+            if best_area is None or area < best_area:
+                best, best_area = index, area
+    return best
+
+def benchmark_snap_zones(zone_count=300, steps=200_000, seed=0):
+    """
+    합성 마우스 경로로 격자 색인과 전체 순회의 hit-test 비용을 비교합니다.
+    mismatches는 전체 순회와 결과가 다른 지점 수로, 0이 아니면 색인이 틀린 것입니다.
+    """
+    rng = random.Random(seed)
+    screen = (0, 0, 3840, 1440)
+    resolved = list(enumerate(_synthetic_desktop_rects(zone_count, seed=seed, screen=screen)))
+    started = time.perf_counter()
+    index = SnapZoneIndex(resolved)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # 관성이 있는 마우스 이동 경로
+    path = []
+    x, y, vx, vy = 1920.0, 720.0, 0.0, 0.0
+    for _ in range(steps):
+        vx = vx * 0.9 + rng.uniform(-6, 6)
+        vy = vy * 0.9 + rng.uniform(-6, 6)
+        x = min(max(x + vx, screen[0]), screen[2] - 1)
+        y = min(max(y + vy, screen[1]), screen[3] - 1)
+        path.append((int(x), int(y)))
+
+    started = time.perf_counter()
+    indexed = [index.hit(px, py) for px, py in path]
+    indexed_s = time.perf_counter() - started
+    sample = path[: max(1, steps // 20)]
+    started = time.perf_counter()
+    linear = [_linear_snap_hit(resolved, px, py) for px, py in sample]
+    linear_s = time.perf_counter() - started
+    mismatches = sum(1 for expected, actual in zip(linear, indexed) if expected != actual)
+    return {
+        "zones": zone_count,
+        "lookups": steps,
+        "build_ms": build_ms,
+        "indexed_us_per_lookup": indexed_s / steps * 1e6,
+        "linear_us_per_lookup": linear_s / len(sample) * 1e6,
+        "mismatches": mismatches,
+    }
+
+class SnapOverlay(tk.Toplevel):
+    """드래그 중 마우스 아래 스냅 영역을 반투명하게 보여주는 창."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.withdraw()
+        self.overrideredirect(True)
+        self.attributes("-topmost", True)
+        self.attributes("-alpha", 0.25)
+        self.configure(bg="#3B82F6")
+        self.shown_rect = None
+
+    def show_rect(self, rect):
+        if rect == self.shown_rect:
+            return
+        l, t, r, b = rect
+        self.geometry(f"{r - l}x{b - t}+{l}+{t}")
+        self.deiconify()
+        self.shown_rect = rect
+
+    def hide(self):
+        if self.shown_rect is not None:
+            self.withdraw()
+            self.shown_rect = None
+
+# ========= 창 선택자 =========
+class SelectorError(ValueError):
+    """선택자 문법 오류."""
+
+class SelectorContext:
+    """
+    한 번의 목록 갱신 동안 여러 창이 같이 쓰는 값을 캐시합니다.
+    visibility: hwnd -> 보이는 비율 (가림 분석 결과, 'hidden' 조건에 사용)
+    """
+
+    def __init__(self, visibility=None):
+        self.visibility = visibility or {}
+        self.process_names = {}  # pid -> 프로세스 이름
+        self.process_paths = {}  # pid -> 실행 파일 경로
+        self._monitor_indexes = None
+
+    def process_name(self, pid):
+        if pid not in self.process_names:
+            try:
+                self.process_names[pid] = psutil.Process(pid).name() if pid else ""
+            except Exception:
+                self.process_names[pid] = ""
+        return self.process_names[pid]
+
+    def process_path(self, pid):
+        if pid not in self.process_paths:
+            try:
+                self.process_paths[pid] = psutil.Process(pid).exe() if pid else ""
+            except Exception:
+                self.process_paths[pid] = ""
+        return self.process_paths[pid]
+
+    def monitor_index(self, hmonitor):
+        """모니터 핸들의 1부터 시작하는 번호 (왼쪽 위 모니터부터)."""
+        if self._monitor_indexes is None:
+            self._monitor_indexes = {
+                int(m["handle"]): index for index, m in enumerate(get_monitor_work_areas(), start=1)
+            }
+        return self._monitor_indexes.get(int(hmonitor), 0)
+
+class WindowFacts:
+    """창 하나의 속성을 처음 필요할 때만 읽고 캐시합니다."""
+
+    __slots__ = ("hwnd", "title", "context", "_values")
+
+    def __init__(self, hwnd, title, context=None):
+        self.hwnd = hwnd
+        self.title = title
+        self.context = context or SelectorContext()
+        self._values = {}
+
+    def get(self, field):
+        try:
+            return self._values[field]
+        except KeyError:
+            pass
+        try:
+            value = _FACT_GETTERS[field](self)
+        except Exception:
+            value = None
+        self._values[field] = value
+        return value
+
+def _fact_pid(facts):
+    return win32process.GetWindowThreadProcessId(facts.hwnd)[1]
+
+def _fact_monitor(facts):
+    MONITOR_DEFAULTTONEAREST = 2
+    return facts.context.monitor_index(win32api.MonitorFromWindow(facts.hwnd, MONITOR_DEFAULTTONEAREST))
+
+def _fact_hidden(facts):
+    fraction = facts.context.visibility.get(facts.hwnd)
+    return fraction is not None and fraction <= OCCLUSION_HIDDEN_THRESHOLD
+
+def _fact_topmost(facts):
+    return bool(win32gui.GetWindowLong(facts.hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST)
+
+_FACT_GETTERS = {
+    "title": lambda facts: facts.title,
+    "hwnd": lambda facts: facts.hwnd,
+    "class": lambda facts: win32gui.GetClassName(facts.hwnd),
+    "pid": _fact_pid,
+    "minimized": lambda facts: bool(win32gui.IsIconic(facts.hwnd)),
+    "maximized": lambda facts: bool(win32gui.IsZoomed(facts.hwnd)),
+    "topmost": _fact_topmost,
+    "hidden": _fact_hidden,
+    "rect": lambda facts: get_extended_frame_bounds(facts.hwnd),
+    "monitor": _fact_monitor,
+    "proc": lambda facts: facts.context.process_name(facts.get("pid")),
+    "exe": lambda facts: facts.context.process_path(facts.get("pid")),
+}
+
+# 값을 얻는 비용. 싼 조건부터 검사하고, 비싼 값(프로세스, DWM)은 앞 조건을 통과한 창에서만 읽습니다.
+_FIELD_COSTS = {
+    "title": 0, "hwnd": 0,
+    "class": 1, "pid": 1, "minimized": 1, "maximized": 1, "topmost": 1,
+    "hidden": 2, "rect": 2, "monitor": 2, "width": 2, "height": 2,
+    "proc": 3, "exe": 3,
+}
+_FIELD_ALIASES = {
+    "cls": "class", "process": "proc", "path": "exe", "mon": "monitor",
+    "min": "minimized", "max": "maximized", "w": "width", "h": "height",
+}
+_TEXT_FIELDS = {"title", "class", "proc", "exe"}
+_NUMBER_FIELDS = {"hwnd", "pid", "monitor", "width", "height"}
+_FLAG_FIELDS = {"minimized", "maximized", "topmost", "hidden"}
+_WORD_COST = 2  # 제목 → 클래스 → 프로세스 순으로 필요한 만큼만 읽음
+
+_SELECTOR_TOKEN = re.compile(
+    r"""\s*(?P<neg>[!-])?
+        (?:(?P<field>[A-Za-z]+)(?P<op>>=|<=|[:=~<>]))?
+        (?P<value>(?<=~)/(?:\\.|[^/\\])*/|"(?:\\.|[^"\\])*"|\S*)""",  # /정규식/은 '~' 뒤에서만
+    re.VERBOSE,
+)
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+def _read_number(field, value):
+    try:
+        return int(value, 0)
+    except ValueError:
+        raise SelectorError(f"'{field}'에는 숫자가 필요합니다: {value}") from None
+
+def _make_word_predicate(word):
+    word = word.casefold()
+
+    def predicate(facts):
+        if word in facts.title.casefold():
+            return True
+        return (word in (facts.get("class") or "").casefold()
+                or word in (facts.get("proc") or "").casefold())
+    return predicate
+
+def _make_field_predicate(field, op, raw_value):
+    if field in ("width", "height"):
+        index = 0 if field == "width" else 1
+
+        def read(facts):
+            rect = facts.get("rect")
+            return None if rect is None else (rect[2] - rect[0], rect[3] - rect[1])[index]
+    else:
+        def read(facts):
+            return facts.get(field)
+
+    if op == "~":
+        if not (len(raw_value) >= 2 and raw_value[0] == raw_value[-1] == "/"):
+            raise SelectorError(f"정규식은 /.../ 로 감싸야 합니다: {raw_value}")
+        if field not in _TEXT_FIELDS:
+            raise SelectorError(f"'{field}'에는 정규식을 쓸 수 없습니다.")
+        try:
+            pattern = re.compile(raw_value[1:-1], re.IGNORECASE)
+        except re.error as e:
+            raise SelectorError(f"정규식 오류: {e}") from None
+        return lambda facts: pattern.search(read(facts) or "") is not None
+
+    value = _unquote(raw_value)
+    if field in _NUMBER_FIELDS:
+        number = _read_number(field, value)
+        compare = {
+            ":": lambda a: a == number, "=": lambda a: a == number,
+            ">": lambda a: a > number, "<": lambda a: a < number,
+            ">=": lambda a: a >= number, "<=": lambda a: a <= number,
+        }[op]
+
+        def predicate(facts):
+            actual = read(facts)
+            return actual is not None and compare(actual)
+        return predicate
+
+    if op not in (":", "="):
+        raise SelectorError(f"'{field}'에는 '{op}' 비교를 쓸 수 없습니다.")
+    folded = value.casefold()
+    if op == "=":
+        return lambda facts: (read(facts) or "").casefold() == folded
+    return lambda facts: folded in (read(facts) or "").casefold()
+
+class WindowSelector:
+    """
+    컴파일된 창 선택자. 조건은 모두 AND이며, 값을 얻는 비용이 싼 조건부터 검사합니다.
+
+    문법 (공백으로 구분):
+      word                 제목/클래스/프로세스 이름에 포함 (따옴표로 공백 포함 가능)
+      title:값 class:값 proc:값 exe:값   부분 일치 (대소문자 무시), '=' 은 정확히 일치
+      title~/정규식/       정규식 검색
+      pid:123 hwnd:0x1F monitor:2 width>800 height<=600   숫자 비교
+      minimized maximized topmost hidden   상태 조건
+      !조건 또는 -조건     조건 부정
+    """
+
+    def __init__(self, text, predicates, fields=frozenset()):
+        self.text = text
+        self.fields = fields  # 조건에 쓰인 필드 이름 (미리 계산해 둘 값이 있는지 볼 때 씀)
+        self._predicates = predicates  # [(cost, negate, predicate), ...] 비용 순
+
+    def matches(self, facts):
+        for _, negate, predicate in self._predicates:
+            if bool(predicate(facts)) == negate:
+                return False
+        return True
+
+    def __bool__(self):
+        return bool(self._predicates)
+
+@functools.lru_cache(maxsize=128)
+def compile_selector(text):
+    """선택자 문자열을 한 번만 해석해 재사용합니다. 문법 오류는 SelectorError."""
+    predicates = []
+    fields = set()
+    position = 0
+    text = text or ""
+    while position < len(text):
+        match = _SELECTOR_TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            break
+        position = match.end()
+        negate = bool(match.group("neg"))
+        field, op, raw_value = match.group("field"), match.group("op"), match.group("value")
+        if field is not None:
+            field = _FIELD_ALIASES.get(field.lower(), field.lower())
+            if field not in _FIELD_COSTS or field in _FLAG_FIELDS:
+                # 'http://...' 처럼 필드가 아닌 단어는 통째로 검색어로 취급
+                raw_value = match.group(0).strip().lstrip("!-")
+                field = op = None
+        if field is None:
+            if not raw_value:
+                continue
+            word = _unquote(raw_value)
+            flag = _FIELD_ALIASES.get(word.lower(), word.lower())
+            if flag in _FLAG_FIELDS and not raw_value.startswith('"'):
+                fields.add(flag)
+                predicates.append((_FIELD_COSTS[flag], negate, functools.partial(WindowFacts.get, field=flag)))
+            else:
+                predicates.append((_WORD_COST, negate, _make_word_predicate(word)))
+            continue
+        if not raw_value:
+            raise SelectorError(f"'{field}{op}' 뒤에 값이 없습니다.")
+        fields.add(field)
+        predicates.append((_FIELD_COSTS[field], negate, _make_field_predicate(field, op, raw_value)))
+    predicates.sort(key=lambda item: item[0])
+    return WindowSelector(text, predicates, frozenset(fields))
+
+def find_windows(selector_text, windows=None, context=None, exclude=()):
+    """
+    선택자에 맞는 창을 Z 순서(맨 위 창이 먼저)로 반환: [(hwnd, title), ...]
+    'hidden' 조건이 있고 context에 가림 분석 결과가 없으면 같은 열거 결과로 계산합니다. exclude의 창은 다른 창을 가리지 않습니다.
+    """
+    selector = compile_selector(selector_text)
+    if windows is None:
+        windows = list_windows()
+    context = context or SelectorContext()
+    if "hidden" in selector.fields and not context.visibility:
+        # 클로킹된 창은 그려지지 않으므로 목록과 같이 가림 계산에서 뺍니다.
+        context.visibility = compute_window_visibility(
+            [w._hWnd for w in windows if not get_window_cloaked(w._hWnd)], exclude=exclude,
+        )
+    matched = []
+    for w in windows:
+        if selector.matches(WindowFacts(w._hWnd, w.title, context)):
+            matched.append((w._hWnd, w.title))
+    return matched
+
+def compile_search_selector(query):
+    """검색창 입력을 선택자로 컴파일합니다. 문법 오류면 검색어 전체를 한 단어로 찾습니다. 반환: (선택자, 오류 또는 None)"""
+    try:
+        return compile_selector(query), None
+    except SelectorError as e:
+        return WindowSelector(query, [(_WORD_COST, False, _make_word_predicate(query))]), str(e)
+
+# ========= 프로세스 자원 샘플러 =========
+PROCESS_SAMPLE_INTERVAL = 2.0  # 초. 한 번 훑는 데 오래 걸리면 이보다 길게 쉽니다.
+PROCESS_SAMPLER_CPU_BUDGET = 0.005  # 샘플러가 쓸 수 있는 CPU 시간 비율 (0.5%)
+
+class ProcessSampler:
+    """
+    psutil.process_iter로 모든 프로세스를 한 번에 훑어 pid별 CPU%, 작업 집합(메모리), 실행 파일 경로를 모으는
+    백그라운드 스레드. 창마다 psutil.Process를 만들지 않으므로 창이 많아도 비용이 프로세스 수에만 비례합니다.
+    한 번 훑는 데 쓴 CPU 시간이 예산을 넘지 않도록 다음 샘플까지의 간격을 늘립니다.
+    on_update(snapshot)는 이 스레드에서 호출되므로 Tk 작업은 App.post_to_ui로 넘겨야 합니다.
+    """
+
+    ATTRS = ["pid", "cpu_percent", "memory_info", "exe"]
+
+    def __init__(self, on_update, interval=PROCESS_SAMPLE_INTERVAL, cpu_budget=PROCESS_SAMPLER_CPU_BUDGET):
+        self.on_update = on_update
+        self.interval = interval
+        self.cpu_budget = cpu_budget
+        self.snapshot = {}  # pid -> {"cpu": float, "mem": int, "exe": str}
+        self.last_cost = 0.0  # 마지막 샘플에 쓴 CPU 시간(초)
+        self._cpu_count = psutil.cpu_count() or 1
+        self._stop = None  # 실행 중인 스레드의 중지 신호. 스레드마다 따로 만듭니다.
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._stop is not None and not self._stop.is_set()
+
+    def start(self):
+        if self.running:
+            return
+        # 멈추라고 알린 이전 스레드가 아직 샘플을 뜨는 중이어도 새 스레드는 자기 신호만 봅니다.
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                        name="goto_center-process-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    def sample(self):
+        started = time.thread_time()
+        snapshot = {}
+        for proc in psutil.process_iter(attrs=self.ATTRS, ad_value=None):
+            info = proc.info
+            memory = info.get("memory_info")
+            cpu = info.get("cpu_percent")
+            snapshot[info["pid"]] = {
+                # psutil은 코어 하나를 100%로 세므로 작업 관리자처럼 전체 CPU 대비 비율로 바꿉니다.
+                "cpu": cpu / self._cpu_count if cpu is not None else None,
+                "mem": memory.rss if memory is not None else None,
+                "exe": info.get("exe") or "",
+            }
+        self.last_cost = time.thread_time() - started
+        self.snapshot = snapshot  # 통째로 바꿔 끼우므로 다른 스레드에서 읽어도 안전합니다.
+        return snapshot
+
+    def _run(self, stop):
+        while not stop.is_set():
+            try:
+                snapshot = self.sample()
+            except Exception:
+                snapshot = None
+            if snapshot is not None and not stop.is_set():
+                self.on_update(snapshot)
+            stop.wait(max(self.interval, self.last_cost / self.cpu_budget))
+
+def _format_cpu_percent(value):
+    if value is None:
+        return "-"
+    return f"{value:.1f}%"
+
+def _format_memory(value):
+    if value is None:
+        return "-"
+    return f"{value / (1024 * 1024):,.1f} MB"
+
+# ========= 데스크톱 이벤트 수신 =========
+# SetWinEventHook으로 받는 이벤트 (최상위 창에 대한 것만 전달)
+WIN_EVENTS = {
+    0x0003: "foreground",   # EVENT_SYSTEM_FOREGROUND
+    0x000A: "movesizestart",  # EVENT_SYSTEM_MOVESIZESTART
+    0x000B: "movesizeend",    # EVENT_SYSTEM_MOVESIZEEND
+    0x8000: "create",       # EVENT_OBJECT_CREATE
+    0x8001: "destroy",      # EVENT_OBJECT_DESTROY
+    0x8002: "show",         # EVENT_OBJECT_SHOW
+    0x8003: "hide",         # EVENT_OBJECT_HIDE
+    0x800B: "locationchange",  # EVENT_OBJECT_LOCATIONCHANGE (창을 끄는 동안 계속 옴. 창마다 솎아서 전달)
+    0x800C: "namechange",   # EVENT_OBJECT_NAMECHANGE
+    0x8017: "cloaked",      # EVENT_OBJECT_CLOAKED
+    0x8018: "uncloaked",    # EVENT_OBJECT_UNCLOAKED
+}
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+GA_ROOT = 2
+LOCATION_EVENT_INTERVAL_MS = 100  # 같은 창의 위치 변경 이벤트는 이 간격에 한 번만 넘깁니다.
+
+WinEventProc = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD,
+) if hasattr(ctypes, "WINFUNCTYPE") else None
+
+def _event_hook_ranges(codes):
+    """연속한 이벤트 코드를 묶어 SetWinEventHook 호출 수를 줄입니다."""
+    ranges = []
+    for code in sorted(codes):
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ranges
+
+class DesktopEventListener:
+    """
+    숨겨진 최상위 창과 메시지 루프를 가진 백그라운드 스레드.
+    WM_DISPLAYCHANGE 같은 브로드캐스트 메시지, 전역 단축키(WM_HOTKEY),
+    최상위 창의 WinEvent(전면 전환, 생성/소멸, 제목 변경 등)를 받아 on_event(kind, payload)로 넘깁니다.
+    on_event는 이 스레드에서 호출되므로 Tk 작업은 App.post_to_ui로 넘겨야 합니다.
+    """
+
+    WINDOW_CLASS = "goto_center_event_listener"
+
+    def __init__(self, on_event, hotkeys=None):
+        self.on_event = on_event
+        self.hotkeys = dict(hotkeys or {})  # 단축키 id -> (modifiers, virtual key)
+        self.registered_hotkeys = set()
+        self.hwnd = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._hooks = []
+        self._location_times = {}  # hwnd -> 마지막으로 넘긴 위치 변경 이벤트 시각 (ms)
+        self._win_event_proc = WinEventProc(self._on_win_event)  # 콜백이 GC되지 않도록 보관
+
+    @property
+    def has_window_events(self):
+        """WinEvent 훅이 하나라도 걸렸는지. 잠긴 세션에서는 훅 없이 실행될 수 있습니다."""
+        return bool(self._hooks)
+
+    def start(self, timeout=2.0):
+        self._thread = threading.Thread(target=self._run, name="goto_center-events", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self.hwnd is not None
+
+    def _run(self):
+        message_map = {
+            win32con.WM_DISPLAYCHANGE: self._on_display_change,
+            win32con.WM_HOTKEY: self._on_hotkey,
+            win32con.WM_DESTROY: self._on_destroy,
+        }
+        try:
+            hinst = win32api.GetModuleHandle(None)
+            wc = win32gui.WNDCLASS()
+            wc.hInstance = hinst
+            wc.lpszClassName = self.WINDOW_CLASS
+            wc.lpfnWndProc = message_map
+            try:
+                win32gui.RegisterClass(wc)
+            except win32gui.error:
+                pass  # 이미 등록된 클래스
+            # 브로드캐스트를 받아야 하므로 메시지 전용 창이 아닌 숨겨진 최상위 창을 만듭니다.
+            self.hwnd = win32gui.CreateWindow(self.WINDOW_CLASS, "goto_center events", 0,
+                                              0, 0, 0, 0, 0, 0, hinst, None)
+            # 전역 단축키는 창을 만든 스레드에서 등록해야 합니다.
+            for hotkey_id, (modifiers, vk) in self.hotkeys.items():
+                if ctypes.windll.user32.RegisterHotKey(wintypes.HWND(self.hwnd), hotkey_id, modifiers, vk):
+                    self.registered_hotkeys.add(hotkey_id)
+            # WinEvent 훅도 메시지 루프가 도는 이 스레드에서 걸어야 콜백이 옵니다.
+            user32 = ctypes.windll.user32
+            user32.SetWinEventHook.restype = wintypes.HANDLE
+            user32.SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, WinEventProc,
+                                               wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+            user32.UnhookWinEvent.argtypes = [wintypes.HANDLE]
+            user32.GetAncestor.restype = wintypes.HWND
+            user32.GetAncestor.argtypes = [wintypes.HWND, wintypes.UINT]
+            for first, last in _event_hook_ranges(WIN_EVENTS):
+                hook = user32.SetWinEventHook(
+                    first, last, None, self._win_event_proc, 0, 0,
+                    WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+                )
+                if hook:
+                    self._hooks.append(hook)
+        except Exception:
+            self.hwnd = None
+            return
+        finally:
+            self._ready.set()
+        win32gui.PumpMessages()
+
+    def _emit(self, kind, payload=None):
+        try:
+            self.on_event(kind, payload or {})
+        except Exception:
+            pass
+
+    def _on_display_change(self, hwnd, msg, wparam, lparam):
+        self._emit("display_changed", {"width": lparam & 0xFFFF, "height": (lparam >> 16) & 0xFFFF})
+        return 0
+
+    def _on_hotkey(self, hwnd, msg, wparam, lparam):
+        self._emit("hotkey", {"id": int(wparam)})
+        return 0
+
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        # 창 안의 컨트롤이나 캐럿 같은 하위 개체 이벤트는 버립니다.
+        if id_object != OBJID_WINDOW or id_child != 0 or not hwnd:
+            return
+        name = WIN_EVENTS.get(event)
+        if name is None:
+            return
+        if name == "locationchange":
+            # 받는 쪽은 이벤트를 모았다가 그때의 위치를 읽으므로, 중간 이벤트는 버려도 마지막 위치를 놓치지 않습니다.
+            last = self._location_times.get(hwnd)
+            if last is not None and (event_time - last) & 0xFFFFFFFF < LOCATION_EVENT_INTERVAL_MS:
+                return
+        elif name == "destroy":
+            self._location_times.pop(hwnd, None)
+        if name != "destroy" and ctypes.windll.user32.GetAncestor(hwnd, GA_ROOT) != hwnd:
+            return
+        if name == "locationchange":
+            self._location_times[hwnd] = event_time
+        self._emit("window_event", {"event": name, "hwnd": int(hwnd)})
+
+    def _on_destroy(self, hwnd, msg, wparam, lparam):
+        for hook in self._hooks:
+            ctypes.windll.user32.UnhookWinEvent(hook)
+        self._hooks.clear()
+        for hotkey_id in self.registered_hotkeys:
+            ctypes.windll.user32.UnregisterHotKey(wintypes.HWND(hwnd), hotkey_id)
+        self.registered_hotkeys.clear()
+        win32gui.PostQuitMessage(0)
+        return 0
+
+    def stop(self):
+        if self.hwnd is not None:
+            try:
+                win32gui.PostMessage(self.hwnd, win32con.WM_CLOSE, 0, 0)
+            except Exception:
+                pass
+            self.hwnd = None
+
+# ========= 창 미리보기 (DWM 썸네일) =========
+PREVIEW_PANEL_WIDTH = 320
+PREVIEW_POOL_SIZE = 8  # 등록해 둘 썸네일 핸들 수. 선택을 오가도 다시 등록하지 않도록 재사용합니다.
+
+DWM_TNP_RECTDESTINATION = 0x00000001
+DWM_TNP_OPACITY = 0x00000004
+DWM_TNP_VISIBLE = 0x00000008
+DWM_TNP_SOURCECLIENTAREAONLY = 0x00000010
+
+class DWM_THUMBNAIL_PROPERTIES(ctypes.Structure):
+    _fields_ = [
+        ("dwFlags", wintypes.DWORD),
+        ("rcDestination", wintypes.RECT),
+        ("rcSource", wintypes.RECT),
+        ("opacity", ctypes.c_ubyte),
+        ("fVisible", wintypes.BOOL),
+        ("fSourceClientAreaOnly", wintypes.BOOL),
+    ]
+
+class DwmThumbnailBackend:
+    """
+    DwmRegisterThumbnail 계열 API. 컴포지터가 원본 창을 대상 창의 표면에 직접 그리므로
+    파이썬 쪽에서는 픽셀을 전혀 복사하지 않습니다. 대상 창은 최상위 창이어야 합니다.
+    """
+
+    def __init__(self):
+        dwmapi = ctypes.windll.dwmapi
+        self._register = dwmapi.DwmRegisterThumbnail
+        self._register.argtypes = [wintypes.HWND, wintypes.HWND, ctypes.POINTER(ctypes.c_void_p)]
+        self._register.restype = ctypes.c_long
+        self._update = dwmapi.DwmUpdateThumbnailProperties
+        self._update.argtypes = [ctypes.c_void_p, ctypes.POINTER(DWM_THUMBNAIL_PROPERTIES)]
+        self._update.restype = ctypes.c_long
+        self._query_size = dwmapi.DwmQueryThumbnailSourceSize
+        self._query_size.argtypes = [ctypes.c_void_p, ctypes.POINTER(wintypes.SIZE)]
+        self._query_size.restype = ctypes.c_long
+        self._unregister = dwmapi.DwmUnregisterThumbnail
+        self._unregister.argtypes = [ctypes.c_void_p]
+        self._unregister.restype = ctypes.c_long
+
+    def register(self, dest_hwnd, source_hwnd):
+        """썸네일 핸들을 반환합니다. 실패하면 None."""
+        handle = ctypes.c_void_p()
+        if self._register(dest_hwnd, source_hwnd, ctypes.byref(handle)) != 0 or not handle.value:
+            return None
+        return handle.value
+
+    def update(self, handle, rect=None, visible=True):
+        props = DWM_THUMBNAIL_PROPERTIES()
+        props.dwFlags = DWM_TNP_VISIBLE | DWM_TNP_OPACITY | DWM_TNP_SOURCECLIENTAREAONLY
+        props.fVisible = bool(visible)
+        props.opacity = 255
+        props.fSourceClientAreaOnly = False
+        if rect is not None:
+            props.dwFlags |= DWM_TNP_RECTDESTINATION
+            props.rcDestination = wintypes.RECT(*rect)
+        return self._update(handle, ctypes.byref(props)) == 0
+
+    def source_size(self, handle):
+        size = wintypes.SIZE()
+        if self._query_size(handle, ctypes.byref(size)) != 0:
+            return None
+        return size.cx, size.cy
+
+    def unregister(self, handle):
+        self._unregister(handle)
+
+class SimulatedThumbnailBackend:
+    """DWM 대신 쓰는 메모리 안의 백엔드. 등록·갱신·해제 기록을 남겨 풀 동작을 확인할 때 씁니다."""
+
+    def __init__(self, source_sizes=None):
+        self.source_sizes = dict(source_sizes or {})  # 원본 hwnd -> (너비, 높이)
+        self.handles = {}  # 핸들 -> {"dest", "source", "rect", "visible"}
+        self.calls = collections.Counter()
+        self._next_handle = 1
+
+    def register(self, dest_hwnd, source_hwnd):
+        self.calls["register"] += 1
+        handle = self._next_handle
+        self._next_handle += 1
+        self.handles[handle] = {"dest": dest_hwnd, "source": source_hwnd, "rect": None, "visible": False}
+        return handle
+
+    def update(self, handle, rect=None, visible=True):
+        self.calls["update"] += 1
+        entry = self.handles.get(handle)
+        if entry is None:
+            return False
+        if rect is not None:
+            entry["rect"] = tuple(rect)
+        entry["visible"] = bool(visible)
+        return True
+
+    def source_size(self, handle):
+        entry = self.handles.get(handle)
+        return self.source_sizes.get(entry["source"], (1280, 720)) if entry else None
+
+    def unregister(self, handle):
+        self.calls["unregister"] += 1
+        self.handles.pop(handle, None)
+
+def fit_rect_preserving_aspect(container, source_size):
+    """source_size 비율을 유지하며 container 안에 가운데 맞춘 사각형. 원본보다 크게 늘리지는 않습니다."""
+    l, t, r, b = container
+    box_w, box_h = r - l, b - t
+    if not source_size or source_size[0] <= 0 or source_size[1] <= 0 or box_w <= 0 or box_h <= 0:
+        return container
+    scale = min(box_w / source_size[0], box_h / source_size[1], 1.0)
+    w = max(1, int(source_size[0] * scale))
+    h = max(1, int(source_size[1] * scale))
+    x = l + (box_w - w) // 2
+    y = t + (box_h - h) // 2
+    return (x, y, x + w, y + h)
+
+class ThumbnailPool:
+    """
+    원본 창별 썸네일 핸들을 LRU로 재사용합니다. 한 번에 하나만 보이게 하고,
+    선택이 다른 창으로 옮겨 가면 이전 핸들은 숨기기만 해 두었다가 다시 고르면 바로 씁니다.
+    """
+
+    def __init__(self, backend, dest_hwnd, capacity=PREVIEW_POOL_SIZE):
+        self.backend = backend
+        self.dest_hwnd = dest_hwnd
+        self.capacity = capacity
+        self._handles = collections.OrderedDict()  # 원본 hwnd -> 핸들
+        self._shown = None
+
+    def __len__(self):
+        return len(self._handles)
+
+    def _acquire(self, source_hwnd):
+        handle = self._handles.get(source_hwnd)
+        if handle is not None:
+            self._handles.move_to_end(source_hwnd)
+            return handle
+        handle = self.backend.register(self.dest_hwnd, source_hwnd)
+        if handle is None:
+            return None
+        self._handles[source_hwnd] = handle
+        while len(self._handles) > self.capacity:
+            old_source, old_handle = self._handles.popitem(last=False)
+            if old_source == self._shown:
+                self._shown = None
+            self.backend.unregister(old_handle)
+        return handle
+
+    def show(self, source_hwnd, container):
+        """source_hwnd의 미리보기를 대상 창 클라이언트 좌표 container 안에 보여줍니다. 반환: 그린 사각형 또는 None"""
+        if self._shown is not None and self._shown != source_hwnd:
+            self.hide()
+        handle = self._acquire(source_hwnd)
+        if handle is None:
+            return None
+        rect = fit_rect_preserving_aspect(container, self.backend.source_size(handle))
+        if not self.backend.update(handle, rect, visible=True):
+            self.release(source_hwnd)
+            return None
+        self._shown = source_hwnd
+        return rect
+
+    def hide(self):
+        if self._shown is not None:
+            handle = self._handles.get(self._shown)
+            if handle is not None:
+                self.backend.update(handle, visible=False)
+            self._shown = None
+
+    def release(self, source_hwnd):
+        """원본 창이 닫혔을 때 핸들을 풀어 줍니다."""
+        handle = self._handles.pop(source_hwnd, None)
+        if handle is not None:
+            self.backend.unregister(handle)
+        if self._shown == source_hwnd:
+            self._shown = None
+
+    def clear(self):
+        for handle in self._handles.values():
+            self.backend.unregister(handle)
+        self._handles.clear()
+        self._shown = None
+
+# ========= 창 모델 / 빠른 전환기 =========
+QUICK_SWITCHER_HOTKEY_ID = 201
+QUICK_SWITCHER_HOTKEY = (MOD_CONTROL | MOD_ALT, VK_SPACE)
+QUICK_SWITCHER_ROWS = 12
+
+class WindowModel:
+    """
+    WinEvent로 계속 갱신되는 창 목록. 최근에 전면으로 온 창이 앞에 오는 MRU 순서를 유지합니다.
+    항목: hwnd -> {"title", "proc", "hay"}  (hay는 검색용 소문자 문자열)
+    """
+
+    def __init__(self):
+        self.entries = collections.OrderedDict()
+        self.version = 0  # 내용이 바뀔 때마다 증가
+
+    def reset(self, windows):
+        """list_windows() 결과(Z 순서)로 다시 채웁니다. Z 순서를 처음 MRU 순서로 씁니다."""
+        process_names = {}
+        self.entries.clear()
+        for w in windows:
+            hwnd = w._hWnd
+            try:
+                pid = win32process.GetWindowThreadProcessId(hwnd)[1]
+            except Exception:
+                pid = 0
+            if pid not in process_names:
+                try:
+                    process_names[pid] = psutil.Process(pid).name() if pid else ""
+                except Exception:
+                    process_names[pid] = ""
+            self._store(hwnd, w.title, process_names[pid])
+        self.version += 1
+
+    def _store(self, hwnd, title, proc):
+        self.entries[hwnd] = {"title": title, "proc": proc, "hay": f"{title} {proc}".casefold()}
+
+    def adopt(self, other):
+        """다른 스레드에서 reset()으로 채운 모델의 내용을 넘겨받습니다."""
+        self.entries = other.entries
+        self.version += 1
+
+    def apply_event(self, event, hwnd):
+        """WinEvent 하나를 반영합니다. 목록이 바뀌었으면 True."""
+        if event in ("destroy", "hide"):
+            if self.entries.pop(hwnd, None) is None:
+                return False
+        elif event in ("foreground", "show", "create", "namechange"):
+            try:
+                if not win32gui.IsWindowVisible(hwnd):
+                    return False
+                title = win32gui.GetWindowText(hwnd)
+            except Exception:
+                return False
+            if not title:
+                return self.entries.pop(hwnd, None) is not None
+            entry = self.entries.get(hwnd)
+            if entry is None:
+                self._store(hwnd, title, get_window_process_name(hwnd))
+            elif entry["title"] != title:
+                self._store(hwnd, title, entry["proc"])
+            elif event != "foreground":
+                return False
+            if event == "foreground":
+                self.entries.move_to_end(hwnd, last=False)
+        else:
+            return False
+        self.version += 1
+        return True
+
+    def search(self, query, limit=QUICK_SWITCHER_ROWS, exclude=()):
+        """
+        검색어에 맞는 창을 순위대로 반환: [(hwnd, entry), ...]
+        제목이 검색어로 시작 → 단어가 검색어로 시작 → 어딘가 포함 순, 같은 순위는 MRU 순서.
+        """
+        words = query.casefold().split()
+        if not words:
+            return [(hwnd, entry) for hwnd, entry in self.entries.items() if hwnd not in exclude][:limit]
+        first = words[0]
+        ranked = []
+        for order, (hwnd, entry) in enumerate(self.entries.items()):
+            hay = entry["hay"]
+            if hwnd in exclude or not all(word in hay for word in words):
+                continue
+            if hay.startswith(first):
+                rank = 0
+            elif f" {first}" in hay:
+                rank = 1
+            else:
+                rank = 2
+            ranked.append((rank, order, hwnd, entry))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [(hwnd, entry) for _, _, hwnd, entry in ranked[:limit]]
+
+class QuickSwitcher(tk.Toplevel):
+    """
+    전역 단축키로 여는 빠른 전환기. 한 번 만들어 숨겨 두고 창 모델만 계속 갱신하므로,
+    열 때는 목록 몇 줄을 그리는 일만 남습니다. 마지막으로 열 때 걸린 시간은 last_show_ms에 남깁니다.
+    """
+
+    def __init__(self, master, model, exclude_hwnds=()):
+        super().__init__(master)
+        self.model = model
+        self.exclude_hwnds = exclude_hwnds  # 이 프로그램 창처럼 목록에서 뺄 hwnd를 돌려주는 함수 또는 목록
+        self.results = []
+        self.last_show_ms = None
+        self._rendered_version = None
+
+        self.withdraw()
+        self.overrideredirect(True)
+        self.attributes("-topmost", True)
+
+        frame = ttk.Frame(self, style="Light.TFrame", padding=(10, 10))
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.query_var = tk.StringVar()
+        self.entry = ttk.Entry(frame, textvariable=self.query_var, width=60, font=("Segoe UI", 12))
+        self.entry.pack(fill=tk.X)
+        self.listbox = tk.Listbox(frame, height=QUICK_SWITCHER_ROWS, activestyle="none", borderwidth=0,
+                                  highlightthickness=0, font=("Segoe UI", 10), selectbackground="#E6EFFB",
+                                  selectforeground="#1B2430")
+        self.listbox.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+        self.footer = ttk.Label(frame, text="", style="Light.TLabel", foreground="#6B7280")
+        self.footer.pack(fill=tk.X, pady=(6, 0))
+
+        self.query_var.trace_add("write", lambda *args: self._render())
+        self.entry.bind("<Down>", lambda e: self._move_selection(1))
+        self.entry.bind("<Up>", lambda e: self._move_selection(-1))
+        self.entry.bind("<Return>", lambda e: self.activate_selected())
+        self.listbox.bind("<Double-1>", lambda e: self.activate_selected())
+        self.bind("<Escape>", lambda e: self.hide())
+        self.bind("<FocusOut>", self._on_focus_out)
+
+    def _excluded(self):
+        return set(self.exclude_hwnds() if callable(self.exclude_hwnds) else self.exclude_hwnds)
+
+    def toggle(self):
+        if self.winfo_viewable():
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        started = time.perf_counter()
+        self.query_var.set("")  # trace가 목록을 다시 그림
+        self._place_on_foreground_monitor()
+        self.deiconify()
+        self.lift()
+        self.entry.focus_force()
+        try:
+            win32gui.SetForegroundWindow(int(self.wm_frame(), 16))
+        except Exception:
+            pass
+        self.update_idletasks()
+        self.last_show_ms = (time.perf_counter() - started) * 1000
+        self.footer.config(text=f"Enter 전환 · Esc 닫기 · 표시 {self.last_show_ms:.1f} ms")
+
+    def hide(self):
+        self.withdraw()
+
+    def refresh_if_visible(self):
+        """창 모델이 바뀌었을 때 호출. 보이는 중일 때만 다시 그립니다."""
+        if self.winfo_viewable() and self._rendered_version != self.model.version:
+            self._render()
+
+    def _render(self):
+        self.results = self.model.search(self.query_var.get(), exclude=self._excluded())
+        self._rendered_version = self.model.version
+        self.listbox.delete(0, tk.END)
+        if self.results:
+            self.listbox.insert(tk.END, *(
+                f"{_shorten_text(entry['title'], 70)}    —  {entry['proc']}" for _, entry in self.results
+            ))
+            # 검색어가 없으면 Alt+Tab처럼 바로 전에 쓰던 창을 먼저 고릅니다.
+            index = 1 if not self.query_var.get().strip() and len(self.results) > 1 else 0
+            self.listbox.selection_set(index)
+            self.listbox.see(index)
+
+    def _move_selection(self, step):
+        if not self.results:
+            return "break"
+        current = self.listbox.curselection()
+        index = (current[0] if current else 0) + step
+        index = max(0, min(index, len(self.results) - 1))
+        self.listbox.selection_clear(0, tk.END)
+        self.listbox.selection_set(index)
+        self.listbox.see(index)
+        return "break"
+
+    def activate_selected(self):
+        current = self.listbox.curselection()
+        if not current or current[0] >= len(self.results):
+            return
+        hwnd = self.results[current[0]][0]
+        self.hide()
+        activate_window(hwnd)
+
+    def _place_on_foreground_monitor(self):
+        try:
+            work = _get_work_area_rect_for_hwnd(win32gui.GetForegroundWindow())
+        except Exception:
+            work = (0, 0, self.winfo_screenwidth(), self.winfo_screenheight())
+        self.update_idletasks()
+        width = max(self.winfo_reqwidth(), 560)
+        x = work[0] + (work[2] - work[0] - width) // 2
+        y = work[1] + (work[3] - work[1]) // 5
+        self.geometry(f"+{x}+{y}")
+
+    def _on_focus_out(self, event):
+        # 자식 위젯 사이의 포커스 이동은 무시하고, 다른 프로그램으로 넘어갔을 때만 닫습니다.
+        try:
+            focused = self.focus_get()
+        except (KeyError, tk.TclError):
+            focused = None
+        if focused is None:
+            self.hide()
+
+# ========= 프리셋 저장소 (SQLite) =========
+PRESET_HISTORY_LIMIT = 5000  # 기억한 크기/위치 기록은 종류별로 이만큼만 남김
+
+def get_preset_kind(preset):
+    """프리셋에 들어 있는 값의 종류: "both", "size", "position" 또는 None."""
+    has_size = _read_int_pair(preset.get("size")) is not None
+    has_position = _read_int_pair(preset.get("position")) is not None
+    if has_size and has_position:
+        return "both"
+    if has_size:
+        return "size"
+    if has_position:
+        return "position"
+    return None
+
+class SqlitePresetStore:
+    """
+    큰 프리셋 모음을 위한 선택적 SQLite 저장소.
+    JSON 저장과 달리 시작할 때 필요한 행만 읽고, 바뀐 프리셋만 upsert 합니다.
+    (name, kind)가 같은 프리셋은 하나로 취급합니다. 앱의 덮어쓰기 규칙과 같습니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS presets (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            source_title TEXT NOT NULL DEFAULT '',
+            source_app TEXT NOT NULL DEFAULT '',
+            width INTEGER, height INTEGER,
+            x INTEGER, y INTEGER,
+            updated_at TEXT NOT NULL DEFAULT '',
+            UNIQUE (name, kind)
+        );
+        CREATE INDEX IF NOT EXISTS idx_presets_name ON presets (name COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_presets_kind ON presets (kind);
+        CREATE INDEX IF NOT EXISTS idx_presets_source_app ON presets (source_app);
+        CREATE TABLE IF NOT EXISTS window_history (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            source_title TEXT NOT NULL DEFAULT '',
+            source_app TEXT NOT NULL DEFAULT '',
+            a INTEGER NOT NULL, b INTEGER NOT NULL,
+            recorded_at TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_kind ON window_history (kind, id);
+        CREATE INDEX IF NOT EXISTS idx_history_source_app ON window_history (source_app, kind);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+
+    def __init__(self, path, history_limit=PRESET_HISTORY_LIMIT):
+        self.path = Path(path)
+        self.history_limit = history_limit
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(self.SCHEMA)
+
+    @property
+    def migrated(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'migrated_from_json'").fetchone()
+        return row is not None
+
+    def mark_migrated(self, note):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (f"{time.strftime('%Y-%m-%d %H:%M:%S')} {note}",),
+            )
+
+    def load_presets(self):
+        rows = self.conn.execute(
+            "SELECT name, source_title, source_app, width, height, x, y, updated_at FROM presets ORDER BY id"
+        )
+        presets = []
+        for name, source_title, source_app, width, height, x, y, updated_at in rows:
+            presets.append({
+                "name": name,
+                "source_title": source_title,
+                "source_app": source_app,
+                "size": [width, height] if width is not None and height is not None else None,
+                "position": [x, y] if x is not None and y is not None else None,
+                "updated_at": updated_at,
+            })
+        return presets
+
+    def upsert_presets(self, presets):
+        """프리셋들을 한 트랜잭션으로 넣거나 갱신합니다. 기존 행의 순서(id)는 유지됩니다."""
+        rows = []
+        for preset in presets:
+            kind = get_preset_kind(preset)
+            if kind is None:
+                continue
+            size = _read_int_pair(preset.get("size")) or (None, None)
+            position = _read_int_pair(preset.get("position")) or (None, None)
+            rows.append((
+                preset.get("name") or "", kind,
+                preset.get("source_title") or "", preset.get("source_app") or "",
+                size[0], size[1], position[0], position[1],
+                preset.get("updated_at") or "",
+            ))
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO presets (name, kind, source_title, source_app, width, height, x, y, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (name, kind) DO UPDATE SET
+                    source_title = excluded.source_title,
+                    source_app = excluded.source_app,
+                    width = excluded.width, height = excluded.height,
+                    x = excluded.x, y = excluded.y,
+                    updated_at = excluded.updated_at
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def record_history(self, kind, value, source_title="", source_app="", recorded_at=None):
+        """기억한 크기("size") 또는 위치("position")를 기록에 추가합니다."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO window_history (kind, source_title, source_app, a, b, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, source_title or "", source_app or "", int(value[0]), int(value[1]),
+                 recorded_at or time.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            # id는 두 종류가 같이 쓰는 번호이므로, 같은 종류에서 history_limit번째보다 오래된 행을 찾아 지웁니다.
+            self.conn.execute(
+                """
+                DELETE FROM window_history WHERE kind = ? AND id <= (
+                    SELECT id FROM window_history WHERE kind = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+                )
+                """,
+                (kind, kind, self.history_limit),
+            )
+
+    def latest_history(self, kind):
+        """가장 최근에 기억한 값과 원본 창 제목, 실행 파일 이름. 없으면 (None, None, None)."""
+        row = self.conn.execute(
+            "SELECT a, b, source_title, source_app FROM window_history WHERE kind = ? ORDER BY id DESC LIMIT 1",
+            (kind,),
+        ).fetchone()
+        if row is None:
+            return None, None, None
+        return (row[0], row[1]), row[2], row[3]
+
+    def close(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+# ========= 프리셋 팔레트 =========
+PRESET_PALETTE_ROWS = 14
+
+class PresetSearchIndex:
+    """
+    프리셋 팔레트의 검색 색인. 프리셋마다 적용할 수 있는 값(크기/위치)이 한 줄씩 됩니다.
+    프리셋 하나가 바뀌면 그 프리셋의 줄만 다시 만듭니다.
+    """
+
+    def __init__(self):
+        self.rows_by_preset = []  # 프리셋 인덱스 -> [row, ...]
+        self.version = 0
+
+    def reset(self, presets):
+        self.rows_by_preset = [self._make_rows(index, preset) for index, preset in enumerate(presets)]
+        self.version += 1
+
+    def update(self, index, preset):
+        rows = self._make_rows(index, preset)
+        if index < len(self.rows_by_preset):
+            self.rows_by_preset[index] = rows
+        else:
+            self.rows_by_preset.append(rows)
+        self.version += 1
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.rows_by_preset)
+
+    def _make_rows(self, index, preset):
+        name = preset.get("name") or f"프리셋 {index + 1}"
+        source_app = preset.get("source_app") or ""
+        rows = []
+        size = _read_int_pair(preset.get("size"))
+        if size is not None:
+            rows.append(self._make_row(index, "size", name, f"크기 {size[0]} x {size[1]}", source_app))
+        position = _read_int_pair(preset.get("position"))
+        if position is not None:
+            rows.append(self._make_row(index, "position", name, f"위치 {position[0]}, {position[1]}", source_app))
+        return rows
+
+    def _make_row(self, index, kind, name, value_text, source_app):
+        folded_name = name.casefold()
+        return {
+            "index": index,
+            "kind": kind,
+            "label": f"{_shorten_text(name, 48)}    {value_text}" + (f"    · {source_app}" if source_app else ""),
+            "name": folded_name,
+            "hay": f"{folded_name} {value_text.casefold()} {source_app.casefold()}",
+        }
+
+    def iter_rows(self):
+        for rows in self.rows_by_preset:
+            yield from rows
+
+    def search(self, query, candidates=None):
+        """
+        검색어의 모든 단어가 들어 있는 줄을 순위대로 반환합니다.
+        이름이 검색어로 시작 → 이름의 단어가 검색어로 시작 → 이름에 포함 → 값/프로그램에만 포함 순,
+        같은 순위는 짧은 이름과 저장 순서가 먼저입니다. candidates를 주면 그 안에서만 찾습니다.
+        """
+        words = query.casefold().split()
+        rows = self.iter_rows() if candidates is None else candidates
+        if not words:
+            return list(rows)
+        first = words[0]
+        ranked = []
+        for row in rows:
+            hay = row["hay"]
+            if not all(word in hay for word in words):
+                continue
+            name = row["name"]
+            if name.startswith(first):
+                rank = 0
+            elif f" {first}" in name:
+                rank = 1
+            elif first in name:
+                rank = 2
+            else:
+                rank = 3
+            ranked.append((rank, len(name), row["index"], row))
+        ranked.sort(key=lambda item: item[:3])
+        return [row for _, _, _, row in ranked]
+
+class PresetPalette(tk.Toplevel):
+    """
+    검색으로 프리셋을 골라 적용하는 팝업. 결과가 수천 줄이어도 보이는 줄만 Listbox에 넣고
+    스크롤 위치는 직접 관리합니다. 검색어가 이전 검색어에 글자를 덧붙인 것이면 이전 결과 안에서만 찾습니다.
+    """
+
+    def __init__(self, master, on_apply):
+        super().__init__(master)
+        self.on_apply = on_apply  # (preset_index, kind) -> None
+        self.index = PresetSearchIndex()
+        self.results = []
+        self.top = 0
+        self.selected = 0
+        self.last_show_ms = None
+        self._last_query = None
+        self._last_version = None
+
+        self.withdraw()
+        self.title("프리셋 팔레트")
+        self.transient(master)
+        self.configure(bg="#F7F9FC")
+
+        frame = ttk.Frame(self, style="Light.TFrame", padding=(10, 10))
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.query_var = tk.StringVar()
+        self.entry = ttk.Entry(frame, textvariable=self.query_var, width=64, font=("Segoe UI", 11))
+        self.entry.pack(fill=tk.X)
+        body = ttk.Frame(frame, style="Light.TFrame")
+        body.pack(fill=tk.BOTH, expand=True, pady=(8, 0))
+        self.listbox = tk.Listbox(body, height=PRESET_PALETTE_ROWS, activestyle="none", borderwidth=0,
+                                  highlightthickness=0, font=("Segoe UI", 10), selectbackground="#E6EFFB",
+                                  selectforeground="#1B2430", exportselection=False)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.footer = ttk.Label(frame, text="", style="Light.TLabel", foreground="#6B7280")
+        self.footer.pack(fill=tk.X, pady=(6, 0))
+
+        self.query_var.trace_add("write", lambda *args: self._search())
+        self.entry.bind("<Down>", lambda e: self._move_selection(1))
+        self.entry.bind("<Up>", lambda e: self._move_selection(-1))
+        self.entry.bind("<Next>", lambda e: self._move_selection(PRESET_PALETTE_ROWS))
+        self.entry.bind("<Prior>", lambda e: self._move_selection(-PRESET_PALETTE_ROWS))
+        self.entry.bind("<Return>", lambda e: self.apply_selected())
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<Double-1>", lambda e: self.apply_selected())
+        self.listbox.bind("<MouseWheel>", lambda e: self._scroll_to(self.top - (3 if e.delta > 0 else -3)))
+        self.bind("<Escape>", lambda e: self.hide())
+        self.protocol("WM_DELETE_WINDOW", self.hide)
+
+    # ----- 색인 갱신 -----
+    def reset(self, presets):
+        self.index.reset(presets)
+        self._refresh_if_visible()
+
+    def preset_changed(self, preset_index, preset):
+        """프리셋 하나를 추가하거나 덮어쓴 뒤 호출합니다."""
+        self.index.update(preset_index, preset)
+        self._refresh_if_visible()
+
+    def _refresh_if_visible(self):
+        if self.winfo_viewable():
+            self._search(force=True)
+
+    # ----- 표시 -----
+    def show(self):
+        started = time.perf_counter()
+        self._last_query = None
+        if self.query_var.get():
+            self.query_var.set("")  # trace가 검색을 다시 함
+        else:
+            self._search(force=True)
+        master = self.master
+        self.update_idletasks()
+        x = master.winfo_rootx() + max(0, (master.winfo_width() - self.winfo_reqwidth()) // 2)
+        y = master.winfo_rooty() + 60
+        self.geometry(f"+{x}+{y}")
+        self.deiconify()
+        self.lift()
+        self.entry.focus_force()
+        self.update_idletasks()
+        self.last_show_ms = (time.perf_counter() - started) * 1000
+        self._update_footer()
+
+    def hide(self):
+        self.withdraw()
+
+    def _search(self, force=False):
+        query = self.query_var.get()
+        candidates = None
+        if (not force and self._last_query and self._last_version == self.index.version
+                and query.casefold().startswith(self._last_query.casefold())):
+            candidates = self.results
+        self.results = self.index.search(query, candidates)
+        self._last_query = query
+        self._last_version = self.index.version
+        self.top = 0
+        self.selected = 0
+        self._render_rows()
+        self._update_footer()
+
+    def _render_rows(self):
+        visible = self.results[self.top:self.top + PRESET_PALETTE_ROWS]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *(row["label"] for row in visible))
+        elif not self.results:
+            self.listbox.insert(tk.END, "맞는 프리셋이 없습니다." if len(self.index) else "저장된 프리셋이 없습니다.")
+        if self.top <= self.selected < self.top + len(visible):
+            self.listbox.selection_set(self.selected - self.top)
+        total = len(self.results)
+        if total > PRESET_PALETTE_ROWS:
+            self.scrollbar.set(self.top / total, (self.top + PRESET_PALETTE_ROWS) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _update_footer(self):
+        shown = f" · 표시 {self.last_show_ms:.1f} ms" if self.last_show_ms is not None else ""
+        self.footer.config(text=f"{len(self.results)}/{len(self.index)}개 · Enter 적용 · Esc 닫기{shown}")
+
+    # ----- 스크롤 / 선택 -----
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self.results) - PRESET_PALETTE_ROWS))
+        if top != self.top:
+            self.top = top
+            self._render_rows()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.results)))
+        elif action == "scroll":
+            step = PRESET_PALETTE_ROWS if unit == "pages" else 1
+            self._scroll_to(self.top + int(amount) * step)
+
+    def _move_selection(self, step):
+        if not self.results:
+            return "break"
+        self.selected = max(0, min(self.selected + step, len(self.results) - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + PRESET_PALETTE_ROWS:
+            self.top = self.selected - PRESET_PALETTE_ROWS + 1
+        self._render_rows()
+        return "break"
+
+    def _on_listbox_select(self, event):
+        current = self.listbox.curselection()
+        if current and self.top + current[0] < len(self.results):
+            self.selected = self.top + current[0]
+
+    def apply_selected(self):
+        if not (0 <= self.selected < len(self.results)):
+            return
+        row = self.results[self.selected]
+        self.hide()
+        self.on_apply(row["index"], row["kind"])
+
+# ========= 동작별 프로파일러 =========
+PROFILE_SLOW_MS = 200  # 이보다 오래 걸린 동작만 기록
+PROFILE_CAPTURE_LIMIT = 20  # 느린 동작 기록은 최근 것만 이만큼 보관
+PROFILE_SAMPLE_INTERVAL = 0.002  # 초. 스택 샘플링 간격
+PROFILE_EXPORT_DIR = Path(__file__).with_name("goto_center_profiles")
+
+class StackSampler:
+    """
+    다른 스레드에서 sys._current_frames()로 대상 스레드의 스택을 주기적으로 찍어
+    flamegraph용 접힌 스택("바깥;...;안쪽" -> 횟수)으로 셉니다. 대상 코드는 손대지 않으므로 부담이 작습니다.
+    샘플링 스레드는 처음 arm()할 때 하나만 만들고, 동작마다 arm()/disarm()으로 켰다 끕니다.
+    꺼져 있는 동안은 신호만 기다리므로 CPU를 쓰지 않습니다.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._target = None  # 샘플링할 스레드 id (꺼져 있으면 None)
+        self._armed = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def arm(self, thread_id):
+        with self._lock:
+            self._target = thread_id
+            self.stacks = collections.Counter()
+        self._armed.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="goto_center-stack-sampler", daemon=True)
+            self._thread.start()
+
+    def disarm(self):
+        """샘플링을 멈추고 arm() 이후 모은 스택을 반환합니다."""
+        self._armed.clear()
+        with self._lock:
+            stacks, self.stacks = self.stacks, collections.Counter()
+            self._target = None
+        return stacks
+
+    def _run(self):
+        while True:
+            self._armed.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                if self._target is None:
+                    continue
+                frame = sys._current_frames().get(self._target)
+                if frame is not None:
+                    self.stacks[_collapse_stack(frame)] += 1
+
+def _collapse_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+class ActionProfiler:
+    """
+    사용자 동작 하나를 감싸 측정하고, threshold_ms보다 느린 동작만 고정 크기 링 버퍼에 남깁니다.
+    mode="sampling"은 스택 샘플링만(부담이 작음), mode="cprofile"은 cProfile도 같이 돌려 pstats를 남깁니다.
+    동작 안에서 다른 동작을 부르면 바깥 동작 하나로만 측정합니다.
+    """
+
+    def __init__(self, threshold_ms=PROFILE_SLOW_MS, limit=PROFILE_CAPTURE_LIMIT, mode="sampling"):
+        self.enabled = False
+        self.threshold_ms = threshold_ms
+        self.mode = mode
+        self.captures = collections.deque(maxlen=limit)
+        self.measured = 0
+        self._depth = 0
+        self._sampler = StackSampler()
+
+    def run(self, name, func, *args, **kwargs):
+        if not self.enabled or self._depth:
+            return func(*args, **kwargs)
+        profile = cProfile.Profile() if self.mode == "cprofile" else None
+        self._depth += 1
+        self._sampler.arm(threading.get_ident())
+        started = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stacks = self._sampler.disarm()
+            self._depth -= 1
+            self.measured += 1
+            if elapsed_ms >= self.threshold_ms:
+                self.captures.append({
+                    "name": name,
+                    "elapsed_ms": round(elapsed_ms, 1),
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "profile": profile,
+                    "stacks": stacks,
+                })
+
+    def export(self, directory=PROFILE_EXPORT_DIR):
+        """
+        보관 중인 기록을 파일로 씁니다. 기록마다 접힌 스택(.collapsed.txt, flamegraph.pl/speedscope 입력)과
+        cProfile 모드였다면 pstats(.pstats)를 만들고, 전체 목록은 index.json에 남깁니다. 반환: 만든 파일 경로 목록
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        index = []
+        for number, capture in enumerate(self.captures, start=1):
+            stem = f"{number:02d}_{re.sub(r'[^0-9A-Za-z_]+', '_', capture['name'])}_{capture['elapsed_ms']:.0f}ms"
+            entry = {key: capture[key] for key in ("name", "elapsed_ms", "at")}
+            collapsed_path = directory / f"{stem}.collapsed.txt"
+            with collapsed_path.open("w", encoding="utf-8") as f:
+                for stack, count in capture["stacks"].most_common():
+                    f.write(f"{stack} {count}\n")
+            written.append(collapsed_path)
+            entry["collapsed"] = collapsed_path.name
+            if capture["profile"] is not None:
+                pstats_path = directory / f"{stem}.pstats"
+                pstats.Stats(capture["profile"]).dump_stats(str(pstats_path))
+                written.append(pstats_path)
+                entry["pstats"] = pstats_path.name
+            index.append(entry)
+        index_path = directory / "index.json"
+        with index_path.open("w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        written.append(index_path)
+        return written
+
+def profiled(name=None):
+    """App 메서드를 사용자 동작으로 표시합니다. 프로파일링이 꺼져 있으면 그대로 호출합니다."""
+    def decorate(func):
+        action_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None)
+            if profiler is None:
+                return func(self, *args, **kwargs)
+            return profiler.run(action_name, func, self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+# ========= 창 목록 행 만들기 =========
+def collect_tree_rows(options, classifier, trace_rows=None, enumerated=None):
+    """
+    창을 열거하고 필터·정렬까지 마친 창 목록 행을 만듭니다. Tk를 건드리지 않으므로 백그라운드 스레드나 기록 재생에서도 부를 수 있습니다.
+    options: App._tree_options()가 만드는 값
+    trace_rows: 리스트를 주면 같은 열거 결과로 만든 트레이스 창 행(걸러진 창 포함)을 여기에 채웁니다. (--record)
+    enumerated: 리스트를 주면 걸러지기 전의 열거 결과를 (창, 분류)로 채웁니다. 창 모델 등을 다시 열거하지 않고 만들 때 씁니다.
+    반환: (rows, 선택자 오류 메시지 또는 None)
+    """
+    hidden_states = options["hidden_states"]
+    hidden_only = options["hidden_only"]
+    show_resources = options["show_resources"]
+    process_stats = options["process_stats"]
+    window_states = {}
+
+    keep_all = trace_rows is not None or enumerated is not None
+
+    def keep(hwnd):
+        state = window_states[hwnd] = classifier.classify(hwnd)
+        return keep_all or state not in hidden_states
+
+    windows = list_windows(keep)
+    context = SelectorContext()
+    if enumerated is not None:
+        enumerated.extend((w, window_states[w._hWnd]) for w in windows)
+    if trace_rows is not None:
+        for w in windows:
+            if w._hWnd == options["own_hwnd"]:
+                continue
+            try:
+                row = capture_window_row(w._hWnd, state=window_states[w._hWnd], title=w.title,
+                                         process_names=context.process_names)
+            except Exception:
+                continue
+            if row is not None:
+                trace_rows.append(row)
+    if keep_all:
+        windows = [w for w in windows if window_states[w._hWnd] not in hidden_states]
+    # 우리 창은 목록을 보는 동안 항상 위에 있으므로 가림 계산에서 제외합니다.
+    # 클로킹된 창은 화면에 그려지지 않으므로 다른 창을 가리지도 않습니다.
+    visibility = compute_window_visibility(
+        [w._hWnd for w in windows if window_states.get(w._hWnd) == WINDOW_ON_DESKTOP],
+        exclude=(options["own_hwnd"],),
+        cache=options.get("visibility_cache"),
+    )
+    selector, selector_error = compile_search_selector(options["query"])
+    context.visibility = visibility
+
+    rows = []
+    for w in windows:
+        hwnd = w._hWnd
+        title = w.title
+        facts = WindowFacts(hwnd, title, context)
+        if not selector.matches(facts):
+            continue
+        class_name = facts.get("class") or ""
+        proc_name = facts.get("proc") or ""
+
+        visible_fraction = visibility.get(hwnd)
+        if hidden_only and (visible_fraction is None or visible_fraction > OCCLUSION_HIDDEN_THRESHOLD):
+            continue
+
+        row = {
+            "hwnd": hwnd,
+            "title": title,
+            "proc": proc_name,
+            "cls": class_name,
+            "vis": visible_fraction,
+            "pid": None,
+            "cpu": None,
+            "mem": None,
+            "exe": None,
+        }
+        if show_resources:
+            pid = facts.get("pid")
+            stats = process_stats.get(pid) or {}
+            row.update(pid=pid, cpu=stats.get("cpu"), mem=stats.get("mem"), exe=stats.get("exe"))
+        rows.append(row)
+
+    sort_tree_rows(rows, *options.get("sort", (None, False)))
+    return rows, selector_error
+
+def sort_tree_rows(rows, column, reverse=False):
+    """창 목록 행을 열 기준으로 정렬합니다. column이 None이면 Z 순서(맨 위 창이 먼저)를 그대로 둡니다."""
+    if column is None:
+        return
+    present = [row for row in rows if row.get(column) is not None]
+    missing = [row for row in rows if row.get(column) is None]
+    if column in ("title", "proc", "cls", "exe"):
+        present.sort(key=lambda row: str(row[column]).casefold(), reverse=reverse)
+    else:
+        present.sort(key=lambda row: row[column], reverse=reverse)
+    rows[:] = present + missing  # 값이 없는 행은 항상 마지막
+
+# ========= 데스크톱 기록/재생 =========
+TRACE_VERSION = 1
+# 트레이스 창 행의 플래그
+TRACE_MINIMIZED = 0x01
+TRACE_MAXIMIZED = 0x02
+TRACE_TOPMOST = 0x04
+TRACE_CLOAKED = 0x08
+TRACE_OTHER_DESKTOP = 0x10
+
+def capture_window_row(hwnd, classifier=None, title=None, process_names=None, state=None):
+    """
+    트레이스에 남길 창 하나: [hwnd, 제목, 클래스, pid, 프로세스, left, top, right, bottom, 플래그]
+    보이지 않거나 제목이 없는 창이면 None.
+    """
+    if not win32gui.IsWindowVisible(hwnd):
+        return None
+    if title is None:
+        title = win32gui.GetWindowText(hwnd)
+    if not title:
+        return None
+    pid = win32process.GetWindowThreadProcessId(hwnd)[1]
+    if process_names is None:
+        proc_name = get_window_process_name(hwnd)
+    else:
+        if pid not in process_names:
+            process_names[pid] = get_window_process_name(hwnd)
+        proc_name = process_names[pid]
+    flags = 0
+    if win32gui.IsIconic(hwnd):
+        flags |= TRACE_MINIMIZED
+    elif win32gui.IsZoomed(hwnd):
+        flags |= TRACE_MAXIMIZED
+    if win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOPMOST:
+        flags |= TRACE_TOPMOST
+    if state is None:
+        state = classifier.classify(hwnd) if classifier is not None else WINDOW_ON_DESKTOP
+    if state == WINDOW_CLOAKED:
+        flags |= TRACE_CLOAKED
+    elif state == WINDOW_OTHER_DESKTOP:
+        flags |= TRACE_CLOAKED | TRACE_OTHER_DESKTOP
+    return [hwnd, title, win32gui.GetClassName(hwnd), pid, proc_name, *get_extended_frame_bounds(hwnd), flags]
+
+class DesktopTraceRecorder:
+    """
+    실제 세션의 창 열거 결과, WinEvent, 사용자 동작을 시간과 함께 gzip으로 압축한 JSON Lines 파일에 기록합니다.
+    한 줄은 [경과 ms, 종류, 내용]이고, 열거 결과는 지난번과 달라진 창만 남겨 파일을 작게 유지합니다.
+      hdr  {"version", "at", "monitors": [[모니터 l, t, r, b, 작업 영역 l, t, r, b, 주 모니터], ...]}
+      enum {"set": [창 행, ...], "del": [hwnd, ...], "z": [hwnd, ...], "q": 검색어, "o": [가린 창만, 클로킹 숨김, 이 데스크톱만]}
+      ev   [이벤트 이름, hwnd, 창 행 또는 null]
+      act  {"a": 동작 이름, ...}  예: {"a": "move", "label": ..., "m": [[hwnd, l, t, r, b], ...]}
+    Tk 스레드에서만 부릅니다.
+    """
+
+    def __init__(self, path, monitors=()):
+        self.path = Path(path)
+        self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        self._start = time.perf_counter()
+        self._rows = {}  # hwnd -> 마지막으로 기록한 창 행
+        self._order = []
+        self.lines = 0
+        self._write("hdr", {
+            "version": TRACE_VERSION,
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "monitors": [[*m["monitor"], *m["work"], int(m["primary"])] for m in monitors],
+        })
+
+    def _write(self, kind, payload):
+        if self._file is None:
+            return
+        elapsed_ms = round((time.perf_counter() - self._start) * 1000)
+        self._file.write(json.dumps([elapsed_ms, kind, payload], ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.lines += 1
+
+    def enumeration(self, rows, query="", filters=(False, False, False)):
+        current = {row[0]: row for row in rows}
+        order = [row[0] for row in rows]
+        payload = {}
+        changed = [row for row in rows if self._rows.get(row[0]) != row]
+        removed = [hwnd for hwnd in self._rows if hwnd not in current]
+        if changed:
+            payload["set"] = changed
+        if removed:
+            payload["del"] = removed
+        if order != self._order:
+            payload["z"] = order
+        if query:
+            payload["q"] = query
+        if any(filters):
+            payload["o"] = [int(flag) for flag in filters]
+        self._rows, self._order = current, order
+        self._write("enum", payload)
+
+    def event(self, name, hwnd, row=None):
+        if row is not None:
+            self._rows[hwnd] = row
+        elif name in ("destroy", "hide"):
+            self._rows.pop(hwnd, None)
+        self._write("ev", [name, hwnd, row])
+
+    def action(self, name, **fields):
+        self._write("act", dict(fields, a=name))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def read_trace(path):
+    """트레이스 파일의 항목을 차례로 돌려줍니다: (경과 ms, 종류, 내용)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield tuple(json.loads(line))
+
+class SimulatedDesktop:
+    """
+    트레이스로 재현하는 가짜 바탕 화면.
+    pywin32/pygetwindow/psutil 함수 중 목록 새로고침, 검색, 창 이동 경로가 쓰는 것만 같은 이름으로 제공하고,
+    install() 하는 동안 이 모듈의 win32gui 등을 이것으로 바꿔 끼웁니다.
+    실제 창은 건드리지 않으므로 Windows가 아닌 곳에서도 앱과 같은 코드 경로의 지연 시간을 잴 수 있습니다.
+    """
+
+    # 실제 win32con과 같은 값 (Windows가 아닌 곳에서만 씀)
+    WIN32CON = types.SimpleNamespace(
+        SW_MAXIMIZE=3, SW_SHOWMAXIMIZED=3, SW_MINIMIZE=6, SW_SHOWMINNOACTIVE=7, SW_RESTORE=9,
+        SWP_NOSIZE=0x0001, SWP_NOMOVE=0x0002, SWP_NOZORDER=0x0004, SWP_NOACTIVATE=0x0010,
+        HWND_TOP=0, GWL_EXSTYLE=-20, WS_EX_TOPMOST=0x0008, WS_EX_TOOLWINDOW=0x0080,
+        WM_ENTERSIZEMOVE=0x0231, WM_EXITSIZEMOVE=0x0232,
+    )
+    SW_MINIMIZED = {6, 7, 2, 11}  # SW_MINIMIZE, SW_SHOWMINNOACTIVE, SW_SHOWMINIMIZED, SW_FORCEMINIMIZE
+    SW_MAXIMIZED = {3}
+
+    def __init__(self, monitors=()):
+        # [(핸들, 모니터 사각형, 작업 영역, 주 모니터)]
+        self.monitors = [
+            (index, tuple(m[0:4]), tuple(m[4:8]), bool(m[8])) for index, m in enumerate(monitors, start=1)
+        ] or [(1, (0, 0, 1920, 1080), (0, 0, 1920, 1040), True)]
+        self.windows = {}  # hwnd -> [hwnd, 제목, 클래스, pid, 프로세스, l, t, r, b, 플래그] (트레이스 행과 같은 모양)
+        self.process_names = {}  # pid -> 프로세스 이름
+        self.z_order = []  # 맨 위 창이 먼저
+        self.foreground = 0
+        self.max_windows = 0
+
+    # ----- 트레이스 반영 -----
+    def apply_enumeration(self, payload):
+        for row in payload.get("set", ()):
+            self.windows[row[0]] = list(row)
+            self.process_names[row[3]] = row[4]
+        for hwnd in payload.get("del", ()):
+            self.windows.pop(hwnd, None)
+        if "z" in payload:
+            self.z_order = [hwnd for hwnd in payload["z"] if hwnd in self.windows]
+        else:
+            self.z_order = [hwnd for hwnd in self.z_order if hwnd in self.windows]
+        self._add_missing_to_z_order()
+
+    def apply_event(self, name, hwnd, row):
+        if name in ("destroy", "hide") or (row is None and name not in ("movesizestart", "movesizeend")):
+            self.windows.pop(hwnd, None)
+        elif row is not None:
+            self.windows[hwnd] = list(row)
+            self.process_names[row[3]] = row[4]
+            if name in ("foreground", "show", "create"):
+                self._raise(hwnd)
+            if name == "foreground":
+                self.foreground = hwnd
+        self.z_order = [h for h in self.z_order if h in self.windows]
+        self._add_missing_to_z_order()
+
+    def _add_missing_to_z_order(self):
+        known = set(self.z_order)
+        for hwnd in self.windows:
+            if hwnd not in known:
+                self.z_order.insert(0, hwnd)
+        self.max_windows = max(self.max_windows, len(self.windows))
+
+    def _raise(self, hwnd):
+        if hwnd in self.z_order:
+            self.z_order.remove(hwnd)
+        self.z_order.insert(0, hwnd)
+
+    def _window(self, hwnd):
+        try:
+            return self.windows[hwnd]
+        except KeyError:
+            raise OSError(f"창이 없습니다: {hwnd}") from None
+
+    def _set_flag(self, hwnd, flag, on):
+        row = self._window(hwnd)
+        row[9] = row[9] | flag if on else row[9] & ~flag
+
+    # ----- win32gui -----
+    def IsWindow(self, hwnd):
+        return hwnd in self.windows
+
+    def IsWindowVisible(self, hwnd):
+        return hwnd in self.windows
+
+    def GetWindowText(self, hwnd):
+        return self.windows[hwnd][1] if hwnd in self.windows else ""
+
+    def GetClassName(self, hwnd):
+        return self._window(hwnd)[2]
+
+    def GetWindowRect(self, hwnd):
+        return tuple(self._window(hwnd)[5:9])
+
+    def IsIconic(self, hwnd):
+        return bool(self._window(hwnd)[9] & TRACE_MINIMIZED)
+
+    def IsZoomed(self, hwnd):
+        return bool(self._window(hwnd)[9] & TRACE_MAXIMIZED)
+
+    def GetWindowLong(self, hwnd, index):
+        return self.WIN32CON.WS_EX_TOPMOST if self._window(hwnd)[9] & TRACE_TOPMOST else 0
+
+    def ShowWindow(self, hwnd, show_cmd):
+        self._set_flag(hwnd, TRACE_MINIMIZED, show_cmd in self.SW_MINIMIZED)
+        self._set_flag(hwnd, TRACE_MAXIMIZED, show_cmd in self.SW_MAXIMIZED)
+        return True
+
+    def SetWindowPos(self, hwnd, insert_after, x, y, cx, cy, flags):
+        row = self._window(hwnd)
+        l, t, r, b = row[5:9]
+        if not flags & self.WIN32CON.SWP_NOMOVE:
+            l, t, r, b = x, y, x + (r - l), y + (b - t)
+        if not flags & self.WIN32CON.SWP_NOSIZE:
+            r, b = l + cx, t + cy
+        row[5:9] = [l, t, r, b]
+        if not flags & self.WIN32CON.SWP_NOZORDER:
+            self._raise(hwnd)
+
+    def BeginDeferWindowPos(self, count):
+        return []
+
+    def DeferWindowPos(self, hdwp, hwnd, insert_after, x, y, cx, cy, flags):
+        hdwp.append((hwnd, insert_after, x, y, cx, cy, flags))
+        return hdwp
+
+    def EndDeferWindowPos(self, hdwp):
+        for args in hdwp:
+            self.SetWindowPos(*args)
+
+    def GetWindowPlacement(self, hwnd):
+        flags = self._window(hwnd)[9]
+        show_cmd = 2 if flags & TRACE_MINIMIZED else 3 if flags & TRACE_MAXIMIZED else 1
+        return (0, show_cmd, (-1, -1), (-1, -1), self.GetWindowRect(hwnd))
+
+    def SetWindowPlacement(self, hwnd, placement):
+        self._window(hwnd)[5:9] = list(placement[4])
+        self.ShowWindow(hwnd, placement[1])
+
+    def EnumWindows(self, callback, extra):
+        for hwnd in list(self.z_order):
+            if not callback(hwnd, extra):
+                break
+
+    def GetForegroundWindow(self):
+        return self.foreground
+
+    def SetForegroundWindow(self, hwnd):
+        self.foreground = hwnd
+        self._raise(hwnd)
+
+    def PostMessage(self, hwnd, message, wparam, lparam):
+        return True
+
+    # ----- win32process / win32api -----
+    def GetWindowThreadProcessId(self, hwnd):
+        return (0, self._window(hwnd)[3])
+
+    def EnumDisplayMonitors(self, hdc=None, rect=None):
+        return [(handle, None, monitor) for handle, monitor, _, _ in self.monitors]
+
+    def GetMonitorInfo(self, handle):
+        for h, monitor, work, primary in self.monitors:
+            if h == handle:
+                return {"Monitor": monitor, "Work": work, "Flags": 1 if primary else 0}
+        raise OSError(f"모니터가 없습니다: {handle}")
+
+    def MonitorFromWindow(self, hwnd, flags=0):
+        rect = self.GetWindowRect(hwnd)
+        best = max(self.monitors, key=lambda m: (_rect_intersection_area(rect, m[1]), m[3]))
+        return best[0]
+
+    # ----- pygetwindow / psutil -----
+    def getAllWindows(self):
+        return [types.SimpleNamespace(title=self.windows[hwnd][1], _hWnd=hwnd) for hwnd in self.z_order]
+
+    def Process(self, pid):
+        if pid not in self.process_names:
+            raise OSError(f"프로세스가 없습니다: {pid}")
+        name = self.process_names[pid]
+        return types.SimpleNamespace(name=lambda: name, exe=lambda: name)
+
+    # ----- DWM / 가상 데스크톱 -----
+    def get_extended_frame_bounds(self, hwnd):
+        return self.GetWindowRect(hwnd)
+
+    def get_window_cloaked(self, hwnd):
+        flags = self.windows[hwnd][9] if hwnd in self.windows else 0
+        if not flags & TRACE_CLOAKED:
+            return 0
+        return 2 if flags & TRACE_OTHER_DESKTOP else 1  # 셸 / 앱
+
+    def is_on_current_desktop(self, hwnd):
+        return not (hwnd in self.windows and self.windows[hwnd][9] & TRACE_OTHER_DESKTOP)
+
+    @contextlib.contextmanager
+    def install(self):
+        """이 모듈이 부르는 Windows API를 잠시 이 가짜 바탕 화면으로 바꿉니다."""
+        module = globals()
+        replaced = {
+            "win32gui": self, "win32process": self, "win32api": self, "gw": self, "psutil": self,
+            "get_extended_frame_bounds": self.get_extended_frame_bounds,
+            "get_window_cloaked": self.get_window_cloaked,
+        }
+        if module["win32con"] is None:
+            replaced["win32con"] = self.WIN32CON
+        saved = {name: module[name] for name in replaced}
+        module.update(replaced)
+        try:
+            yield self
+        finally:
+            module.update(saved)
+
+def _latency_summary(samples_ms):
+    values = sorted(samples_ms)
+    count = len(values)
+    return {
+        "count": count,
+        "p50_ms": round(values[count // 2], 3),
+        "p95_ms": round(values[min(count - 1, int(count * 0.95))], 3),
+        "max_ms": round(values[-1], 3),
+        "total_ms": round(sum(values), 1),
+    }
+
+def replay_trace(path, speed=1.0, observer=None):
+    """
+    기록한 트레이스를 SimulatedDesktop에 다시 흘려 보내면서 목록 새로고침·검색·창 이동·이벤트 처리 지연 시간을 잽니다.
+    speed: 1이면 기록한 속도 그대로, 10이면 10배 빠르게, 0이면 기다리지 않고 바로 다음 항목을 처리합니다.
+    observer: 항목마다 observer(종류, 내용, 가짜 바탕 화면, 목록 행)를 부릅니다. 목록 행은 enum 항목에서만 있고 나머지는 None입니다.
+    반환: 항목별 지연 시간 요약 (--benchmark와 같은 형식으로 출력)
+    """
+    records = read_trace(path)
+    header = next(records, None)
+    if header is None or header[1] != "hdr":
+        raise ValueError(f"{path}: 트레이스 머리글이 없습니다.")
+    if header[2].get("version") != TRACE_VERSION:
+        raise ValueError(f"{path}: 지원하지 않는 트레이스 버전입니다: {header[2].get('version')}")
+
+    desktop = SimulatedDesktop(header[2].get("monitors") or ())
+    classifier = WindowClassifier(desktop_manager=desktop)  # 앱처럼 캐시하고 이벤트로 무효화합니다.
+    model = WindowModel()
+    journal = GeometryJournal()
+    visibility_cache = VisibilityCache()
+    samples = collections.defaultdict(list)
+    count = 0
+    started = time.perf_counter()
+    with desktop.install():
+        for elapsed_ms, kind, payload in records:
+            count += 1
+            rows = None
+            if speed > 0:
+                delay = started + elapsed_ms / 1000 / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if kind == "enum":
+                desktop.apply_enumeration(payload)
+                for row in payload.get("set", ()):
+                    classifier.invalidate(row[0])
+                hidden_only, hide_cloaked, this_desktop = (bool(flag) for flag in payload.get("o", (0, 0, 0)))
+                hidden_states = set()
+                if hide_cloaked:
+                    hidden_states.add(WINDOW_CLOAKED)
+                if this_desktop:
+                    hidden_states.add(WINDOW_OTHER_DESKTOP)
+                query = payload.get("q", "")
+                options = {
+                    "query": query, "hidden_only": hidden_only, "show_resources": False, "process_stats": {},
+                    "hidden_states": hidden_states, "own_hwnd": None, "sort": (None, False),
+                    "visibility_cache": visibility_cache,
+                }
+                t0 = time.perf_counter()
+                rows, _error = collect_tree_rows(options, classifier)
+                samples["search" if query else "refresh"].append((time.perf_counter() - t0) * 1000)
+                if not model.entries:
+                    model.reset(list_windows())
+            elif kind == "ev":
+                name, hwnd, row = payload
+                desktop.apply_event(name, hwnd, row)
+                t0 = time.perf_counter()
+                if name in ("cloaked", "uncloaked", "destroy"):
+                    classifier.invalidate(hwnd)
+                model.apply_event(name, hwnd)
+                samples["event"].append((time.perf_counter() - t0) * 1000)
+            elif kind == "act" and payload.get("a") == "move":
+                moves = [(m[0], tuple(m[1:5])) for m in payload.get("m", ()) if m[0] in desktop.windows]
+                if moves:
+                    t0 = time.perf_counter()
+                    journal.record_many([hwnd for hwnd, _ in moves], payload.get("label", ""))
+                    batch_move_windows(moves)
+                    samples["move"].append((time.perf_counter() - t0) * 1000)
+            if observer is not None:
+                observer(kind, payload, desktop, rows)
+
+    result = {
+        "trace": str(path),
+        "records": count,
+        "max_windows": desktop.max_windows,
+        "speed": speed,
+        "wall_s": round(time.perf_counter() - started, 3),
+    }
+    for name in ("refresh", "search", "move", "event"):
+        if samples[name]:
+            result[name] = _latency_summary(samples[name])
+    return result
+
+# ========= 시작 시간 측정 =========
+STARTUP_METRICS_FILE = Path(__file__).with_name("goto_center_startup_metrics.json")
+STARTUP_METRICS_LIMIT = 50  # 최근 실행 기록만 보관
+STARTUP_ROW_CHUNK = 40  # 시작할 때 한 번에 넣을 행 수. 사이사이에 입력을 처리합니다.
+STARTUP_ICON_CHUNK = 16
+
+def launch_elapsed_ms():
+    """프로세스가 만들어진 뒤 지금까지 걸린 시간 (인터프리터 시작과 import 포함)."""
+    try:
+        return (time.time() - psutil.Process().create_time()) * 1000
+    except Exception:
+        return (time.perf_counter() - _PROCESS_START) * 1000
+
+def record_startup_metrics(metrics, path=STARTUP_METRICS_FILE, limit=STARTUP_METRICS_LIMIT):
+    """이번 실행의 시작 지표를 기록에 더하고, 최근 실행들의 검색 가능 시간 중앙값을 반환합니다."""
+    data = _load_json_file(path)
+    runs = data.get("runs") if isinstance(data, dict) else None
+    runs = [run for run in runs if isinstance(run, dict)] if isinstance(runs, list) else []
+    runs.append(metrics)
+    runs = runs[-limit:]
+    try:
+        with path.open("w", encoding="utf-8") as f:
+            json.dump({"runs": runs}, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+    values = sorted(run["interactive_ms"] for run in runs if isinstance(run.get("interactive_ms"), (int, float)))
+    return values[len(values) // 2] if values else None
+
 # ========= 메인 앱 =========
 def _read_int_pair(value):
     if not isinstance(value, (list, tuple)) or len(value) != 2:
@@ -350,6 +4068,11 @@ def _read_int_pair(value):
     except (TypeError, ValueError):
         return None
 
+def _format_visible_fraction(fraction):
+    if fraction is None:
+        return "-"
+    return f"{fraction * 100:.0f}%"
+
 def _shorten_text(text, max_len=48):
     text = str(text or "").strip()
     if len(text) <= max_len:
@@ -357,8 +4080,13 @@ def _shorten_text(text, max_len=48):
     return text[:max_len - 1] + "..."
 
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, instance=None, startup_message=None, preset_store=None, profile_threshold_ms=None,
+                 trace_recorder=None):
         super().__init__()
+        # 시작 직후의 느린 새로고침도 잡을 수 있도록 가장 먼저 만듭니다.
+        self.profiler = ActionProfiler(
+            threshold_ms=PROFILE_SLOW_MS if profile_threshold_ms is None else profile_threshold_ms)
+        self.profiler.enabled = profile_threshold_ms is not None
         self.title("창 중앙 이동기  •  Light ✦ Clean")
         self.geometry("1200x620")          # ✅ 가로 1200
         self.minsize(800, 520)
@@ -366,15 +4094,43 @@ class App(tk.Tk):
         self._build_style_light()
         self.window_presets = []
         self._build_ui()
+        self.preset_palette = PresetPalette(self, on_apply=self._apply_window_preset_value)
 
         self.tk_images = {}  # hwnd -> PhotoImage
+        self.learned_min_sizes = {}  # hwnd -> (최소 너비, 최소 높이), 타일 배치 후 실제 크기로 학습
         self.saved_size = None  # (width, height) - 기억된 창 크기
         self.saved_size_title = None  # 크기를 기억한 창의 제목 (UI 표시용)
+        self.saved_size_app = ""  # 크기를 기억한 창의 실행 파일 이름
         self.saved_position = None  # (x, y) - 기억된 창 위치
         self.saved_position_title = None  # 위치를 기억한 창의 제목 (UI 표시용)
-        self._load_saved_window_state()
-        self._refresh_preset_menu()
-        self.refresh_tree()
+        self.saved_position_app = ""  # 위치를 기억한 창의 실행 파일 이름
+        self.layout_profiles = {}  # 디스플레이 구성 지문 -> 레이아웃 프로필
+        self.snap_zones = []  # [{"name", "monitor", "rect", "updated_at"}, ...]
+        self._snap_index = None  # 영역/모니터가 바뀌면 None으로 두고 필요할 때 다시 만듦
+        self._snap_drag = None
+        self._display_change_job = None
+        self.preset_store = preset_store  # None이면 JSON 파일에 저장
+        self.geometry_memory = GeometryMemory()
+        self.process_sampler = ProcessSampler(on_update=lambda snapshot: self.post_to_ui(self._apply_process_snapshot, snapshot))
+        self._tree_row_pids = {}  # Treeview iid -> pid (자원 사용량 열 갱신용)
+        self.auto_refresh = None
+        self.thumbnail_pool = None  # 미리보기를 처음 켤 때 만듭니다.
+        self.window_classifier = WindowClassifier()
+        self.window_classifier.use_cache = False  # WinEvent 훅이 걸린 것을 확인한 뒤에 켭니다.
+        self._geometry_flush_job = None
+        self.geometry_journal = GeometryJournal()
+        self.geometry_journal.on_commit = self._on_geometry_committed
+        self._pending_locations = set()  # 위치 변경 이벤트가 온 hwnd (모았다가 한 번에 반영)
+        self._location_flush_job = None
+        self.trace_recorder = trace_recorder  # --record로 켠 트레이스 기록 (없으면 None)
+        self._tree_generation = 0  # refresh_tree마다 증가. 오래된 백그라운드 결과를 버리는 데 씁니다.
+        self._visibility_cache = VisibilityCache()  # Tk 스레드의 refresh_tree 전용
+        self._preloaded_json = {}  # 경로 -> 백그라운드에서 미리 읽은 JSON
+        self._startup_message = startup_message
+        self.startup_metrics = {}
+        # 설정 파일 읽기와 첫 창 열거는 창이 그려진 뒤 백그라운드에서 합니다. (_begin_progressive_startup)
+        self.search_entry.focus_set()
+        self.status_label.config(text="창 목록을 불러오는 중...")
 
         # 단축키
         self.bind("<Return>", lambda e: self.center_selected())
@@ -392,11 +4148,193 @@ class App(tk.Tk):
         # 위치 복사 단축키
         self.bind("<Control-Alt-c>", lambda e: self.remember_window_position())
         self.bind("<Control-Alt-v>", lambda e: self.apply_remembered_position())
+        self.bind("<Control-p>", lambda e: self.open_preset_palette())
         # 가장자리 이동 단축키 (한 축만 이동)
         self.bind("<Alt-Up>", lambda e: self.move_selected_to_top())
         self.bind("<Alt-Down>", lambda e: self.move_selected_to_bottom())
         self.bind("<Alt-Left>", lambda e: self.move_selected_to_left())
         self.bind("<Alt-Right>", lambda e: self.move_selected_to_right())
+        # 화면 밖 창 구출
+        self.bind("<Control-Shift-R>", lambda e: self.rescue_offscreen_windows())
+        # 창 위치 되돌리기 / 다시 실행
+        self.bind("<Control-z>", lambda e: self.undo_geometry())
+        self.bind("<Control-y>", lambda e: self.redo_geometry())
+        # 미세 이동/크기 조절 (전역 단축키 등록에 실패했을 때 이 창 안에서만 동작)
+        self.nudger = WindowNudger(self)
+        self.nudger.on_session_start = lambda hwnd: self.geometry_journal.record(hwnd, "미세 이동/크기 조절")
+        for modifiers, vk, delta in NUDGE_HOTKEYS.values():
+            keys = "Control-Alt-" + ("Shift-" if modifiers & MOD_SHIFT else "")
+            key_name = {VK_LEFT: "Left", VK_RIGHT: "Right", VK_UP: "Up", VK_DOWN: "Down"}[vk]
+            self.bind(f"<{keys}{key_name}>", lambda e, d=delta: self.nudge_target_window(*d))
+
+        # 다른 스레드에서 온 작업은 큐에 넣고 Tk 스레드에서 처리합니다.
+        self._ui_queue = queue.Queue()
+        self.bind("<<UiQueue>>", lambda e: self._drain_ui_queue())
+        self._poll_ui_queue()
+
+        # 단일 인스턴스: 나중에 실행된 프로세스가 보낸 인자를 받아 처리
+        self.instance = instance
+        if self.instance is not None:
+            try:
+                self.instance.listen(lambda message: self.post_to_ui(self._handle_instance_message, message))
+            except OSError:
+                self.instance = None
+
+        # 디스플레이 변경 등 시스템 이벤트 수신
+        try:
+            self.display_fingerprint = get_display_fingerprint()[0]
+        except Exception:
+            self.display_fingerprint = None
+        # 빠른 전환기: 미리 만들어 숨겨 두고, 창 모델은 WinEvent로 계속 갱신합니다.
+        self.window_model = WindowModel()  # 첫 열거가 끝나면 채워집니다.
+        self._startup_events = []  # 첫 열거 결과를 넘겨받기 전에 온 WinEvent (event, hwnd)
+        self.quick_switcher = QuickSwitcher(self, self.window_model, exclude_hwnds=lambda: (self._own_hwnd(),))
+        self.bind("<Control-Alt-space>", lambda e: self.quick_switcher.toggle())
+
+        self._hotkey_actions = {
+            hotkey_id: (lambda d=delta: self.nudge_target_window(*d))
+            for hotkey_id, (_, _, delta) in NUDGE_HOTKEYS.items()
+        }
+        self._hotkey_actions[QUICK_SWITCHER_HOTKEY_ID] = self.quick_switcher.toggle
+        self._hotkey_actions[SNAP_HOTKEY_ID] = self.snap_target_window_to_cursor_zone
+        hotkeys = {hotkey_id: (modifiers, vk) for hotkey_id, (modifiers, vk, _) in NUDGE_HOTKEYS.items()}
+        hotkeys[QUICK_SWITCHER_HOTKEY_ID] = QUICK_SWITCHER_HOTKEY
+        hotkeys[SNAP_HOTKEY_ID] = SNAP_HOTKEY
+        self.snap_overlay = SnapOverlay(self)
+        self.event_listener = DesktopEventListener(
+            lambda kind, payload: self.post_to_ui(self._handle_desktop_event, kind, payload),
+            hotkeys=hotkeys,
+        )
+        if not self.event_listener.start():
+            self.event_listener = None
+        if self.event_listener is not None and self.event_listener.has_window_events:
+            self.window_classifier.use_cache = True
+
+        # WinEvent 훅을 못 거는 환경에서는 변경 감지 폴링으로 목록을 최신으로 유지합니다.
+        self.auto_refresh = FingerprintPoller(self, self._auto_refresh_tree,
+                                              interval_ms=self.auto_refresh_interval_var.get(),
+                                              exclude=lambda: (self._own_hwnd(),))
+        if self.event_listener is None or not self.event_listener.has_window_events:
+            self.auto_refresh_var.set(True)
+            self.auto_refresh.start()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # 첫 화면이 그려지고(유휴) 난 다음 타이머에서 나머지 시작 작업을 이어 갑니다.
+        self.after_idle(lambda: self.after(0, self._begin_progressive_startup))
+
+    # ----- 단계적 시작 -----
+    def _begin_progressive_startup(self):
+        """창과 검색창이 그려진 시점. 여기까지를 '검색 가능' 시간으로 기록하고 무거운 작업을 백그라운드로 넘깁니다."""
+        self.startup_metrics = {
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "interactive_ms": round(launch_elapsed_ms(), 1),
+        }
+        store_ready = self.preset_store is not None and self.preset_store.migrated
+        options = dict(self._tree_options(), visibility_cache=None)  # 캐시는 Tk 스레드에서만 씁니다.
+        threading.Thread(
+            target=self._startup_worker, args=(options, self._tree_generation, store_ready),
+            name="goto_center-startup", daemon=True,
+        ).start()
+
+    def _startup_worker(self, options, generation, store_ready):
+        """백그라운드 스레드: 설정 파일을 읽고 창을 열거한 결과를 차례로 Tk 스레드에 넘깁니다."""
+        paths = [LAYOUT_PROFILES_FILE, SNAP_ZONES_FILE, GEOMETRY_MEMORY_FILE]
+        if not store_ready:
+            paths += [SAVED_WINDOW_STATE_FILE, SAVED_WINDOW_PRESETS_FILE]
+        self.post_to_ui(self._apply_loaded_state, {path: _load_json_file(path) for path in paths})
+
+        classifier = WindowClassifier()  # 가상 데스크톱 COM 객체는 만든 스레드에서만 쓰므로 따로 둡니다.
+        classifier.use_cache = False
+        trace_rows = [] if self.trace_recorder is not None else None
+        enumerated = []
+        try:
+            rows, selector_error = collect_tree_rows(options, classifier, trace_rows, enumerated)
+        except Exception as e:
+            rows, selector_error = [], None
+            self.post_to_ui(self._notify, f"창 목록을 불러오지 못했습니다: {e} (F5로 다시 시도)")
+        fingerprint = enumeration_fingerprint(enumerated, exclude=(options["own_hwnd"],))
+        self.post_to_ui(self._stream_startup_rows, rows, selector_error, generation, fingerprint)
+
+        # 빠른 전환기 모델과 앱별 위치 추적도 목록과 같은 열거 결과로 만듭니다.
+        windows = [w for w, _ in enumerated]
+        model = WindowModel()
+        model.reset(windows)
+        tracked = collect_window_geometry(exclude=(options["own_hwnd"],), windows=windows)
+        self.post_to_ui(self._apply_startup_windows, model, tracked, options, trace_rows)
+
+    def _apply_loaded_state(self, data):
+        self._preloaded_json = data
+        try:
+            self._load_saved_window_state()
+            self._load_layout_profiles()
+            self._load_snap_zones()
+            self._load_geometry_memory()
+        finally:
+            self._preloaded_json = {}
+        self._reload_preset_palette()
+        self.startup_metrics["state_ms"] = round(launch_elapsed_ms(), 1)
+        # 프리셋이 준비된 뒤에야 --preset 같은 시작 인자를 처리할 수 있습니다.
+        if self._startup_message:
+            message, self._startup_message = self._startup_message, None
+            self._handle_instance_message(message)
+
+    def _stream_startup_rows(self, rows, selector_error, generation, fingerprint, start=0, iids=None):
+        """첫 목록을 몇십 행씩 나눠 넣습니다. 아이콘은 모든 행이 들어간 뒤에 채웁니다."""
+        if generation != self._tree_generation:
+            self._finish_startup_metrics()  # 그 사이 사용자가 검색하거나 새로고침함
+            return
+        if start == 0:
+            self._clear_tree()
+            iids = []
+        end = min(start + STARTUP_ROW_CHUNK, len(rows))
+        for index in range(start, end):
+            iids.append((self._insert_tree_row(rows[index], index, with_icon=False), rows[index]["hwnd"]))
+        if end < len(rows):
+            self.after(1, self._stream_startup_rows, rows, selector_error, generation, fingerprint, end, iids)
+            return
+        self._finish_tree_refresh(len(rows), selector_error, fingerprint)
+        self.startup_metrics["rows_ms"] = round(launch_elapsed_ms(), 1)
+        self.startup_metrics["rows"] = len(rows)
+        self.after(1, self._fill_startup_icons, iids, generation)
+
+    def _fill_startup_icons(self, iids, generation, start=0):
+        if generation != self._tree_generation:
+            self._finish_startup_metrics()
+            return
+        end = min(start + STARTUP_ICON_CHUNK, len(iids))
+        for iid, hwnd in iids[start:end]:
+            img = self._get_row_icon(hwnd)
+            if img is not None and self.tree.exists(iid):
+                self.tree.item(iid, image=img)
+        if end < len(iids):
+            self.after(1, self._fill_startup_icons, iids, generation, end)
+            return
+        self.startup_metrics["icons_ms"] = round(launch_elapsed_ms(), 1)
+        self._finish_startup_metrics()
+
+    def _apply_startup_windows(self, model, tracked, options, trace_rows):
+        if trace_rows is not None:
+            self._record_enumeration(options, trace_rows)
+        self.window_model.adopt(model)
+        # 앱별 마지막 위치: 이미 열려 있던 창도 닫힐 때 기록되도록 현재 위치를 먼저 알아 둡니다.
+        self._track_open_windows(tracked)
+        # 열거하는 동안 온 이벤트를 넘겨받은 모델에 다시 적용합니다. 이벤트는 창의 지금 상태를 읽으므로 두 번 적용해도 됩니다.
+        events, self._startup_events = self._startup_events, None
+        for event, hwnd in events:
+            self.window_model.apply_event(event, hwnd)
+            if event in ("destroy", "hide") and self.auto_geometry_var.get():
+                self._on_geometry_event(event, hwnd)
+        self.quick_switcher.refresh_if_visible()
+
+    def _finish_startup_metrics(self):
+        metrics = self.startup_metrics
+        median_ms = record_startup_metrics(metrics)
+        text = f"시작: 검색 가능 {metrics['interactive_ms']:.0f} ms"
+        if "rows_ms" in metrics:
+            text += f", 창 목록 {metrics['rows_ms']:.0f} ms"
+        if median_ms is not None:
+            text += f" (최근 중앙값 {median_ms:.0f} ms)"
+        self._notify(f"{self.status_label.cget('text')}  ·  {text}")
 
     # ----- 라이트 테마 -----
     def _build_style_light(self):
@@ -422,6 +4360,8 @@ class App(tk.Tk):
         style.configure("Naked.TFrame", background=bg)
         style.configure("Light.TLabel", background=panel, foreground=txt)
         style.configure("Hint.TLabel", background=bg, foreground=subtxt)
+        style.configure("Light.TCheckbutton", background=panel, foreground=txt)
+        style.map("Light.TCheckbutton", background=[("active", panel)])
 
         style.configure("TButton", padding=6)
         style.map("TButton", background=[("active", "#F1F5F9")])
@@ -467,6 +4407,61 @@ class App(tk.Tk):
         self.btn_refresh = ttk.Button(top, text="새로고침 (F5)", command=self.refresh_tree)
         self.btn_refresh.pack(side=tk.LEFT)
 
+        # 선택한 창과 상관없이 전체 창에 적용하는 도구
+        self.btn_tools = ttk.Menubutton(top, text="도구")
+        self.tools_menu = tk.Menu(self.btn_tools, tearoff=False)
+        self.tools_menu.add_command(label="창 위치 되돌리기 (Ctrl+Z)", command=self.undo_geometry)
+        self.tools_menu.add_command(label="창 위치 다시 실행 (Ctrl+Y)", command=self.redo_geometry)
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(label="화면 밖 창 구출... (Ctrl+Shift+R)", command=self.rescue_offscreen_windows)
+        self.tools_menu.add_separator()
+        self.tools_menu.add_command(label="현재 배치를 이 디스플레이 구성 프로필로 저장", command=self.save_layout_profile)
+        self.tools_menu.add_command(label="이 디스플레이 구성 프로필 복원", command=self.restore_layout_profile)
+        self.auto_restore_layout_var = tk.BooleanVar(value=True)
+        self.tools_menu.add_checkbutton(label="디스플레이 변경 시 프로필 자동 복원", onvalue=True, offvalue=False,
+                                        variable=self.auto_restore_layout_var, command=self._save_layout_profiles)
+        self.tools_menu.add_separator()
+        self.auto_geometry_var = tk.BooleanVar(value=True)
+        self.tools_menu.add_checkbutton(label="앱별 마지막 위치 기억/복원", onvalue=True, offvalue=False,
+                                        variable=self.auto_geometry_var, command=self._on_auto_geometry_toggled)
+        self.tools_menu.add_separator()
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        self.auto_refresh_interval_var = tk.IntVar(value=AUTO_REFRESH_DEFAULT_MS)
+        self.tools_menu.add_checkbutton(label="창 목록 자동 새로고침", onvalue=True, offvalue=False,
+                                        variable=self.auto_refresh_var, command=self._on_auto_refresh_toggled)
+        self.auto_refresh_menu = tk.Menu(self.tools_menu, tearoff=False)
+        for interval_ms in AUTO_REFRESH_INTERVALS_MS:
+            self.auto_refresh_menu.add_radiobutton(label=f"{interval_ms / 1000:g}초", value=interval_ms,
+                                                   variable=self.auto_refresh_interval_var,
+                                                   command=self._on_auto_refresh_interval_changed)
+        self.tools_menu.add_cascade(label="자동 새로고침 간격", menu=self.auto_refresh_menu)
+        self.tools_menu.add_separator()
+        self.profiling_var = tk.BooleanVar(value=self.profiler.enabled)
+        self.profiling_cprofile_var = tk.BooleanVar(value=False)
+        self.tools_menu.add_checkbutton(label="느린 동작 프로파일링", onvalue=True, offvalue=False,
+                                        variable=self.profiling_var, command=self._on_profiling_toggled)
+        self.tools_menu.add_checkbutton(label="프로파일링에 cProfile 사용 (자세히, 느림)", onvalue=True, offvalue=False,
+                                        variable=self.profiling_cprofile_var, command=self._on_profiling_toggled)
+        self.tools_menu.add_command(label="느린 동작 기록 내보내기", command=self.export_profiles)
+        self.btn_tools.configure(menu=self.tools_menu)
+        self.btn_tools.pack(side=tk.LEFT, padx=(6, 0))
+
+        self.hidden_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="가려진 창만", variable=self.hidden_only_var,
+                        style="Light.TCheckbutton", command=self.refresh_tree).pack(side=tk.LEFT, padx=(10, 0))
+        self.this_desktop_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="이 데스크톱만", variable=self.this_desktop_only_var,
+                        style="Light.TCheckbutton", command=self.refresh_tree).pack(side=tk.LEFT, padx=(10, 0))
+        self.hide_cloaked_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(top, text="숨은(cloaked) 창 숨기기", variable=self.hide_cloaked_var,
+                        style="Light.TCheckbutton", command=self.refresh_tree).pack(side=tk.LEFT, padx=(10, 0))
+        self.show_resources_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="자원 사용량", variable=self.show_resources_var,
+                        style="Light.TCheckbutton", command=self._on_show_resources_toggled).pack(side=tk.LEFT, padx=(10, 0))
+        self.show_preview_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text="미리보기", variable=self.show_preview_var,
+                        style="Light.TCheckbutton", command=self._on_show_preview_toggled).pack(side=tk.LEFT, padx=(10, 0))
+
         # 중간: Treeview (아이콘 칼럼 포함)
         mid_wrap = ttk.Frame(self, style="Naked.TFrame", padding=(12, 6, 12, 6))
         mid_wrap.pack(fill=tk.BOTH, expand=True)
@@ -474,26 +4469,52 @@ class App(tk.Tk):
         mid = ttk.Frame(mid_wrap, style="Light.TFrame", padding=(8, 8))
         mid.pack(fill=tk.BOTH, expand=True)
 
-        columns = ("title", "proc", "cls", "hwnd")
+        columns = ("title", "proc", "cls", "hwnd", "vis", "cpu", "mem", "exe")
+        self.base_columns = columns[:5]  # 자원 사용량 열은 켰을 때만 보입니다.
         # show="tree headings" + #0 칼럼을 아이콘 표시용으로 사용
         self.tree = ttk.Treeview(mid, columns=columns, show="tree headings")
         self.tree.heading("#0", text="")
-        self.tree.heading("title", text="창 제목")
-        self.tree.heading("proc", text="프로세스")
-        self.tree.heading("cls", text="클래스")
-        self.tree.heading("hwnd", text="HWND")
+        self.column_headings = {
+            "title": "창 제목",
+            "proc": "프로세스",
+            "cls": "클래스",
+            "hwnd": "HWND",
+            "vis": "보이는 비율",
+            "cpu": "CPU",
+            "mem": "메모리",
+            "exe": "실행 파일 경로",
+        }
+        self.sort_column = None
+        self.sort_reverse = False
+        for column, text in self.column_headings.items():
+            self.tree.heading(column, text=text, command=lambda c=column: self.sort_by_column(c))
 
         self.tree.column("#0", width=40, stretch=False, anchor="center")  # ✅ 아이콘 칼럼 40px
-        self.tree.column("title", width=640, anchor="w")
-        self.tree.column("proc", width=200, anchor="w")
-        self.tree.column("cls", width=200, anchor="w")
-        self.tree.column("hwnd", width=120, anchor="e")
+        self.tree.column("title", width=560, anchor="w")
+        self.tree.column("proc", width=180, anchor="w")
+        self.tree.column("cls", width=180, anchor="w")
+        self.tree.column("hwnd", width=100, anchor="e")
+        self.tree.column("vis", width=100, anchor="e")
+        self.tree.column("cpu", width=70, anchor="e")
+        self.tree.column("mem", width=100, anchor="e")
+        self.tree.column("exe", width=280, anchor="w")
+        self.tree.configure(displaycolumns=self.base_columns)
 
         vsb = ttk.Scrollbar(mid, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscroll=vsb.set)
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         vsb.pack(side=tk.LEFT, fill=tk.Y)
 
+        # 미리보기 패널: 켜면 오른쪽에 붙고, DWM이 preview_area 위치에 선택한 창을 직접 그립니다.
+        self.preview_frame = ttk.Frame(mid, style="Light.TFrame", width=PREVIEW_PANEL_WIDTH)
+        self.preview_frame.pack_propagate(False)
+        self.preview_label = ttk.Label(self.preview_frame, text="", style="Light.TLabel", foreground="#6B7280",
+                                       wraplength=PREVIEW_PANEL_WIDTH - 16)
+        self.preview_label.pack(fill=tk.X, padx=(8, 0), pady=(0, 6))
+        self.preview_area = tk.Frame(self.preview_frame, bg="#EEF2F7", highlightthickness=0)
+        self.preview_area.pack(fill=tk.BOTH, expand=True, padx=(8, 0))
+        self.preview_area.bind("<Configure>", lambda e: self._update_preview())
+
         # 컨텍스트 메뉴 (모서리 이동 포함)
         self.menu = tk.Menu(self, tearoff=False)
         self.menu.add_command(label="중앙으로 이동", command=self.center_selected)
@@ -521,6 +4542,15 @@ class App(tk.Tk):
         self.edge_menu.add_command(label="맨 왼쪽으로 (Alt+Left)", command=self.move_selected_to_left)
         self.edge_menu.add_command(label="맨 오른쪽으로 (Alt+Right)", command=self.move_selected_to_right)
         self.menu.add_cascade(label="가장자리로 이동", menu=self.edge_menu)
+        # 여러 창 타일 배치 서브메뉴 (Ctrl/Shift+클릭으로 여러 창 선택)
+        self.tile_menu = tk.Menu(self.menu, tearoff=False)
+        for layout, label in TILING_LAYOUTS.items():
+            self.tile_menu.add_command(label=label, command=lambda l=layout: self.tile_selected(l))
+        self.tile_menu.add_separator()
+        self.tile_span_monitors_var = tk.BooleanVar(value=False)
+        self.tile_menu.add_checkbutton(label="모든 모니터에 걸쳐 배치", onvalue=True, offvalue=False,
+                                       variable=self.tile_span_monitors_var)
+        self.menu.add_cascade(label="선택한 창 타일 배치", menu=self.tile_menu)
         self.menu.add_separator()
         # 크기 복사 메뉴
         self.size_menu = tk.Menu(self.menu, tearoff=False)
@@ -537,16 +4567,17 @@ class App(tk.Tk):
         self.preset_menu.add_command(label="현재 크기 프리셋 저장...", command=self.save_window_size_preset)
         self.preset_menu.add_command(label="현재 위치 프리셋 저장...", command=self.save_window_position_preset)
         self.preset_menu.add_separator()
-        self.size_preset_apply_menu = tk.Menu(self.preset_menu, tearoff=False)
-        self.position_preset_apply_menu = tk.Menu(self.preset_menu, tearoff=False)
-        self.preset_menu.add_cascade(label="저장된 크기 프리셋 적용", menu=self.size_preset_apply_menu)
-        self.preset_menu.add_cascade(label="저장된 위치 프리셋 적용", menu=self.position_preset_apply_menu)
+        self.preset_menu.add_command(label="프리셋 팔레트... (Ctrl+P)", command=self.open_preset_palette)
+        self.preset_menu.add_separator()
+        self.preset_menu.add_command(label="현재 창 영역을 스냅 영역으로 저장...", command=self.save_snap_zone)
+        self.preset_menu.add_command(label="스냅 영역 모두 삭제", command=self.clear_snap_zones)
         self.menu.add_cascade(label="창 크기/위치 프리셋", menu=self.preset_menu)
         self.menu.add_separator()
         self.menu.add_command(label="닫기 (Del)", command=self.close_selected)
 
         self.tree.bind("<Button-3>", self._on_right_click)
         self.tree.bind("<Double-1>", lambda e: self.center_selected())
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self._update_preview())
 
         # 하단 상태바
         bottom = ttk.Frame(self, style="Naked.TFrame", padding=(12, 0, 12, 12))
@@ -555,18 +4586,25 @@ class App(tk.Tk):
         self.status_label.pack(side=tk.LEFT)
 
     # ----- 데이터 로드 -----
+    @profiled()
     def _load_saved_window_state(self):
+        if self.preset_store is not None and self.preset_store.migrated:
+            self._load_saved_window_state_from_store()
+            return
+
         state_data = self._read_json_file(SAVED_WINDOW_STATE_FILE)
         if isinstance(state_data, dict):
             saved_size = _read_int_pair(state_data.get("saved_size"))
             if saved_size is not None:
                 self.saved_size = saved_size
                 self.saved_size_title = state_data.get("saved_size_title") or "저장된 창"
+                self.saved_size_app = str(state_data.get("saved_size_app") or "")
 
             saved_position = _read_int_pair(state_data.get("saved_position"))
             if saved_position is not None:
                 self.saved_position = saved_position
                 self.saved_position_title = state_data.get("saved_position_title") or "저장된 창"
+                self.saved_position_app = str(state_data.get("saved_position_app") or "")
 
         self.window_presets = []
         preset_data = self._read_json_file(SAVED_WINDOW_PRESETS_FILE)
@@ -585,24 +4623,168 @@ class App(tk.Tk):
                 preset = self._coerce_window_preset(raw_preset, fallback_name=f"프리셋 {index}")
                 if preset is not None:
                     self.window_presets.append(preset)
-            if loaded_legacy_presets and self.window_presets:
+            if loaded_legacy_presets and self.window_presets and self.preset_store is None:
                 self._save_window_presets(show_warning=False)
 
-    def _read_json_file(self, path):
+        if self.preset_store is not None:
+            self._migrate_to_preset_store()
+
+    def _load_saved_window_state_from_store(self):
+        try:
+            self.window_presets = self.preset_store.load_presets()
+            saved_size, saved_size_title, saved_size_app = self.preset_store.latest_history("size")
+            saved_position, saved_position_title, saved_position_app = self.preset_store.latest_history("position")
+        except sqlite3.Error as e:
+            messagebox.showwarning("불러오기 실패", f"{self.preset_store.path.name}에서 프리셋을 읽지 못했습니다:\n{e}")
+            return
+        if saved_size is not None:
+            self.saved_size = saved_size
+            self.saved_size_title = saved_size_title or "저장된 창"
+            self.saved_size_app = saved_size_app or ""
+        if saved_position is not None:
+            self.saved_position = saved_position
+            self.saved_position_title = saved_position_title or "저장된 창"
+            self.saved_position_app = saved_position_app or ""
+
+    def _migrate_to_preset_store(self):
+        """JSON 파일(과 상태 파일 안의 예전 presets 키)에서 읽은 값을 SQLite 저장소로 한 번만 옮깁니다."""
+        try:
+            count = self.preset_store.upsert_presets(self.window_presets)
+            if self.saved_size is not None:
+                self.preset_store.record_history("size", self.saved_size, self.saved_size_title, self.saved_size_app)
+            if self.saved_position is not None:
+                self.preset_store.record_history("position", self.saved_position, self.saved_position_title,
+                                                 self.saved_position_app)
+            self.preset_store.mark_migrated(f"{count} presets")
+        except sqlite3.Error as e:
+            messagebox.showwarning("옮기기 실패", f"프리셋을 {self.preset_store.path.name}로 옮기지 못했습니다:\n{e}")
+            return
+        # 같은 이름과 종류의 프리셋은 저장소에서 하나로 합쳐지므로 저장소 기준으로 다시 읽습니다.
+        self.window_presets = self.preset_store.load_presets()
+
+    @profiled()
+    def _load_layout_profiles(self):
+        data = self._read_json_file(LAYOUT_PROFILES_FILE)
+        self.layout_profiles = {}
+        if not isinstance(data, dict):
+            return
+        profiles = data.get("profiles")
+        if isinstance(profiles, dict):
+            for fingerprint, profile in profiles.items():
+                if isinstance(profile, dict) and isinstance(profile.get("windows"), list):
+                    self.layout_profiles[str(fingerprint)] = profile
+        self.auto_restore_layout_var.set(bool(data.get("auto_restore", True)))
+
+    @profiled()
+    def _save_layout_profiles(self, show_warning=True):
+        data = {
+            "auto_restore": bool(self.auto_restore_layout_var.get()),
+            "profiles": self.layout_profiles,
+            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        try:
+            with LAYOUT_PROFILES_FILE.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            if show_warning:
+                messagebox.showwarning("저장 실패", f"레이아웃 프로필을 파일에 저장하지 못했습니다:\n{e}")
+            return False
+
+    @profiled()
+    def _load_snap_zones(self):
+        data = self._read_json_file(SNAP_ZONES_FILE)
+        self.snap_zones = []
+        self._snap_index = None
+        raw_zones = data.get("zones") if isinstance(data, dict) else None
+        if isinstance(raw_zones, list):
+            for index, raw_zone in enumerate(raw_zones, start=1):
+                zone = self._coerce_snap_zone(raw_zone, fallback_name=f"스냅 영역 {index}")
+                if zone is not None:
+                    self.snap_zones.append(zone)
+
+    @profiled()
+    def _save_snap_zones(self, show_warning=True):
+        data = {
+            "zones": self.snap_zones,
+            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
         try:
-            with path.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
+            with SNAP_ZONES_FILE.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            if show_warning:
+                messagebox.showwarning("저장 실패", f"스냅 영역을 파일에 저장하지 못했습니다:\n{e}")
+            return False
+
+    def _coerce_snap_zone(self, raw_zone, fallback_name):
+        if not isinstance(raw_zone, dict):
             return None
-        except (OSError, json.JSONDecodeError):
+        rect = _read_rect(raw_zone.get("rect"))
+        if rect is None:
             return None
+        try:
+            monitor = int(raw_zone.get("monitor") or 1)
+        except (TypeError, ValueError):
+            monitor = 1
+        name = str(raw_zone.get("name") or fallback_name).strip() or fallback_name
+        return {
+            "name": name,
+            "monitor": monitor,
+            "rect": list(rect),
+            "updated_at": str(raw_zone.get("updated_at") or ""),
+        }
+
+    @profiled()
+    def _load_geometry_memory(self):
+        data = self._read_json_file(GEOMETRY_MEMORY_FILE)
+        if isinstance(data, dict):
+            self.auto_geometry_var.set(bool(data.get("enabled", True)))
+            self.geometry_memory.load_json(data.get("entries"))
+
+    @profiled()
+    def _flush_geometry_memory(self, force=False):
+        """모아 둔 변경을 한 번에 씁니다. 창이 움직일 때마다 파일을 쓰지 않도록 타이머로만 부릅니다."""
+        self._geometry_flush_job = None
+        if not (force or self.geometry_memory.dirty):
+            return True
+        data = {
+            "enabled": bool(self.auto_geometry_var.get()),
+            "entries": self.geometry_memory.to_json(),
+            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        try:
+            with GEOMETRY_MEMORY_FILE.open("w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            self.geometry_memory.dirty = False
+            return True
+        except OSError:
+            return False
+
+    def _schedule_geometry_flush(self):
+        if self.geometry_memory.dirty and self._geometry_flush_job is None:
+            self._geometry_flush_job = self.after(GEOMETRY_MEMORY_FLUSH_MS, self._flush_geometry_memory)
+
+    @profiled()
+    def _read_json_file(self, path):
+        # 시작할 때는 백그라운드 스레드가 미리 읽어 둔 내용을 씁니다.
+        if path in self._preloaded_json:
+            return self._preloaded_json.pop(path)
+        return _load_json_file(path)
+
+    @profiled()
+    def _save_saved_window_state(self, kind=None):
+        if self.preset_store is not None:
+            return self._save_saved_window_state_to_store(kind)
 
-    def _save_saved_window_state(self):
         data = {
             "saved_size": list(self.saved_size) if self.saved_size is not None else None,
             "saved_size_title": self.saved_size_title,
+            "saved_size_app": self.saved_size_app,
             "saved_position": list(self.saved_position) if self.saved_position is not None else None,
             "saved_position_title": self.saved_position_title,
+            "saved_position_app": self.saved_position_app,
             "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
         }
 
@@ -614,7 +4796,36 @@ class App(tk.Tk):
             messagebox.showwarning("저장 실패", f"창 크기/위치 값을 파일에 저장하지 못했습니다:\n{e}")
             return False
 
-    def _save_window_presets(self, show_warning=True):
+    def _save_saved_window_state_to_store(self, kind):
+        entries = {
+            "size": (self.saved_size, self.saved_size_title, self.saved_size_app),
+            "position": (self.saved_position, self.saved_position_title, self.saved_position_app),
+        }
+        try:
+            for entry_kind in ([kind] if kind else entries):
+                value, source_title, source_app = entries[entry_kind]
+                if value is not None:
+                    self.preset_store.record_history(entry_kind, value, source_title, source_app)
+            return True
+        except sqlite3.Error as e:
+            messagebox.showwarning("저장 실패", f"창 크기/위치 값을 {self.preset_store.path.name}에 저장하지 못했습니다:\n{e}")
+            return False
+
+    @profiled()
+    def _save_window_presets(self, show_warning=True, changed=None):
+        """
+        프리셋을 저장합니다. SQLite 저장소를 쓰면 changed에 준 프리셋만 upsert 하고,
+        JSON이면 (또는 changed가 없으면) 전체를 다시 씁니다.
+        """
+        if self.preset_store is not None:
+            try:
+                self.preset_store.upsert_presets(self.window_presets if changed is None else changed)
+                return True
+            except sqlite3.Error as e:
+                if show_warning:
+                    messagebox.showwarning("저장 실패", f"창 프리셋을 {self.preset_store.path.name}에 저장하지 못했습니다:\n{e}")
+                return False
+
         normalized_presets = []
         for index, preset in enumerate(self.window_presets, start=1):
             normalized = self._coerce_window_preset(preset, fallback_name=f"프리셋 {index}")
@@ -636,11 +4847,12 @@ class App(tk.Tk):
                 messagebox.showwarning("저장 실패", f"창 프리셋을 파일에 저장하지 못했습니다:\n{e}")
             return False
 
-    def _make_window_preset(self, name, source_title, size, position):
+    def _make_window_preset(self, name, source_title, size, position, source_app=""):
         name = str(name or "").strip() or f"프리셋 {len(self.window_presets) + 1}"
         return {
             "name": name,
             "source_title": str(source_title or ""),
+            "source_app": str(source_app or ""),
             "size": list(size) if size is not None else None,
             "position": list(position) if position is not None else None,
             "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
@@ -659,94 +4871,276 @@ class App(tk.Tk):
         return {
             "name": name,
             "source_title": str(raw_preset.get("source_title") or ""),
+            "source_app": str(raw_preset.get("source_app") or ""),
             "size": list(size) if size is not None else None,
             "position": list(position) if position is not None else None,
             "updated_at": str(raw_preset.get("updated_at") or ""),
         }
 
     def _preset_kind(self, preset):
-        has_size = _read_int_pair(preset.get("size")) is not None
-        has_position = _read_int_pair(preset.get("position")) is not None
-        if has_size and has_position:
-            return "both"
-        if has_size:
-            return "size"
-        if has_position:
-            return "position"
-        return None
+        return get_preset_kind(preset)
 
-    def _refresh_preset_menu(self):
-        if not hasattr(self, "size_preset_apply_menu"):
-            return
+    def _preset_save_target_name(self):
+        return self.preset_store.path.name if self.preset_store is not None else SAVED_WINDOW_PRESETS_FILE.name
 
-        self.size_preset_apply_menu.delete(0, tk.END)
-        self.position_preset_apply_menu.delete(0, tk.END)
-        size_count = 0
-        position_count = 0
+    def _state_save_target_name(self):
+        return self.preset_store.path.name if self.preset_store is not None else SAVED_WINDOW_STATE_FILE.name
 
-        for index, preset in enumerate(self.window_presets):
-            name = _shorten_text(preset.get("name") or f"프리셋 {index + 1}")
-            size = _read_int_pair(preset.get("size"))
-            position = _read_int_pair(preset.get("position"))
-            if size is not None:
-                self.size_preset_apply_menu.add_command(
-                    label=f"{name} ({size[0]}x{size[1]})",
-                    command=lambda preset_index=index: self.apply_window_size_preset(preset_index),
-                )
-                size_count += 1
-            if position is not None:
-                self.position_preset_apply_menu.add_command(
-                    label=f"{name} ({position[0]},{position[1]})",
-                    command=lambda preset_index=index: self.apply_window_position_preset(preset_index),
-                )
-                position_count += 1
+    def _reload_preset_palette(self):
+        self.preset_palette.reset(self.window_presets)
 
-        if size_count == 0:
-            self.size_preset_apply_menu.add_command(label="저장된 크기 프리셋 없음", state=tk.DISABLED)
-        if position_count == 0:
-            self.position_preset_apply_menu.add_command(label="저장된 위치 프리셋 없음", state=tk.DISABLED)
+    def open_preset_palette(self, *args):
+        hwnd, _ = self._get_selected_hwnd_and_title()
+        if not hwnd:
+            messagebox.showwarning("경고", "프리셋을 적용할 창을 선택해주세요.")
+            return
+        self.preset_palette.show()
 
+    @profiled()
     def refresh_tree(self):
-        query = self.search_var.get().strip().lower()
+        self._tree_generation += 1  # 시작할 때 흘려 넣던 행이 있으면 멈춥니다.
+        options = self._tree_options()
+        trace_rows = [] if self.trace_recorder is not None else None
+        enumerated = [] if self.auto_refresh is not None and self.auto_refresh.running else None
+        rows, selector_error = collect_tree_rows(options, self.window_classifier, trace_rows, enumerated)
+        if trace_rows is not None:
+            self._record_enumeration(options, trace_rows)
+        self._clear_tree()
+        for index, row in enumerate(rows):
+            self._insert_tree_row(row, index)
+        fingerprint = None
+        if enumerated is not None:
+            fingerprint = enumeration_fingerprint(enumerated, exclude=(options["own_hwnd"],))
+        self._finish_tree_refresh(len(rows), selector_error, fingerprint)
+
+    def _tree_options(self):
+        """목록을 만들 때 필요한 UI 상태를 한 번에 읽어 둡니다. (다른 스레드에서 Tk 변수를 읽지 않도록)"""
+        show_resources = self.show_resources_var.get()
+        # 클로킹 분류는 열거 단계에서 먼저 하고, 걸러진 창은 프로세스/아이콘 작업을 하지 않습니다.
+        hidden_states = set()
+        if self.hide_cloaked_var.get():
+            hidden_states.add(WINDOW_CLOAKED)
+        if self.this_desktop_only_var.get():
+            hidden_states.add(WINDOW_OTHER_DESKTOP)
+        return {
+            "query": self.search_var.get().strip(),
+            "hidden_only": self.hidden_only_var.get(),
+            "show_resources": show_resources,
+            "process_stats": self.process_sampler.snapshot if show_resources else {},
+            "hidden_states": hidden_states,
+            "own_hwnd": self._own_hwnd(),
+            "sort": (self.sort_column, self.sort_reverse),
+            "visibility_cache": self._visibility_cache,
+        }
+
+    def _clear_tree(self):
         for iid in self.tree.get_children():
             self.tree.delete(iid)
         self.tk_images.clear()
+        self._tree_row_pids.clear()
+
+    def _insert_tree_row(self, row, index, with_icon=True):
+        hwnd = row["hwnd"]
+        img = self._get_row_icon(hwnd) if with_icon else None
+
+        vals = (
+            _tcl_safe(row["title"]),
+            _tcl_safe(row["proc"]),
+            _tcl_safe(row["cls"]),
+            str(hwnd),
+            _format_visible_fraction(row["vis"]),
+            _format_cpu_percent(row["cpu"]),
+            _format_memory(row["mem"]),
+            _tcl_safe(row["exe"] or ""),
+        )
+        tag = "even" if index % 2 else "odd"
 
-        count = 0
-        for w in list_windows():
-            hwnd = w._hWnd
-            title = w.title
-            class_name = win32gui.GetClassName(hwnd) if win32gui.IsWindow(hwnd) else ""
-            proc_name = ""
-            try:
-                tid, pid = win32process.GetWindowThreadProcessId(hwnd)
-                if pid:
-                    proc = psutil.Process(pid)
-                    proc_name = proc.name()
-            except Exception:
-                proc_name = ""
+        insert_kwargs = {"text": "", "values": vals, "tags": (tag,)}
+        if img is not None:
+            insert_kwargs["image"] = img  # #0 칼럼 아이콘
 
-            hay = f"{title} {proc_name} {class_name}".lower()
-            if query and query not in hay:
-                continue
+        iid = self.tree.insert("", tk.END, **insert_kwargs)
+        if row["pid"] is not None:
+            self._tree_row_pids[iid] = row["pid"]
+        return iid
 
-            img = self.tk_images.get(hwnd)
-            if img is None:
-                img = get_hwnd_icon_image(hwnd, size=(18, 18))
-                if img:
-                    self.tk_images[hwnd] = img
+    def _get_row_icon(self, hwnd):
+        img = self.tk_images.get(hwnd)
+        if img is None:
+            img = get_hwnd_icon_image(hwnd, size=(18, 18))
+            if img:
+                self.tk_images[hwnd] = img
+        return img
+
+    def _finish_tree_refresh(self, count, selector_error, fingerprint=None):
+        if self.auto_refresh is not None:
+            self.auto_refresh.mark_fresh(fingerprint)
+
+        status = f"표시된 창: {count}개  (F5 새로고침)"
+        if selector_error:
+            status += f"  ·  선택자 오류: {selector_error} (일반 검색으로 처리)"
+        self.status_label.config(text=status)
+
+    # ----- 정렬 -----
+    def sort_by_column(self, column):
+        """열 제목을 누르면 그 열로 정렬하고, 같은 열을 다시 누르면 순서를 뒤집습니다."""
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        for name, text in self.column_headings.items():
+            arrow = ""
+            if name == self.sort_column:
+                arrow = " ▼" if self.sort_reverse else " ▲"
+            self.tree.heading(name, text=text + arrow)
+        self.refresh_tree()
 
-            vals = (_tcl_safe(title), _tcl_safe(proc_name), _tcl_safe(class_name), str(hwnd))
-            tag = "even" if count % 2 else "odd"
+    # ----- 프로파일링 -----
+    def _on_profiling_toggled(self):
+        self.profiler.enabled = bool(self.profiling_var.get())
+        self.profiler.mode = "cprofile" if self.profiling_cprofile_var.get() else "sampling"
+        if self.profiler.enabled:
+            self._notify(f"{self.profiler.threshold_ms:g} ms보다 오래 걸린 동작을 최근 {self.profiler.captures.maxlen}개까지 기록합니다.")
+        else:
+            self._notify("느린 동작 프로파일링을 껐습니다.")
+
+    def export_profiles(self, *args):
+        if not self.profiler.captures:
+            self._notify(f"기록된 느린 동작이 없습니다. (측정한 동작 {self.profiler.measured}개)")
+            return
+        try:
+            written = self.profiler.export(PROFILE_EXPORT_DIR)
+        except OSError as e:
+            messagebox.showerror("오류", f"프로파일 기록을 저장할 수 없습니다:\n{e}")
+            return
+        slowest = max(self.profiler.captures, key=lambda capture: capture["elapsed_ms"])
+        self._notify(f"느린 동작 {len(self.profiler.captures)}개를 {PROFILE_EXPORT_DIR.name} 폴더에 저장했습니다. "
+                     f"(파일 {len(written)}개, 가장 느린 동작: {slowest['name']} {slowest['elapsed_ms']:.0f} ms)")
+
+    # ----- 미리보기 -----
+    def _on_show_preview_toggled(self):
+        if self.show_preview_var.get():
+            if self.thumbnail_pool is None:
+                try:
+                    self.thumbnail_pool = ThumbnailPool(DwmThumbnailBackend(), self._own_hwnd())
+                except Exception as e:
+                    self.show_preview_var.set(False)
+                    self._notify(f"이 환경에서는 창 미리보기를 쓸 수 없습니다: {e}")
+                    return
+            self.preview_frame.pack(side=tk.LEFT, fill=tk.Y)
+            self._update_preview()
+        else:
+            if self.thumbnail_pool is not None:
+                self.thumbnail_pool.hide()
+            self.preview_frame.pack_forget()
+
+    def _update_preview(self):
+        """선택한 창의 미리보기를 패널에 맞춰 다시 배치합니다. 선택이 바뀌거나 패널 크기가 바뀔 때 호출됩니다."""
+        if not self.show_preview_var.get() or self.thumbnail_pool is None:
+            return
+        hwnd, title = self._get_selected_hwnd_and_title()
+        if not hwnd or not win32gui.IsWindow(hwnd):
+            self.thumbnail_pool.hide()
+            self.preview_label.config(text="창을 선택하면 미리보기가 표시됩니다.")
+            return
+        try:
+            # 썸네일 좌표는 최상위 창 클라이언트 영역 기준입니다.
+            client_x, client_y = win32gui.ClientToScreen(self._own_hwnd(), (0, 0))
+            left = self.preview_area.winfo_rootx() - client_x
+            top = self.preview_area.winfo_rooty() - client_y
+            container = (left, top, left + self.preview_area.winfo_width(), top + self.preview_area.winfo_height())
+            shown = self.thumbnail_pool.show(hwnd, container)
+        except Exception:
+            shown = None
+        if shown is None:
+            self.thumbnail_pool.hide()
+            self.preview_label.config(text=f"'{_shorten_text(title, 40)}' 창은 미리보기를 만들 수 없습니다.")
+        else:
+            self.preview_label.config(text=_shorten_text(title, 60))
+
+    # ----- 자동 새로고침 -----
+    def _on_auto_refresh_toggled(self):
+        if self.auto_refresh_var.get():
+            self.auto_refresh.start()
+            self._notify(f"창 목록을 {self.auto_refresh_interval_var.get() / 1000:g}초 간격으로 확인해 바뀌었을 때만 새로고침합니다.")
+        else:
+            self.auto_refresh.stop()
+            self._notify("창 목록 자동 새로고침을 껐습니다.")
+
+    def _on_auto_refresh_interval_changed(self):
+        self.auto_refresh.set_interval(self.auto_refresh_interval_var.get())
+
+    def _auto_refresh_tree(self):
+        """폴링으로 변화를 찾았을 때의 새로고침. 사용자가 보던 선택과 스크롤 위치를 유지합니다."""
+        selected = set(self._get_selected_hwnds())
+        focused_hwnd = None
+        focus_iid = self.tree.focus()
+        if focus_iid:
+            try:
+                focused_hwnd = int(self.tree.item(focus_iid, "values")[3])
+            except (IndexError, TypeError, ValueError, tk.TclError):
+                focused_hwnd = None
+        first_visible = self.tree.yview()[0]
 
-            insert_kwargs = {"text": "", "values": vals, "tags": (tag,)}
-            if img is not None:
-                insert_kwargs["image"] = img  # #0 칼럼 아이콘
+        self.refresh_tree()
 
-            self.tree.insert("", tk.END, **insert_kwargs)
-            count += 1
+        if selected or focused_hwnd is not None:
+            reselect = []
+            for iid in self.tree.get_children():
+                try:
+                    hwnd = int(self.tree.item(iid, "values")[3])
+                except (IndexError, TypeError, ValueError):
+                    continue
+                if hwnd in selected:
+                    reselect.append(iid)
+                if hwnd == focused_hwnd:
+                    self.tree.focus(iid)
+            if reselect:
+                self.tree.selection_set(reselect)
+        self.tree.yview_moveto(first_visible)
+
+    # ----- 자원 사용량 열 -----
+    def _on_show_resources_toggled(self):
+        if self.show_resources_var.get():
+            self.tree.configure(displaycolumns=self.base_columns + ("cpu", "mem", "exe"))
+            self.process_sampler.start()
+        else:
+            self.process_sampler.stop()
+            self.tree.configure(displaycolumns=self.base_columns)
+            if self.sort_column in ("cpu", "mem", "exe"):
+                self.sort_column = None
+                for name, text in self.column_headings.items():
+                    self.tree.heading(name, text=text)
+        self.refresh_tree()
 
-        self.status_label.config(text=f"표시된 창: {count}개  (F5 새로고침)")
+    def _apply_process_snapshot(self, snapshot):
+        """
+        샘플러가 새 값을 모으면 목록 전체를 다시 만들지 않고 CPU/메모리 칸만 바꿉니다.
+        CPU나 메모리로 정렬 중이면 행 순서만 다시 맞춥니다.
+        """
+        if not self.show_resources_var.get():
+            return
+        values = {}
+        for iid, pid in self._tree_row_pids.items():
+            stats = snapshot.get(pid) or {}
+            values[iid] = (stats.get("cpu"), stats.get("mem"))
+            try:
+                self.tree.set(iid, "cpu", _format_cpu_percent(stats.get("cpu")))
+                self.tree.set(iid, "mem", _format_memory(stats.get("mem")))
+                self.tree.set(iid, "exe", _tcl_safe(stats.get("exe") or ""))
+            except tk.TclError:
+                continue  # 그 사이 새로고침으로 사라진 행
+        if self.sort_column not in ("cpu", "mem"):
+            return
+        position = 0 if self.sort_column == "cpu" else 1
+        children = list(self.tree.get_children())
+        present = [iid for iid in children if values.get(iid, (None, None))[position] is not None]
+        missing = [iid for iid in children if values.get(iid, (None, None))[position] is None]
+        present.sort(key=lambda iid: values[iid][position], reverse=self.sort_reverse)
+        for index, iid in enumerate(present + missing):
+            self.tree.move(iid, "", index)
+            self.tree.item(iid, tags=("even" if index % 2 else "odd",))
 
     # ----- 선택 유틸 -----
     def _get_selected_hwnd_and_title(self):
@@ -757,16 +5151,28 @@ class App(tk.Tk):
         vals = self.tree.item(iid, "values")
         if not vals:
             return None, None
-        title, _, _, hwnd_str = vals
+        title, hwnd_str = vals[0], vals[3]
         try:
             hwnd = int(hwnd_str)
         except Exception:
             hwnd = None
         return hwnd, title
 
+    def _get_selected_hwnds(self):
+        """선택된 모든 창의 hwnd를 목록 순서대로 반환합니다."""
+        hwnds = []
+        for iid in self.tree.selection():
+            vals = self.tree.item(iid, "values")
+            try:
+                hwnds.append(int(vals[3]))
+            except (IndexError, TypeError, ValueError):
+                continue
+        return hwnds
+
     def _ensure_selection_at(self, event):
         iid = self.tree.identify_row(event.y)
-        if iid:
+        # 여러 창을 선택한 상태에서 그중 하나를 우클릭하면 선택을 유지합니다.
+        if iid and iid not in self.tree.selection():
             self.tree.selection_set(iid)
             self.tree.focus(iid)
 
@@ -779,17 +5185,20 @@ class App(tk.Tk):
             self.menu.grab_release()
 
     # ----- 액션 -----
+    @profiled()
     def center_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
         try:
+            self.geometry_journal.record(hwnd, "중앙으로 이동")
             move_window_center_and_signal(hwnd)
             self._notify(f"'{title}' 창을 중앙으로 이동했습니다.")
         except Exception as e:
             messagebox.showerror("오류", f"창을 이동할 수 없습니다:\n{e}")
 
+    @profiled()
     def bring_to_front_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
@@ -797,36 +5206,43 @@ class App(tk.Tk):
         bring_window_to_front_by_hwnd(hwnd)
         self._notify(f"'{title}' 창을 전면으로 가져왔습니다.")
 
+    @profiled()
     def minimize_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             return
         try:
+            self.geometry_journal.record(hwnd, "최소화")
             win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
             self._notify(f"'{title}' 창을 최소화했습니다.")
         except Exception as e:
             messagebox.showerror("오류", f"최소화 실패:\n{e}")
 
+    @profiled()
     def maximize_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             return
         try:
+            self.geometry_journal.record(hwnd, "최대화")
             win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
             self._notify(f"'{title}' 창을 최대화했습니다.")
         except Exception as e:
             messagebox.showerror("오류", f"최대화 실패:\n{e}")
 
+    @profiled()
     def restore_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             return
         try:
+            self.geometry_journal.record(hwnd, "복원")
             win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
             self._notify(f"'{title}' 창을 복원했습니다.")
         except Exception as e:
             messagebox.showerror("오류", f"복원 실패:\n{e}")
 
+    @profiled()
     def toggle_topmost_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
@@ -843,6 +5259,7 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("오류", f"항상 위 토글 실패:\n{e}")
 
+    @profiled()
     def close_selected(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
@@ -855,75 +5272,530 @@ class App(tk.Tk):
             messagebox.showerror("오류", f"닫기 실패:\n{e}")
 
     # ----- 모서리 이동 액션 (모니터 좌표계, margin=0) -----
+    @profiled()
     def move_selected_top_left(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "모서리로 이동")
         move_window_to_corner(hwnd, "top-left", margin=0)
         self._notify(f"'{title}' 창을 좌상단(모니터 좌표)으로 이동했습니다.")
 
+    @profiled()
     def move_selected_bottom_left(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "모서리로 이동")
         move_window_to_corner(hwnd, "bottom-left", margin=0)
         self._notify(f"'{title}' 창을 좌하단(모니터 좌표)으로 이동했습니다.")
 
+    @profiled()
     def move_selected_top_right(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "모서리로 이동")
         move_window_to_corner(hwnd, "top-right", margin=0)
         self._notify(f"'{title}' 창을 우상단(모니터 좌표)으로 이동했습니다.")
 
+    @profiled()
     def move_selected_bottom_right(self, *args):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "모서리로 이동")
         move_window_to_corner(hwnd, "bottom-right", margin=0)
         self._notify(f"'{title}' 창을 우하단(모니터 좌표)으로 이동했습니다.")
 
     # ----- 가장자리 이동 액션 (한 축만 이동) -----
+    @profiled()
     def move_selected_to_top(self, *args):
         """X축 유지, 화면 맨 위로 이동"""
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "가장자리로 이동")
         move_window_to_edge(hwnd, "top", margin=0)
         self._notify(f"'{title}' 창을 맨 위로 이동했습니다. (X축 유지)")
 
+    @profiled()
     def move_selected_to_bottom(self, *args):
         """X축 유지, 화면 맨 아래로 이동"""
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "가장자리로 이동")
         move_window_to_edge(hwnd, "bottom", margin=0)
         self._notify(f"'{title}' 창을 맨 아래로 이동했습니다. (X축 유지)")
 
+    @profiled()
     def move_selected_to_left(self, *args):
         """Y축 유지, 화면 맨 왼쪽으로 이동"""
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "가장자리로 이동")
         move_window_to_edge(hwnd, "left", margin=0)
         self._notify(f"'{title}' 창을 맨 왼쪽으로 이동했습니다. (Y축 유지)")
 
+    @profiled()
     def move_selected_to_right(self, *args):
         """Y축 유지, 화면 맨 오른쪽으로 이동"""
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
             messagebox.showwarning("경고", "창을 선택해주세요.")
             return
+        self.geometry_journal.record(hwnd, "가장자리로 이동")
         move_window_to_edge(hwnd, "right", margin=0)
         self._notify(f"'{title}' 창을 맨 오른쪽으로 이동했습니다. (Y축 유지)")
 
+    # ----- 미세 이동 / 크기 조절 -----
+    def nudge_target_window(self, dx=0, dy=0, dw=0, dh=0):
+        """
+        전면 창(이 프로그램이 전면이면 목록에서 선택한 창)을 조금씩 옮기거나 크기를 바꿉니다.
+        키 반복 입력은 WindowNudger가 모아 프레임마다 한 번만 적용합니다.
+        """
+        hwnd = win32gui.GetForegroundWindow()
+        if not hwnd or hwnd == self._own_hwnd():
+            hwnd, _ = self._get_selected_hwnd_and_title()
+        if not hwnd:
+            return
+        try:
+            self.nudger.nudge(hwnd, dx, dy, dw, dh)
+        except Exception as e:
+            self._notify(f"창을 움직일 수 없습니다: {e}")
+
+    # ----- 스냅 영역 -----
+    def save_snap_zone(self, *args):
+        """선택한 창의 현재 시각적 프레임을 그 창이 있는 모니터의 스냅 영역으로 저장합니다."""
+        hwnd, title = self._get_selected_hwnd_and_title()
+        if not hwnd:
+            messagebox.showwarning("경고", "스냅 영역으로 저장할 창을 선택해주세요.")
+            return
+        if not win32gui.IsWindow(hwnd):
+            messagebox.showerror("오류", "유효하지 않은 창입니다.")
+            return
+
+        zone_name = simpledialog.askstring(
+            "스냅 영역 저장",
+            "저장할 스냅 영역 이름을 입력하세요.",
+            initialvalue=f"스냅 영역 {len(self.snap_zones) + 1}",
+            parent=self,
+        )
+        if zone_name is None:
+            return
+        zone_name = zone_name.strip() or f"스냅 영역 {len(self.snap_zones) + 1}"
+
+        try:
+            l, t, r, b = get_extended_frame_bounds(hwnd)
+            monitors = get_monitor_work_areas()
+            work_areas = [m["work"] for m in monitors]
+            work = _nearest_work_area((l, t, r, b), work_areas)
+            monitor = work_areas.index(work) + 1
+            wl, wt = work[0], work[1]
+            self.snap_zones.append({
+                "name": zone_name,
+                "monitor": monitor,
+                "rect": [l - wl, t - wt, r - wl, b - wt],
+                "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            })
+        except Exception as e:
+            messagebox.showerror("오류", f"스냅 영역을 저장할 수 없습니다:\n{e}")
+            return
+
+        self._snap_index = None
+        saved_to_file = self._save_snap_zones()
+        save_text = f" {SNAP_ZONES_FILE.name}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
+        self._notify(f"'{zone_name}' 스냅 영역({monitor}번 모니터, {r - l} x {b - t})을 저장했습니다.{save_text}")
+
+    def clear_snap_zones(self, *args):
+        if not self.snap_zones:
+            self._notify("저장된 스냅 영역이 없습니다.")
+            return
+        if not messagebox.askyesno("스냅 영역 삭제", f"저장된 스냅 영역 {len(self.snap_zones)}개를 모두 삭제할까요?"):
+            return
+        self.snap_zones = []
+        self._snap_index = None
+        self._save_snap_zones()
+        self._notify("스냅 영역을 모두 삭제했습니다.")
+
+    def _get_snap_index(self):
+        if self._snap_index is None:
+            self._snap_index = SnapZoneIndex(resolve_snap_zones(self.snap_zones, get_monitor_work_areas()))
+        return self._snap_index
+
+    def _cursor_snap_zone(self):
+        x, y = win32api.GetCursorPos()
+        return self._get_snap_index().hit(x, y)
+
+    def _snap_window_to_zone(self, hwnd, zone_index, snapshot=None):
+        rect = self._get_snap_index().zones[zone_index]
+        self.geometry_journal.record(hwnd, "스냅 영역에 맞춤", snapshot=snapshot)
+        batch_move_windows([(hwnd, rect)])
+        self._notify(f"'{win32gui.GetWindowText(hwnd)}' 창을 '{self.snap_zones[zone_index]['name']}' 영역에 맞췄습니다.")
+
+    def snap_target_window_to_cursor_zone(self):
+        """전면 창(이 프로그램이 전면이면 선택한 창)을 마우스 아래 스냅 영역에 맞춥니다."""
+        hwnd = win32gui.GetForegroundWindow()
+        if not hwnd or hwnd == self._own_hwnd():
+            hwnd, _ = self._get_selected_hwnd_and_title()
+        if not hwnd or not self.snap_zones:
+            return
+        try:
+            zone_index = self._cursor_snap_zone()
+            if zone_index is not None:
+                self._snap_window_to_zone(hwnd, zone_index)
+        except Exception as e:
+            self._notify(f"스냅 영역에 맞출 수 없습니다: {e}")
+
+    def _begin_snap_drag(self, hwnd):
+        if not self.snap_zones:
+            return
+        try:
+            snapshot = read_window_snapshot(hwnd)
+        except Exception:
+            return
+        l, t, r, b, _ = snapshot
+        # 되돌리면 끌기 전 자리로 돌아가도록 시작 상태를 들고 있습니다.
+        self._snap_drag = {"hwnd": hwnd, "size": (r - l, b - t), "snapshot": snapshot}
+        self._snap_drag_tick()
+
+    def _snap_drag_tick(self):
+        """드래그하는 동안 프레임마다 마우스 아래 영역을 검사해 미리보기를 보여줍니다."""
+        if self._snap_drag is None:
+            return
+        zone_index = None
+        if not SNAP_REQUIRE_SHIFT or win32api.GetAsyncKeyState(win32con.VK_SHIFT) & 0x8000:
+            try:
+                zone_index = self._cursor_snap_zone()
+            except Exception:
+                zone_index = None
+        if zone_index is None:
+            self.snap_overlay.hide()
+        else:
+            self.snap_overlay.show_rect(self._get_snap_index().zones[zone_index])
+        self.after(self.nudger.frame_ms, self._snap_drag_tick)
+
+    def _end_snap_drag(self, hwnd):
+        drag, self._snap_drag = self._snap_drag, None
+        zone_rect = self.snap_overlay.shown_rect
+        self.snap_overlay.hide()
+        if drag is None or drag["hwnd"] != hwnd or zone_rect is None:
+            return
+        try:
+            l, t, r, b = get_extended_frame_bounds(hwnd)
+            # 크기를 바꾸는 드래그였다면 스냅하지 않습니다.
+            if (r - l, b - t) != drag["size"]:
+                return
+            zone_index = self._cursor_snap_zone()
+            if zone_index is not None:
+                self._snap_window_to_zone(hwnd, zone_index, snapshot=drag["snapshot"])
+        except Exception as e:
+            self._notify(f"스냅 영역에 맞출 수 없습니다: {e}")
+
+    # ----- 앱별 마지막 위치 -----
+    def _on_auto_geometry_toggled(self):
+        if self.auto_geometry_var.get():
+            self._track_open_windows()
+        else:
+            self.geometry_memory.live.clear()
+            self._pending_locations.clear()
+        self._flush_geometry_memory(force=True)
+        state_text = "켰습니다" if self.auto_geometry_var.get() else "껐습니다"
+        self._notify(f"앱별 마지막 위치 기억/복원을 {state_text}.")
+
+    def _track_open_windows(self, tracked=None):
+        if not self.auto_geometry_var.get():
+            return
+        if tracked is None:
+            tracked = collect_window_geometry(exclude=(self._own_hwnd(),))
+        for hwnd, identity, rect in tracked:
+            if hwnd not in self.geometry_memory.live:
+                self.geometry_memory.track(hwnd, identity, rect)
+
+    def _on_geometry_event(self, event, hwnd):
+        """
+        WinEvent로 앱별 마지막 위치를 기록하고 복원합니다.
+        처음 나타난 창은 같은 키로 기억된 사각형이 있으면 그 자리로 옮기고,
+        이동이 끝나거나 창이 숨겨지거나 닫히면 마지막 사각형을 기록합니다.
+        """
+        memory = self.geometry_memory
+        if event == "destroy":
+            memory.release(hwnd)
+            self._schedule_geometry_flush()
+            return
+        if event not in ("show", "create", "foreground", "namechange", "movesizeend", "hide"):
+            return
+        try:
+            if event == "hide":
+                if hwnd in memory.live:
+                    memory.track(hwnd, memory.live[hwnd][0], read_restorable_rect(hwnd))
+                    memory.release(hwnd)
+                    self._schedule_geometry_flush()
+                return
+            if not win32gui.IsWindowVisible(hwnd):
+                return
+            if win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOOLWINDOW:
+                return
+            title = win32gui.GetWindowText(hwnd)
+            if not title:
+                return
+            known = memory.live.get(hwnd)
+            identity = get_window_identity(hwnd, title=title, proc_name=known[0][0] if known else None)
+            if known is None and event in ("show", "create"):
+                self._restore_remembered_geometry(hwnd, identity)
+            rect = read_restorable_rect(hwnd)
+            memory.track(hwnd, identity, rect)
+            if event == "movesizeend" and rect is not None:
+                memory.remember(identity, rect)
+                self._schedule_geometry_flush()
+        except Exception:
+            return
+
+    def _queue_location_change(self, hwnd):
+        """다른 프로그램(Win+화살표, 다른 창 관리자 등)이 옮긴 창의 위치를 모았다가 한 번에 갱신합니다."""
+        if not self.auto_geometry_var.get() or hwnd not in self.geometry_memory.live:
+            return
+        self._pending_locations.add(hwnd)
+        if self._location_flush_job is None:
+            self._location_flush_job = self.after(GEOMETRY_LOCATION_COALESCE_MS, self._flush_location_changes)
+
+    def _flush_location_changes(self):
+        self._location_flush_job = None
+        hwnds, self._pending_locations = self._pending_locations, set()
+        self._update_live_geometry(hwnds)
+
+    def _update_live_geometry(self, hwnds):
+        """추적 중인 창의 지금 사각형을 다시 읽습니다. 닫힐 때 이 값이 앱별 마지막 위치로 기록됩니다."""
+        memory = self.geometry_memory
+        for hwnd in hwnds:
+            known = memory.live.get(hwnd)
+            if known is None:
+                continue
+            try:
+                memory.track(hwnd, known[0], read_restorable_rect(hwnd))
+            except Exception:
+                continue
+
+    def _restore_remembered_geometry(self, hwnd, identity):
+        rect = self.geometry_memory.lookup(identity)
+        if rect is None or win32gui.IsIconic(hwnd) or win32gui.IsZoomed(hwnd):
+            return
+        # 그 사이 모니터가 빠졌다면 화면 밖으로 보내지 않도록 옮기지 않습니다.
+        if not any(_rects_overlap(rect, m["work"]) for m in get_monitor_work_areas()):
+            return
+        self.geometry_journal.record(hwnd, "앱별 마지막 위치 복원")
+        batch_move_windows([(hwnd, rect)])
+
+    # ----- 창 위치 되돌리기 -----
+    @profiled()
+    def undo_geometry(self, *args):
+        self._step_geometry_journal(self.geometry_journal.undo, "되돌렸습니다", "되돌릴 창 이동이 없습니다.")
+
+    @profiled()
+    def redo_geometry(self, *args):
+        self._step_geometry_journal(self.geometry_journal.redo, "다시 실행했습니다", "다시 실행할 창 이동이 없습니다.")
+
+    def _step_geometry_journal(self, step, done_text, empty_text):
+        try:
+            result = step()
+        except Exception as e:
+            messagebox.showerror("오류", f"창 위치를 바꿀 수 없습니다:\n{e}")
+            return
+        if result is None:
+            self._notify(empty_text)
+            return
+        label, restored = result
+        self.nudger.invalidate()
+        self._notify(f"'{label}'을(를) {done_text}. (창 {restored}개)")
+
+    # ----- 트레이스 기록 (--record) -----
+    def _record_enumeration(self, options, rows):
+        """collect_tree_rows가 같은 열거에서 채운 트레이스 창 행을 기록합니다."""
+        filters = (
+            options["hidden_only"],
+            WINDOW_CLOAKED in options["hidden_states"],
+            WINDOW_OTHER_DESKTOP in options["hidden_states"],
+        )
+        self.trace_recorder.enumeration(rows, query=options["query"], filters=filters)
+
+    def _record_window_event(self, event, hwnd):
+        row = None
+        if event not in ("destroy", "hide"):
+            try:
+                row = capture_window_row(hwnd, self.window_classifier)
+            except Exception:
+                row = None
+        self.trace_recorder.event(event, hwnd, row)
+
+    def _on_geometry_committed(self, label, hwnds):
+        # 되돌리기 기록은 옮기기 전에 남으므로, 옮긴 결과 위치는 조금 기다렸다가 읽습니다.
+        self.after(MOVE_SETTLE_MS, self._after_geometry_moves, label, hwnds)
+
+    def _after_geometry_moves(self, label, hwnds):
+        if self.auto_geometry_var.get():
+            self._update_live_geometry(hwnds)
+        if self.trace_recorder is not None:
+            self._write_move_action(label, hwnds)
+
+    def _write_move_action(self, label, hwnds):
+        moves = []
+        for hwnd in hwnds:
+            try:
+                if win32gui.IsWindow(hwnd):
+                    moves.append([hwnd, *get_extended_frame_bounds(hwnd)])
+            except Exception:
+                continue
+        if moves and self.trace_recorder is not None:
+            self.trace_recorder.action("move", label=label, m=moves)
+
+    # ----- 타일 배치 -----
+    @profiled()
+    def tile_selected(self, layout):
+        """선택한 창들을 첫 번째 창이 있는 모니터(또는 모든 모니터)에 타일 배치합니다."""
+        hwnds = self._get_selected_hwnds()
+        if not hwnds:
+            messagebox.showwarning("경고", "배치할 창을 선택해주세요. (Ctrl/Shift+클릭으로 여러 개 선택)")
+            return
+        try:
+            if self.tile_span_monitors_var.get():
+                work_areas = [m["work"] for m in get_monitor_work_areas()]
+            else:
+                work_areas = [tuple(_get_work_area_rect_for_hwnd(hwnds[0]))]
+            self.geometry_journal.record_many(hwnds, "타일 배치")
+            moved = tile_windows(hwnds, layout, work_areas, self.learned_min_sizes)
+            self._notify(f"창 {moved}개를 '{TILING_LAYOUTS[layout]}' 방식으로 배치했습니다.")
+        except Exception as e:
+            messagebox.showerror("오류", f"창을 배치할 수 없습니다:\n{e}")
+
+    # ----- 화면 밖 창 구출 -----
+    def rescue_offscreen_windows(self, *args):
+        """작업 영역 밖으로 나간 창을 찾아 보고한 뒤, 확인하면 한 번에 옮깁니다."""
+        try:
+            plan = collect_rescue_plan(exclude=(self._own_hwnd(),))
+        except Exception as e:
+            messagebox.showerror("오류", f"화면 밖 창을 찾을 수 없습니다:\n{e}")
+            return
+
+        if not plan:
+            self._notify("화면 밖으로 나간 창이 없습니다.")
+            return
+
+        report = format_rescue_report(plan)
+        should_apply = messagebox.askyesno(
+            "화면 밖 창 구출",
+            f"작업 영역을 벗어난 창 {len(plan)}개를 찾았습니다.\n\n{report}\n\n이 위치로 한 번에 옮길까요?",
+        )
+        if not should_apply:
+            self._notify(f"화면 밖 창 {len(plan)}개를 찾았습니다. (이동하지 않음)")
+            return
+
+        try:
+            self.geometry_journal.record_many([offender["hwnd"] for offender, _ in plan], "화면 밖 창 구출")
+            moved = batch_move_windows([(offender["hwnd"], new_rect) for offender, new_rect in plan])
+            self._notify(f"화면 밖 창 {moved}개를 작업 영역 안으로 옮겼습니다.")
+        except Exception as e:
+            messagebox.showerror("오류", f"창을 옮길 수 없습니다:\n{e}")
+        self.refresh_tree()
+
+    # ----- 디스플레이 구성별 레이아웃 프로필 -----
+    def save_layout_profile(self, *args):
+        """현재 창 배치를 지금의 디스플레이 구성 프로필로 저장합니다."""
+        try:
+            fingerprint, description = get_display_fingerprint()
+            entries = capture_window_layout(exclude=(self._own_hwnd(),))
+        except Exception as e:
+            messagebox.showerror("오류", f"현재 배치를 읽을 수 없습니다:\n{e}")
+            return
+
+        self.layout_profiles[fingerprint] = {
+            "displays": description,
+            "windows": entries,
+            "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.display_fingerprint = fingerprint
+        saved_to_file = self._save_layout_profiles()
+        save_text = f" {LAYOUT_PROFILES_FILE.name}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
+        self._notify(f"창 {len(entries)}개의 배치를 디스플레이 구성 [{description}] 프로필로 저장했습니다.{save_text}")
+
+    def restore_layout_profile(self, *args):
+        """지금의 디스플레이 구성에 맞는 프로필을 복원합니다."""
+        try:
+            fingerprint, description = get_display_fingerprint()
+        except Exception as e:
+            messagebox.showerror("오류", f"디스플레이 구성을 읽을 수 없습니다:\n{e}")
+            return
+        if not self._restore_layout_profile_for(fingerprint, description):
+            messagebox.showinfo("레이아웃 프로필", f"이 디스플레이 구성으로 저장된 프로필이 없습니다.\n[{description}]")
+
+    def _restore_layout_profile_for(self, fingerprint, description):
+        profile = self.layout_profiles.get(fingerprint)
+        if profile is None:
+            return False
+        try:
+            moved = restore_window_layout(
+                profile.get("windows") or [], exclude=(self._own_hwnd(),),
+                before_move=lambda hwnds: self.geometry_journal.record_many(hwnds, "레이아웃 프로필 복원"),
+            )
+            self._notify(f"디스플레이 구성 [{description}] 프로필로 창 {moved}개를 복원했습니다.")
+        except Exception as e:
+            self._notify(f"레이아웃 프로필을 복원할 수 없습니다: {e}")
+        return True
+
+    def _handle_desktop_event(self, kind, payload):
+        if kind == "hotkey":
+            action = self._hotkey_actions.get(payload.get("id"))
+            if action is not None:
+                action()
+        elif kind == "window_event":
+            event, hwnd = payload["event"], payload["hwnd"]
+            if event == "locationchange":
+                self._queue_location_change(hwnd)
+                return
+            if event in ("cloaked", "uncloaked", "destroy"):
+                self.window_classifier.invalidate(hwnd)
+            if self.trace_recorder is not None:
+                self._record_window_event(event, hwnd)
+            if event == "destroy" and self.thumbnail_pool is not None:
+                self.thumbnail_pool.release(hwnd)
+            if event == "movesizestart":
+                self._begin_snap_drag(hwnd)
+            elif event == "movesizeend":
+                self._end_snap_drag(hwnd)
+            elif self._startup_events is not None:
+                self._startup_events.append((event, hwnd))  # _apply_startup_windows에서 적용
+            elif self.window_model.apply_event(event, hwnd):
+                self.quick_switcher.refresh_if_visible()
+            if self.auto_geometry_var.get():
+                self._on_geometry_event(event, hwnd)
+        elif kind == "display_changed":
+            self._snap_index = None
+            # 도킹/해제 때는 이벤트가 몇 번 연달아 오므로 잠잠해진 뒤 한 번만 처리합니다.
+            if self._display_change_job is not None:
+                self.after_cancel(self._display_change_job)
+            self._display_change_job = self.after(500, self._on_display_settled)
+
+    def _on_display_settled(self):
+        self._display_change_job = None
+        try:
+            fingerprint, description = get_display_fingerprint()
+        except Exception:
+            return
+        if fingerprint == self.display_fingerprint:
+            return
+        self.display_fingerprint = fingerprint
+        if self.auto_restore_layout_var.get():
+            self._restore_layout_profile_for(fingerprint, description)
+        self.refresh_tree()
+
     # ----- 창 크기/위치 프리셋 -----
     def save_window_size_preset(self, *args):
         self._save_window_preset("size")
@@ -931,6 +5803,7 @@ class App(tk.Tk):
     def save_window_position_preset(self, *args):
         self._save_window_preset("position")
 
+    @profiled()
     def _save_window_preset(self, preset_kind):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
@@ -969,7 +5842,7 @@ class App(tk.Tk):
                 position = (x, y)
                 value_text = f"위치 {x}, {y}"
 
-            preset = self._make_window_preset(preset_name, title, size, position)
+            preset = self._make_window_preset(preset_name, title, size, position, get_window_process_name(hwnd))
 
             existing_index = next(
                 (
@@ -987,12 +5860,14 @@ class App(tk.Tk):
                 if not should_overwrite:
                     return
                 self.window_presets[existing_index] = preset
+                preset_index = existing_index
             else:
                 self.window_presets.append(preset)
+                preset_index = len(self.window_presets) - 1
 
-            saved_to_file = self._save_window_presets()
-            self._refresh_preset_menu()
-            save_text = f" {SAVED_WINDOW_PRESETS_FILE.name}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
+            saved_to_file = self._save_window_presets(changed=[preset])
+            self.preset_palette.preset_changed(preset_index, self.window_presets[preset_index])
+            save_text = f" {self._preset_save_target_name()}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
             self._notify(f"'{preset_name}' {kind_label} 프리셋을 저장했습니다. {value_text}.{save_text}")
         except Exception as e:
             messagebox.showerror("오류", f"프리셋을 저장할 수 없습니다:\n{e}")
@@ -1003,6 +5878,7 @@ class App(tk.Tk):
     def apply_window_position_preset(self, preset_index):
         self._apply_window_preset_value(preset_index, "position")
 
+    @profiled()
     def _apply_window_preset_value(self, preset_index, preset_kind):
         hwnd, title = self._get_selected_hwnd_and_title()
         if not hwnd:
@@ -1015,7 +5891,7 @@ class App(tk.Tk):
 
         if preset_index < 0 or preset_index >= len(self.window_presets):
             messagebox.showwarning("경고", "선택한 프리셋을 찾을 수 없습니다.")
-            self._refresh_preset_menu()
+            self._reload_preset_palette()
             return
 
         preset = self.window_presets[preset_index]
@@ -1030,6 +5906,7 @@ class App(tk.Tk):
             return
 
         try:
+            self.geometry_journal.record(hwnd, "프리셋 적용")
             if preset_kind == "size":
                 apply_window_size(hwnd, size[0], size[1])
             else:
@@ -1056,8 +5933,9 @@ class App(tk.Tk):
             width, height = get_window_size(hwnd)
             self.saved_size = (width, height)
             self.saved_size_title = title
-            saved_to_file = self._save_saved_window_state()
-            save_text = f" {SAVED_WINDOW_STATE_FILE.name}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
+            self.saved_size_app = get_window_process_name(hwnd)
+            saved_to_file = self._save_saved_window_state("size")
+            save_text = f" {self._state_save_target_name()}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
             self._notify(f"'{title}' 창의 크기({width} x {height})를 기억했습니다.{save_text} Ctrl+Shift+V로 다른 창에 적용하세요.")
         except Exception as e:
             messagebox.showerror("오류", f"창 크기를 가져올 수 없습니다:\n{e}")
@@ -1079,6 +5957,7 @@ class App(tk.Tk):
         
         try:
             width, height = self.saved_size
+            self.geometry_journal.record(hwnd, "기억된 크기 적용")
             apply_window_size(hwnd, width, height)
             self._notify(f"'{title}' 창에 기억된 크기({width} x {height}, 원본: '{self.saved_size_title}')를 적용했습니다.")
         except Exception as e:
@@ -1100,8 +5979,9 @@ class App(tk.Tk):
             x, y = get_window_position(hwnd)
             self.saved_position = (x, y)
             self.saved_position_title = title
-            saved_to_file = self._save_saved_window_state()
-            save_text = f" {SAVED_WINDOW_STATE_FILE.name}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
+            self.saved_position_app = get_window_process_name(hwnd)
+            saved_to_file = self._save_saved_window_state("position")
+            save_text = f" {self._state_save_target_name()}에 저장했습니다." if saved_to_file else " 이번 실행 동안만 기억합니다."
             self._notify(f"'{title}' 창의 위치({x}, {y})를 기억했습니다.{save_text} Ctrl+Alt+V로 다른 창에 적용하세요.")
         except Exception as e:
             messagebox.showerror("오류", f"창 위치를 가져올 수 없습니다:\n{e}")
@@ -1123,13 +6003,255 @@ class App(tk.Tk):
 
         try:
             x, y = self.saved_position
+            self.geometry_journal.record(hwnd, "기억된 위치 적용")
             apply_window_position(hwnd, x, y)
             self._notify(f"'{title}' 창에 기억된 위치({x}, {y}, 원본: '{self.saved_position_title}')를 적용했습니다.")
         except Exception as e:
             messagebox.showerror("오류", f"창 위치를 적용할 수 없습니다:\n{e}")
 
+    # ----- 단일 인스턴스 메시지 -----
+    def _handle_instance_message(self, message):
+        """나중에 실행된 프로세스가 전달한 인자를 처리합니다."""
+        preset_name = message.get("preset")
+        search = message.get("search")
+        focus = message.get("focus")
+
+        if preset_name:
+            target = message.get("target")
+            if target:
+                hwnd = self._find_target_window(target)
+            else:
+                hwnd = message.get("foreground_hwnd")
+                if not hwnd or not win32gui.IsWindow(hwnd) or hwnd == self._own_hwnd():
+                    hwnd, _ = self._get_selected_hwnd_and_title()
+            self._apply_named_preset(preset_name, hwnd)
+
+        if focus:
+            hwnd = self._find_target_window(focus)
+            if hwnd:
+                bring_window_to_front_by_hwnd(hwnd)
+                self._notify(f"'{win32gui.GetWindowText(hwnd)}' 창을 전면으로 가져왔습니다.")
+            else:
+                self._notify(f"'{focus}'에 맞는 창이 없습니다.")
+
+        # 다른 창을 대상으로 하는 요청은 그 창의 포커스를 빼앗지 않습니다.
+        if (preset_name or focus) and search is None:
+            return
+
+        self.deiconify()
+        self.lift()
+        bring_window_to_front_by_hwnd(self._own_hwnd())
+        if search is not None:
+            self.search_var.set(search)
+            self.refresh_tree()
+        self.search_entry.focus_set()
+        self.search_entry.select_range(0, "end")
+
+    def _find_target_window(self, selector_text):
+        """선택자에 맞는 창 중 맨 위 창의 hwnd. 없거나 문법 오류면 None."""
+        own_hwnd = self._own_hwnd()
+        try:
+            matches = find_windows(selector_text, exclude=(own_hwnd,))
+        except SelectorError as e:
+            self._notify(f"선택자 오류: {e}")
+            return None
+        return next((hwnd for hwnd, _ in matches if hwnd != own_hwnd), None)
+
+    @profiled()
+    def _apply_named_preset(self, preset_name, hwnd):
+        if not hwnd or not win32gui.IsWindow(hwnd):
+            self._notify(f"'{preset_name}' 프리셋을 적용할 창이 없습니다.")
+            return
+
+        preset_index = self._find_window_preset(preset_name)
+        if preset_index is None:
+            self._notify(f"'{preset_name}' 프리셋을 찾을 수 없습니다.")
+            return
+
+        preset = self.window_presets[preset_index]
+        size = _read_int_pair(preset.get("size"))
+        position = _read_int_pair(preset.get("position"))
+        try:
+            self.geometry_journal.record(hwnd, "프리셋 적용")
+            if size is not None:
+                apply_window_size(hwnd, size[0], size[1])
+            if position is not None:
+                apply_window_position(hwnd, position[0], position[1])
+            self._notify(f"'{win32gui.GetWindowText(hwnd)}' 창에 '{preset['name']}' 프리셋을 적용했습니다.")
+        except Exception as e:
+            self._notify(f"'{preset_name}' 프리셋을 적용할 수 없습니다: {e}")
+
+    def _find_window_preset(self, preset_name):
+        """이름이 같은 프리셋의 인덱스를 반환합니다. 대소문자가 정확히 같은 이름을 우선합니다."""
+        folded = preset_name.strip().casefold()
+        fallback = None
+        for index, preset in enumerate(self.window_presets):
+            name = preset.get("name") or ""
+            if name == preset_name:
+                return index
+            if fallback is None and name.casefold() == folded:
+                fallback = index
+        return fallback
+
+    def _own_hwnd(self):
+        try:
+            return int(self.wm_frame(), 16)
+        except (tk.TclError, ValueError):
+            return self.winfo_id()
+
+    # ----- Tk 스레드 작업 큐 -----
+    def post_to_ui(self, callback, *args):
+        """다른 스레드에서 Tk 스레드로 작업을 넘깁니다."""
+        self._ui_queue.put((callback, args))
+        try:
+            self.event_generate("<<UiQueue>>", when="tail")
+        except (tk.TclError, RuntimeError):
+            pass  # 메인 루프 전이거나 종료 중이면 주기적 폴링이 처리합니다.
+
+    def _drain_ui_queue(self):
+        while True:
+            try:
+                callback, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(*args)
+            except Exception as e:
+                self._notify(f"작업 처리 중 오류: {e}")
+
+    def _poll_ui_queue(self):
+        self._drain_ui_queue()
+        self.after(100, self._poll_ui_queue)
+
+    def _on_close(self):
+        if self.event_listener is not None:
+            self.event_listener.stop()
+        self.process_sampler.stop()
+        self.auto_refresh.stop()
+        if self.thumbnail_pool is not None:
+            self.thumbnail_pool.clear()
+        if self.auto_geometry_var.get():
+            # 열려 있는 창의 현재 위치도 다음 실행 때 쓸 수 있게 남깁니다.
+            self._update_live_geometry(self._pending_locations)
+            for hwnd in list(self.geometry_memory.live):
+                self.geometry_memory.release(hwnd)
+        self._flush_geometry_memory()
+        if self.preset_store is not None:
+            self.preset_store.close()
+        if self.trace_recorder is not None:
+            self.trace_recorder.close()
+        self.destroy()
+
     def _notify(self, text):
         self.status_label.config(text=text)
 
+BENCHMARKS = {
+    "occlusion": benchmark_occlusion,
+    "tiling": benchmark_tiling,
+    "snap": benchmark_snap_zones,
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="열려 있는 창을 찾고 정리하는 도구")
+    parser.add_argument("--search", metavar="QUERY",
+                        help="검색창에 QUERY를 입력한 상태로 창을 띄웁니다.")
+    parser.add_argument("--preset", metavar="NAME",
+                        help="이름이 NAME인 프리셋을 현재 전면 창(또는 --target 창)에 적용합니다.")
+    parser.add_argument("--target", metavar="SELECTOR",
+                        help="--preset을 적용할 창을 선택자로 지정합니다. 예: \"proc:chrome title~/PR #\\d+/\"")
+    parser.add_argument("--focus", metavar="SELECTOR",
+                        help="선택자에 맞는 맨 위 창을 전면으로 가져옵니다.")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="실행 중인 인스턴스가 있어도 새로 실행합니다.")
+    parser.add_argument("--rescue-dry-run", action="store_true",
+                        help="화면 밖으로 나간 창과 옮길 위치만 출력하고 종료합니다.")
+    parser.add_argument("--preset-store", choices=("json", "sqlite"),
+                        help=f"프리셋 저장 방식. 지정하지 않으면 {PRESET_STORE_DB_FILE.name}이 있을 때 sqlite를 씁니다.")
+    parser.add_argument("--profile", metavar="MS", type=float, nargs="?", const=PROFILE_SLOW_MS,
+                        help=f"시작부터 느린 동작 프로파일링을 켭니다. MS보다 오래 걸린 동작만 기록합니다. (기본 {PROFILE_SLOW_MS})")
+    parser.add_argument("--benchmark", choices=sorted(BENCHMARKS),
+                        help="창을 띄우지 않고 내부 알고리즘 벤치마크를 실행합니다.")
+    parser.add_argument("--record", metavar="TRACE",
+                        help="창 열거 결과, 창 이벤트, 창 이동을 TRACE 파일(gzip JSON Lines)에 기록하면서 실행합니다.")
+    parser.add_argument("--replay", metavar="TRACE",
+                        help="창을 띄우지 않고 TRACE를 가짜 바탕 화면에 재생하며 새로고침/검색/이동 지연 시간을 출력합니다.")
+    parser.add_argument("--replay-speed", metavar="X", type=float, default=1.0,
+                        help="--replay 속도 배율. 1은 기록한 속도, 0은 기다리지 않고 최대한 빠르게. (기본 1)")
+    return parser.parse_args(argv)
+
+def _build_instance_message(args):
+    foreground_hwnd = None
+    try:
+        foreground_hwnd = ctypes.windll.user32.GetForegroundWindow() or None  # pywin32를 불러오기 전이라 ctypes로
+    except Exception:
+        pass
+    return {
+        "search": args.search,
+        "preset": args.preset,
+        "target": args.target,
+        "focus": args.focus,
+        "foreground_hwnd": foreground_hwnd,
+    }
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay:
+        # 가짜 바탕 화면만 쓰므로 pywin32 등을 불러오지 않습니다.
+        try:
+            result = replay_trace(args.replay, speed=args.replay_speed)
+        except (OSError, ValueError) as e:
+            print(f"트레이스를 재생할 수 없습니다: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+    if args.benchmark or args.rescue_dry_run:
+        load_platform_modules()
+    if args.benchmark:
+        result = BENCHMARKS[args.benchmark]()
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 1 if result.get("mismatches") else 0
+    if args.rescue_dry_run:
+        plan = collect_rescue_plan()
+        print(format_rescue_report(plan, limit=len(plan)) if plan else "화면 밖으로 나간 창이 없습니다.")
+        return 0
+
+    message = _build_instance_message(args)
+
+    instance = None
+    if not args.new_instance:
+        instance = SingleInstance()
+        if not instance.acquire():
+            # 이미 실행 중이면 인자만 넘기고 바로 종료합니다.
+            if instance.forward(message):
+                return 0
+            # 기존 인스턴스가 응답하지 않으면 새로 실행하되, 리스너는 만들지 않습니다.
+            instance.close()
+            instance = None
+
+    load_platform_modules()
+    startup_message = message if (args.search is not None or args.preset or args.focus) else None
+    preset_store = None
+    use_sqlite = args.preset_store == "sqlite" or (args.preset_store is None and PRESET_STORE_DB_FILE.exists())
+    if use_sqlite:
+        try:
+            preset_store = SqlitePresetStore(PRESET_STORE_DB_FILE)
+        except sqlite3.Error as e:
+            print(f"{PRESET_STORE_DB_FILE.name}을 열 수 없어 JSON 파일을 사용합니다: {e}", file=sys.stderr)
+    trace_recorder = None
+    if args.record:
+        try:
+            trace_recorder = DesktopTraceRecorder(args.record, get_monitor_work_areas())
+        except OSError as e:
+            print(f"{args.record}에 기록할 수 없습니다: {e}", file=sys.stderr)
+    try:
+        App(instance=instance, startup_message=startup_message, preset_store=preset_store,
+            profile_threshold_ms=args.profile, trace_recorder=trace_recorder).mainloop()
+    finally:
+        if trace_recorder is not None:
+            trace_recorder.close()
+        if instance is not None:
+            instance.close()
+    return 0
+
 if __name__ == "__main__":
-    App().mainloop()
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import goto_center
+
+
+def entry(exe, class_name, title, rect, **extra):
+    return dict({"exe": exe, "class": class_name, "title": title, "rect": list(rect), "maximized": False}, **extra)
+
+
+def test_match_prefers_exact_title_then_saved_order():
+    entries = [
+        entry("code.exe", "Chrome_WidgetWin_1", "a.py - 프로젝트", (0, 0, 960, 1040)),
+        entry("code.exe", "Chrome_WidgetWin_1", "b.py - 프로젝트", (960, 0, 1920, 1040)),
+        entry("notepad.exe", "Notepad", "메모", (100, 100, 500, 500)),
+    ]
+    windows = [
+        (1, ("code.exe", "Chrome_WidgetWin_1", "c.py - 프로젝트")),
+        (2, ("code.exe", "Chrome_WidgetWin_1", "b.py - 프로젝트")),
+        (3, ("explorer.exe", "CabinetWClass", "문서")),
+    ]
+
+    matched = goto_center.match_layout_entries(entries, windows)
+
+    # 2번은 제목까지 같은 항목, 1번은 남은 같은 프로그램 항목 중 먼저 저장된 것
+    assert [(hwnd, e["title"]) for hwnd, e in matched] == [(2, "b.py - 프로젝트"), (1, "a.py - 프로젝트")]
+
+
+def test_match_uses_each_entry_once():
+    entries = [entry("notepad.exe", "Notepad", "메모", (0, 0, 10, 10))]
+    windows = [(1, ("notepad.exe", "Notepad", "메모")), (2, ("notepad.exe", "Notepad", "메모"))]
+
+    assert [hwnd for hwnd, _ in goto_center.match_layout_entries(entries, windows)] == [1]
+
+
+def layout_desktop():
+    desktop = goto_center.SimulatedDesktop()
+    desktop.apply_enumeration({"set": [
+        [1, "메모", "Notepad", 11, "notepad.exe", 0, 0, 400, 300, 0],
+        [2, "보고서 - Word", "OpusApp", 12, "WINWORD.EXE", 50, 50, 650, 450, 0],
+    ]})
+    return desktop
+
+
+def test_restore_maximized_window_keeps_normal_position():
+    desktop = layout_desktop()
+    entries = [
+        entry("notepad.exe", "Notepad", "메모", (200, 200, 800, 700)),
+        entry("winword.exe", "OpusApp", "보고서 - word", (0, 0, 1920, 1040), maximized=True,
+              normal=[300, 100, 1300, 900]),
+    ]
+    recorded = []
+    with desktop.install():
+        restored = goto_center.restore_window_layout(entries, before_move=recorded.extend)
+
+    assert restored == 2
+    assert sorted(recorded) == [1, 2]
+    assert desktop.windows[1][5:9] == [200, 200, 800, 700]
+    # 모니터 크기가 아니라 저장된 복원 위치가 남아야 최대화를 풀었을 때 원래 크기로 돌아갑니다.
+    assert desktop.windows[2][5:9] == [300, 100, 1300, 900]
+    assert desktop.windows[2][9] & goto_center.TRACE_MAXIMIZED
+
+
+def test_restore_legacy_maximized_entry_keeps_current_normal_size():
+    desktop = layout_desktop()
+    entries = [entry("winword.exe", "OpusApp", "보고서 - word", (0, 0, 1920, 1040), maximized=True)]
+    with desktop.install():
+        goto_center.restore_window_layout(entries)
+
+    l, t, r, b = desktop.windows[2][5:9]
+    assert (r - l, b - t) == (600, 400)
+    assert desktop.windows[2][9] & goto_center.TRACE_MAXIMIZED
+
+
+def test_capture_records_normal_position_of_maximized_window():
+    desktop = layout_desktop()
+    with desktop.install():
+        desktop.ShowWindow(2, 3)  # SW_MAXIMIZE
+        entries = goto_center.capture_window_layout()
+
+    by_title = {e["title"]: e for e in entries}
+    assert "normal" not in by_title["메모"]
+    assert by_title["보고서 - word"]["maximized"] is True
+    assert by_title["보고서 - word"]["normal"] == [50, 50, 650, 450]
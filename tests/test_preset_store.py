@@ -0,0 +1,67 @@
+import goto_center
+
+
+def open_store(history_limit=goto_center.PRESET_HISTORY_LIMIT):
+    return goto_center.SqlitePresetStore(":memory:", history_limit=history_limit)
+
+
+def history_rows(store, kind):
+    return store.conn.execute(
+        "SELECT a, b FROM window_history WHERE kind = ? ORDER BY id", (kind,),
+    ).fetchall()
+
+
+def test_upsert_merges_same_name_and_kind():
+    store = open_store()
+    store.upsert_presets([
+        {"name": "반쪽", "size": [960, 1040], "source_app": "code.exe"},
+        {"name": "왼쪽 위", "position": [0, 0]},
+        {"name": "값 없음"},
+    ])
+    count = store.upsert_presets([{"name": "반쪽", "size": [1280, 1040], "source_title": "편집기"}])
+
+    presets = store.load_presets()
+    assert count == 1
+    assert [(p["name"], p["size"], p["position"]) for p in presets] == [
+        ("반쪽", [1280, 1040], None),
+        ("왼쪽 위", None, [0, 0]),
+    ]
+    assert presets[0]["source_title"] == "편집기"
+    assert presets[0]["source_app"] == ""
+
+
+def test_migration_flag():
+    store = open_store()
+    assert not store.migrated
+    store.mark_migrated("2 presets")
+    assert store.migrated
+
+
+def test_latest_history_returns_source_app():
+    store = open_store()
+    assert store.latest_history("size") == (None, None, None)
+    store.record_history("size", (800, 600), "메모장", "notepad.exe")
+    store.record_history("position", (10, 20), "탐색기", "explorer.exe")
+
+    assert store.latest_history("size") == ((800, 600), "메모장", "notepad.exe")
+    assert store.latest_history("position") == ((10, 20), "탐색기", "explorer.exe")
+
+
+def test_history_is_trimmed_per_kind_with_interleaved_writes():
+    store = open_store(history_limit=5)
+    for i in range(12):
+        store.record_history("size", (i, i))
+        store.record_history("position", (i, -i))
+    for i in range(3):
+        store.record_history("size", (100 + i, 0))
+
+    assert history_rows(store, "size") == [(10, 10), (11, 11), (100, 0), (101, 0), (102, 0)]
+    assert history_rows(store, "position") == [(i, -i) for i in range(7, 12)]
+
+
+def test_history_below_limit_is_kept():
+    store = open_store(history_limit=5)
+    for i in range(3):
+        store.record_history("size", (i, i))
+
+    assert len(history_rows(store, "size")) == 3
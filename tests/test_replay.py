@@ -0,0 +1,83 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+import goto_center
+
+SAMPLE_TRACE = Path(__file__).with_name("data") / "sample_trace.jsonl.gz"
+SUMMARY_KEYS = {"count", "p50_ms", "p95_ms", "max_ms", "total_ms"}
+
+
+def replay(path=SAMPLE_TRACE):
+    steps = []
+    result = goto_center.replay_trace(
+        path, speed=0,
+        observer=lambda kind, payload, desktop, rows: steps.append(
+            (kind, None if rows is None else [row["hwnd"] for row in rows], dict(desktop.windows))
+        ),
+    )
+    return result, steps
+
+
+def test_replay_sample_trace_rows_and_moves():
+    result, steps = replay()
+
+    assert [kind for kind, _, _ in steps] == ["enum", "enum", "ev", "ev", "act", "ev", "enum"]
+    # 첫 열거: Z 순서 그대로 모든 창
+    assert steps[0][1] == [104, 102, 101, 103]
+    # 검색어 "메모장"
+    assert steps[1][1] == [101]
+    # 클로킹 숨김: 계산기(103)는 빠지고, 새로 만든 창(105)이 맨 위, 닫힌 창(104)은 없음
+    assert steps[6][1] == [105, 102, 101]
+
+    # 있는 창만 옮기고, 없는 창(999)은 건너뜁니다.
+    windows = steps[4][2]
+    assert windows[101][5:9] == [460, 220, 1460, 820]
+    assert 999 not in windows
+
+    assert result["records"] == 7
+    assert result["max_windows"] == 5
+
+
+def test_replay_sample_trace_latency_summary():
+    result, _ = replay()
+
+    assert result["speed"] == 0
+    counts = {"refresh": 2, "search": 1, "move": 1, "event": 3}
+    for name, count in counts.items():
+        assert set(result[name]) == SUMMARY_KEYS
+        assert result[name]["count"] == count
+        assert 0 <= result[name]["p50_ms"] <= result[name]["p95_ms"] <= result[name]["max_ms"]
+
+
+def test_recorder_round_trip(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    monitors = [{"monitor": (0, 0, 1920, 1080), "work": (0, 0, 1920, 1040), "primary": True}]
+    recorder = goto_center.DesktopTraceRecorder(path, monitors)
+    rows = [
+        [201, "메모장", "Notepad", 21, "notepad.exe", 0, 0, 800, 600, 0],
+        [202, "탐색기", "CabinetWClass", 22, "explorer.exe", 100, 100, 900, 700, 0],
+    ]
+    recorder.enumeration(rows)
+    recorder.enumeration(rows, query="탐색")  # 달라진 창이 없으면 검색어만 남습니다.
+    recorder.action("move", label="왼쪽 절반", m=[[202, 0, 0, 960, 1040]])
+    recorder.close()
+
+    records = list(goto_center.read_trace(path))
+    assert [kind for _, kind, _ in records] == ["hdr", "enum", "enum", "act"]
+    assert records[2][2] == {"q": "탐색"}
+
+    result, steps = replay(path)
+    assert steps[1][1] == [202]
+    assert steps[2][2][202][5:9] == [0, 0, 960, 1040]
+    assert result["records"] == 3
+
+
+def test_replay_rejects_trace_without_header(tmp_path):
+    path = tmp_path / "broken.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write('[0,"enum",{}]\n')
+
+    with pytest.raises(ValueError):
+        goto_center.replay_trace(path, speed=0)
@@ -0,0 +1,78 @@
+import pytest
+
+import goto_center
+
+WINDOWS = {
+    # hwnd: (제목, 클래스, 프로세스)
+    1: ("PR #42 - GitHub - http://example.com/pulls", "Chrome_WidgetWin_1", "chrome.exe"),
+    2: ("/usr/bin - 파일 탐색기", "CabinetWClass", "explorer.exe"),
+    3: ("bin 폴더 - /usr/local 복사", "CabinetWClass", "explorer.exe"),
+    4: ("http:// 설명서 - example.com/other", "Notepad", "notepad.exe"),
+}
+
+
+def facts(hwnd, context=None):
+    title, class_name, proc = WINDOWS[hwnd]
+    window = goto_center.WindowFacts(hwnd, title, context)
+    window._values.update({"class": class_name, "proc": proc})
+    return window
+
+
+def matching(selector_text):
+    selector = goto_center.compile_selector(selector_text)
+    return [hwnd for hwnd in WINDOWS if selector.matches(facts(hwnd))]
+
+
+def test_words_and_fields():
+    assert matching("github") == [1]
+    assert matching("proc:explorer") == [2, 3]
+    assert matching("proc=explorer.exe -bin") == []
+    assert matching('"파일 탐색기"') == [2]
+    assert matching("class=cabinetwclass !local") == [2]
+
+
+def test_regex_only_after_tilde():
+    assert matching(r"title~/PR #\d+/") == [1]
+    assert matching(r"title~/^\/usr\/bin/") == [2]
+    with pytest.raises(goto_center.SelectorError):
+        goto_center.compile_selector("title~usr")
+
+
+def test_url_like_word_stays_one_word():
+    # 'http:'는 필드가 아니므로 URL 전체가 한 단어입니다. 조각으로 나뉘면 4번 창도 맞습니다.
+    assert matching("http://example.com/pulls") == [1]
+    assert matching("http://example.com/other") == []
+
+
+def test_path_like_value_stays_one_value():
+    # '/usr/'와 'bin'으로 나뉘면 두 조각이 모두 들어 있는 3번 창도 맞습니다.
+    assert matching("title:/usr/bin") == [2]
+    assert matching("-title:/usr/bin proc:explorer") == [3]
+
+
+def test_numbers_and_errors():
+    assert matching("hwnd:2") == [2]
+    assert matching("hwnd>=3") == [3, 4]
+    with pytest.raises(goto_center.SelectorError):
+        goto_center.compile_selector("hwnd:abc")
+    with pytest.raises(goto_center.SelectorError):
+        goto_center.compile_selector("title:")
+    selector, error = goto_center.compile_search_selector("hwnd:abc")
+    assert error and selector.matches(goto_center.WindowFacts(9, "hwnd:abc 설명", None))
+
+
+def test_find_windows_computes_hidden_from_same_enumeration():
+    desktop = goto_center.SimulatedDesktop()
+    desktop.apply_enumeration({
+        "set": [
+            [11, "전체 화면 편집기", "Editor", 1, "editor.exe", 0, 0, 1920, 1040, 0],
+            [12, "가려진 메모장", "Notepad", 2, "notepad.exe", 100, 100, 900, 700, 0],
+            [13, "클로킹된 창", "Frame", 3, "app.exe", 0, 0, 1920, 1040, goto_center.TRACE_CLOAKED],
+        ],
+        "z": [13, 11, 12],
+    })
+    with desktop.install():
+        assert [hwnd for hwnd, _ in goto_center.find_windows("hidden")] == [12]
+        assert [hwnd for hwnd, _ in goto_center.find_windows("!hidden")] == [13, 11]
+        # 가림 계산에서 뺀 창은 아래 창을 가리지 않습니다.
+        assert goto_center.find_windows("hidden", exclude=(11,)) == []
@@ -0,0 +1,99 @@
+import goto_center
+
+DEST = 1
+CONTAINER = (0, 0, 320, 180)
+
+
+def make_pool(capacity=3, source_sizes=None):
+    backend = goto_center.SimulatedThumbnailBackend(source_sizes)
+    return goto_center.ThumbnailPool(backend, DEST, capacity=capacity), backend
+
+
+def visible_sources(backend):
+    return [entry["source"] for entry in backend.handles.values() if entry["visible"]]
+
+
+def test_show_registers_once_and_fits_source_aspect():
+    pool, backend = make_pool(source_sizes={10: (640, 480)})
+
+    rect = pool.show(10, CONTAINER)
+
+    assert rect == (40, 0, 280, 180)
+    assert backend.calls["register"] == 1
+    (entry,) = backend.handles.values()
+    assert entry == {"dest": DEST, "source": 10, "rect": rect, "visible": True}
+
+
+def test_selection_change_hides_previous_and_reuses_handle():
+    pool, backend = make_pool()
+
+    pool.show(10, CONTAINER)
+    pool.show(20, CONTAINER)
+    assert visible_sources(backend) == [20]
+    assert len(pool) == 2
+
+    pool.show(10, CONTAINER)
+    assert visible_sources(backend) == [10]
+    assert backend.calls["register"] == 2  # 10은 다시 등록하지 않습니다.
+
+
+def test_evicts_least_recently_used_handle():
+    pool, backend = make_pool(capacity=2)
+
+    pool.show(10, CONTAINER)
+    pool.show(20, CONTAINER)
+    pool.show(10, CONTAINER)  # 20이 가장 오래 안 쓴 핸들이 됩니다.
+    pool.show(30, CONTAINER)
+
+    assert len(pool) == 2
+    assert sorted(entry["source"] for entry in backend.handles.values()) == [10, 30]
+    assert backend.calls["unregister"] == 1
+    assert visible_sources(backend) == [30]
+
+
+def test_evicting_shown_handle_forgets_it():
+    pool, backend = make_pool(capacity=1)
+
+    pool.show(10, CONTAINER)
+    pool.show(20, CONTAINER)
+    pool.hide()
+
+    assert [entry["source"] for entry in backend.handles.values()] == [20]
+    assert visible_sources(backend) == []
+
+
+def test_release_on_destroy_unregisters_handle():
+    pool, backend = make_pool()
+    pool.show(10, CONTAINER)
+    pool.show(20, CONTAINER)
+
+    pool.release(20)
+    pool.release(99)  # 등록한 적 없는 창은 무시합니다.
+
+    assert len(pool) == 1
+    assert [entry["source"] for entry in backend.handles.values()] == [10]
+    assert backend.calls["unregister"] == 1
+    pool.hide()  # 보이던 창이 풀렸으므로 아무것도 갱신하지 않습니다.
+    assert backend.calls["update"] == 3
+
+
+def test_failed_update_releases_handle():
+    pool, backend = make_pool()
+    pool.show(10, CONTAINER)
+    backend.handles.clear()  # 원본 창이 사라져 갱신이 실패하는 경우
+
+    assert pool.show(10, CONTAINER) is None
+    assert len(pool) == 0
+    assert backend.calls["unregister"] == 1
+
+
+def test_clear_unregisters_everything():
+    pool, backend = make_pool()
+    for source in (10, 20, 30):
+        pool.show(source, CONTAINER)
+
+    pool.clear()
+
+    assert len(pool) == 0
+    assert backend.handles == {}
+    assert backend.calls["unregister"] == 3
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import goto_center
+
+SAMPLE_TRACE = Path(__file__).with_name("data") / "sample_trace.jsonl.gz"
+
+
+def sample_desktop():
+    records = list(goto_center.read_trace(SAMPLE_TRACE))
+    desktop = goto_center.SimulatedDesktop(records[0][2]["monitors"])
+    desktop.apply_enumeration(records[1][2])
+    return desktop
+
+
+def options(**overrides):
+    values = {
+        "query": "", "hidden_only": False, "show_resources": False, "process_stats": {},
+        "hidden_states": {goto_center.WINDOW_CLOAKED}, "own_hwnd": None, "sort": (None, False),
+    }
+    values.update(overrides)
+    return values
+
+
+def test_enumerated_keeps_filtered_windows():
+    desktop = sample_desktop()
+    enumerated = []
+    with desktop.install():
+        rows, _ = goto_center.collect_tree_rows(
+            options(query="메모장"), goto_center.WindowClassifier(desktop_manager=desktop), enumerated=enumerated,
+        )
+
+    assert [row["hwnd"] for row in rows] == [101]
+    assert [(w._hWnd, state) for w, state in enumerated] == [
+        (104, goto_center.WINDOW_ON_DESKTOP),
+        (102, goto_center.WINDOW_ON_DESKTOP),
+        (101, goto_center.WINDOW_ON_DESKTOP),
+        (103, goto_center.WINDOW_CLOAKED),
+    ]
+
+
+def test_enumeration_fingerprint_matches_poller_fingerprint():
+    desktop = sample_desktop()
+    enumerated = []
+    with desktop.install():
+        goto_center.collect_tree_rows(
+            options(own_hwnd=102), goto_center.WindowClassifier(desktop_manager=desktop), enumerated=enumerated,
+        )
+        expected = goto_center.compute_desktop_fingerprint(exclude=(102,))
+
+    assert goto_center.enumeration_fingerprint(enumerated, exclude=(102,)) == expected
+    assert goto_center.enumeration_fingerprint(enumerated) != expected
+
+
+def test_visibility_cache_reuses_sweep_until_layout_changes():
+    desktop = sample_desktop()
+    cache = goto_center.VisibilityCache()
+    classifier = goto_center.WindowClassifier(desktop_manager=desktop)
+    with desktop.install():
+        first, _ = goto_center.collect_tree_rows(options(visibility_cache=cache), classifier)
+        goto_center.collect_tree_rows(options(query="메모장", visibility_cache=cache), classifier)
+        assert cache.hits == 1
+
+        desktop.SetWindowPos(104, 0, 0, 0, 960, 1040, 0)  # 맨 위 전체 화면 창을 절반으로
+        moved, _ = goto_center.collect_tree_rows(options(visibility_cache=cache), classifier)
+        uncached, _ = goto_center.collect_tree_rows(options(), classifier)
+
+    assert cache.hits == 1
+    assert {row["hwnd"]: row["vis"] for row in moved} == {row["hwnd"]: row["vis"] for row in uncached}
+    assert {row["hwnd"]: row["vis"] for row in moved} != {row["hwnd"]: row["vis"] for row in first}